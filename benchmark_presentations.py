@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Presentation Generator Benchmarks
+Times the slide helpers, every slide builder and full builds of both generators,
+and compares the results against a stored baseline
+"""
+
+import argparse
+import gc
+import io
+import json
+import platform
+import statistics
+import sys
+import time
+
+import create_cd_presentation as workflow
+import create_professional_cd_presentation as professional
+import presentation_core as core
+
+DEFAULT_BASELINE_FILE = "benchmark_baseline.json"
+DEFAULT_THRESHOLD = 0.25    # Fail when a benchmark is 25% slower than baseline
+
+# Calls per sample for helper benchmarks; each sample starts on a fresh slide
+HELPER_CALLS = 20
+
+# Cell style the add_table case fills its 3 x 4 table with
+TABLE_CELL = core.TableCell("VM deployment", None, professional.DARK_GRAY, 12, False, "CENTER")
+
+HELPER_CASES = {
+    "professional.add_shape_box": lambda slide: professional.add_shape_box(
+        slide, 1, 1, 3, 0.6, "Pipeline\nOrchestrator", professional.DARK_BLUE, font_size=11),
+    "professional.add_text_box": lambda slide: professional.add_text_box(
+        slide, 1, 1, 10, 0.3, "Key Components:", font_size=16, bold=True, color=professional.HARNESS_BLUE),
+    "professional.add_bullet_list": lambda slide: professional.add_bullet_list(
+        slide, 1.5, 1.3, 10, 3, ["✓ First item", "✓ Second item", "✓ Third item", "✓ Fourth item"]),
+    "professional.add_arrow": lambda slide: professional.add_arrow(
+        slide, 6.5, 2, 6.5, 2.5, professional.HARNESS_BLUE),
+    "professional.add_routed_arrow": lambda slide, source, target: professional.add_routed_arrow(
+        slide, source, target),
+    "professional.add_table": lambda slide: professional.add_table(
+        slide, 0.8, 1.5, [3.5, 4, 4], [(0.45, [TABLE_CELL] * 3)] * 4),
+    "workflow.add_diagram_box": lambda slide: workflow.add_diagram_box(
+        slide, 1, 1, 2, 0.8, "Harness\nDelegate", workflow.SECONDARY_COLOR),
+    "workflow.add_textbox": lambda slide: workflow.add_textbox(
+        slide, 1, 1, 8, 0.5, "Deployment Flow", font_size=18),
+    "workflow.add_bullet_points": lambda slide: workflow.add_bullet_points(
+        slide, 1, 1.5, 8, 5, ["First item", "Second item", "Third item", "Fourth item"]),
+    "workflow.add_arrow": lambda slide: workflow.add_arrow(slide, 2, 2, 4, 2),
+}
+
+def _routed_arrow_fixture(slide):
+    """Source and target boxes with a box between them for the connector to route around"""
+    source = professional.add_shape_box(slide, 1, 1.5, 2.5, 0.8, "Harness\nDelegate", professional.DARK_BLUE)
+    professional.add_shape_box(slide, 4.5, 1.5, 2.5, 0.8, "Artifact\nRegistry", professional.HARNESS_BLUE)
+    target = professional.add_shape_box(slide, 8, 1.5, 2.5, 0.8, "Target\nHosts", professional.SUCCESS_GREEN)
+    return source, target
+
+# Shapes a helper case needs on its slide first, added once per sample: name -> fixture(slide) -> extra args
+HELPER_FIXTURES = {
+    "professional.add_routed_arrow": _routed_arrow_fixture,
+}
+
+def timed(fn):
+    """Run fn once with the garbage collector paused and return its wall time in milliseconds"""
+    gc.collect()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        fn()
+        return (time.perf_counter() - start) * 1000
+    finally:
+        gc.enable()
+
+def sample(fn, repeat):
+    """Run fn once to warm up, then repeat times, returning the timings in milliseconds"""
+    fn()
+    return [timed(fn) for _ in range(repeat)]
+
+def summarize(timings, per=1):
+    """Reduce raw timings to min/median milliseconds per operation"""
+    return {
+        "min_ms": round(min(timings) / per, 4),
+        "median_ms": round(statistics.median(timings) / per, 4),
+    }
+
+def bench_helpers(repeat):
+    """Per-call cost of each slide helper"""
+    results = {}
+    for name, case in HELPER_CASES.items():
+        generator = professional if name.startswith("professional.") else workflow
+        prs = generator.new_presentation()
+        layout = prs.slide_layouts[6]
+        fixture = HELPER_FIXTURES.get(name)
+
+        def run():
+            slide = prs.slides.add_slide(layout)
+            args = fixture(slide) if fixture else ()
+            for _ in range(HELPER_CALLS):
+                case(slide, *args)
+
+        timings = sample(run, repeat)
+        results[f"helper:{name}"] = summarize(timings, per=HELPER_CALLS)
+    return results
+
+def bench_slides(generator, prefix, repeat):
+    """Cost of each slide builder, building into a fresh deck each time"""
+    results = {}
+    for build_slide in generator.SLIDE_BUILDERS:
+        build_slide(generator.new_presentation())
+        timings = []
+        for _ in range(repeat):
+            prs = generator.new_presentation()
+            timings.append(timed(lambda: build_slide(prs)))
+        results[f"slide:{prefix}.{build_slide.__name__}"] = summarize(timings)
+    return results
+
+def bench_full_build(generator, prefix, repeat):
+    """Cost of create_presentation() and prs.save() for the whole deck"""
+    decks = []
+    build = sample(lambda: decks.append(generator.create_presentation()), repeat)
+    save = [timed(lambda: deck.save(io.BytesIO())) for deck in decks]
+    return {
+        f"build:{prefix}.create_presentation": summarize(build),
+        f"build:{prefix}.save": summarize(save),
+    }
+
+def run_benchmarks(repeat):
+    """Run every benchmark and return {name: {min_ms, median_ms}}"""
+    results = {}
+    results.update(bench_helpers(repeat))
+    results.update(bench_slides(professional, "professional", repeat))
+    results.update(bench_slides(workflow, "workflow", repeat))
+    results.update(bench_full_build(professional, "professional", repeat))
+    results.update(bench_full_build(workflow, "workflow", repeat))
+    return results
+
+def environment():
+    """Describe the machine the benchmarks ran on"""
+    return {
+        "python": platform.python_version(),
+        "python_pptx": core.pptx_api().version,
+        "platform": platform.platform(),
+    }
+
+def compare(results, baseline, threshold):
+    """Return (name, baseline_ms, current_ms, ratio) for benchmarks slower than threshold"""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline["results"].get(name)
+        if previous is None:
+            continue
+        ratio = current["min_ms"] / previous["min_ms"] if previous["min_ms"] else 1.0
+        if ratio > 1 + threshold:
+            regressions.append((name, previous["min_ms"], current["min_ms"], ratio))
+    return regressions
+
+def main():
+    """Run the benchmarks and optionally save or gate on a baseline"""
+    parser = argparse.ArgumentParser(description="Benchmark the presentation generators")
+    parser.add_argument("-r", "--repeat", type=int, default=10,
+                        help="Samples per benchmark (the minimum is compared)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE_FILE,
+                        help="Baseline JSON file")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Store these results as the new baseline")
+    parser.add_argument("--compare", action="store_true",
+                        help="Exit non-zero if any benchmark regressed past the threshold")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed slowdown as a fraction of baseline (default 0.25)")
+    parser.add_argument("--json", metavar="FILE",
+                        help="Also write the raw results to FILE")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.repeat)
+
+    width = max(len(name) for name in results)
+    for name, result in results.items():
+        print(f"{name:<{width}}  {result['min_ms']:>10.3f} ms  (median {result['median_ms']:.3f} ms)")
+
+    report = {"environment": environment(), "repeat": args.repeat, "results": results}
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✅ Baseline saved: {args.baseline}")
+
+    if args.compare:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline["environment"] != report["environment"]:
+            print("\n⚠️ Baseline was recorded in a different environment; comparisons may be noisy")
+        if baseline.get("repeat") != args.repeat:
+            # The minimum of fewer samples runs high, and of more samples low
+            print(f"\n⚠️ Baseline took {baseline.get('repeat')} samples per benchmark, this run {args.repeat}; "
+                  f"compare with -r {baseline.get('repeat')}")
+        missing = [name for name in results if name not in baseline["results"]]
+        if missing:
+            print(f"\n⚠️ {len(missing)} benchmark(s) have no baseline entry; re-record with --save-baseline:")
+            for name in missing:
+                print(f"  • {name}")
+
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} benchmark(s) regressed more than {args.threshold:.0%}:")
+            for name, previous, current, ratio in regressions:
+                print(f"  • {name}: {previous:.3f} ms → {current:.3f} ms ({ratio:.2f}x)")
+            sys.exit(1)
+        print(f"\n✅ No regressions beyond {args.threshold:.0%} of {args.baseline}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Batch Deck Generator
+Builds many tenant variants of the Harness CD presentations in one process
+"""
+
+import argparse
+import importlib
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+import font_embed
+from presentation_core import Color
+
+GENERATORS = {
+    "professional": "create_professional_cd_presentation",
+    "workflow": "create_cd_presentation",
+}
+
+# Module attributes a variant may override
+VARIANT_SETTINGS = {
+    "customer": "CUSTOMER_NAME",
+    "footer_year": "FOOTER_YEAR",
+}
+
+def load_manifest(path):
+    """Load a batch manifest
+
+    Format:
+        {
+          "output_dir": "decks",
+          "generator": "professional",
+          "embed_fonts": ["fonts/calibri.ttf", "fonts/calibrib.ttf"],
+          "pipelines": ["harness-cd-example-canary.yaml"],
+          "inventories": ["rabbitmq-ansible-harness/inventory/production"],
+          "variants": [
+            {
+              "name": "acme",
+              "customer": "Acme Corp",
+              "footer_year": 2027,
+              "palette": {"HARNESS_BLUE": "0A66C2"},
+              "slides": [1, 2, "create_ecs_canary_detailed_slide"]
+            }
+          ]
+        }
+
+    embed_fonts (optional, per manifest or per variant) lists font files to
+    embed, subset to each deck's text; subsets are cached across builds.
+    pipelines (optional, per manifest or per variant, professional generator
+    only) lists Harness pipeline YAML files to append as flow slides; each
+    distinct file is parsed once for the whole batch. inventories (likewise)
+    lists Ansible inventories to append as topology slides.
+    """
+    with open(path) as f:
+        manifest = json.load(f)
+
+    if not manifest.get("variants"):
+        raise ValueError(f"Manifest has no variants: {path}")
+    for i, variant in enumerate(manifest["variants"]):
+        if not isinstance(variant, dict) or "name" not in variant:
+            raise ValueError(f"Variant {i} has no name")
+        generator_name = variant.get("generator", manifest.get("generator", "professional"))
+        if not isinstance(generator_name, str) or generator_name not in GENERATORS:
+            raise ValueError(f"Variant {variant['name']}: unknown generator {generator_name!r} "
+                             f"(choose from {', '.join(GENERATORS)})")
+        if generator_name != "professional" and any(variant.get(key, manifest.get(key))
+                                                     for key in ("pipelines", "inventories")):
+            raise ValueError(f"Variant {variant['name']}: pipelines and inventories need the professional generator")
+    return manifest
+
+@contextmanager
+def deck_variant(generator, variant):
+    """Temporarily apply a variant's settings and palette to a generator module"""
+    overrides = {}
+    for key, attr in VARIANT_SETTINGS.items():
+        if key in variant:
+            overrides[attr] = variant[key]
+    for name, hex_value in variant.get("palette", {}).items():
+        if not isinstance(getattr(generator, name, None), Color):
+            raise ValueError(f"Unknown palette color: {name}")
+        overrides[name] = Color.from_string(hex_value.lstrip("#").upper())
+
+    saved = {attr: getattr(generator, attr) for attr in overrides}
+    try:
+        for attr, value in overrides.items():
+            setattr(generator, attr, value)
+        yield
+    finally:
+        for attr, value in saved.items():
+            setattr(generator, attr, value)
+
+def build_batch(manifest, output_dir=None):
+    """Build every variant in the manifest and return the written file paths"""
+    output_dir = output_dir or manifest.get("output_dir", ".")
+    os.makedirs(output_dir, exist_ok=True)
+
+    output_files = []
+    for variant in manifest["variants"]:
+        generator_name = variant.get("generator", manifest.get("generator", "professional"))
+        generator = importlib.import_module(GENERATORS[generator_name])
+
+        generated = {}
+        for key in ("pipelines", "inventories"):
+            if variant.get(key, manifest.get(key)):
+                generated[key] = variant.get(key, manifest.get(key))
+        with deck_variant(generator, variant):
+            prs = generator.create_presentation(slides=variant.get("slides"), **generated)
+
+        output_file = os.path.join(output_dir, f"{variant['name']}.pptx")
+        prs.save(output_file)
+        fonts = variant.get("embed_fonts", manifest.get("embed_fonts"))
+        if fonts:
+            font_embed.embed_fonts(output_file, fonts)
+        output_files.append(output_file)
+
+    return output_files
+
+def main():
+    """Main function to generate every deck in a manifest"""
+    parser = argparse.ArgumentParser(description="Generate many presentation variants from a manifest")
+    parser.add_argument("manifest", help="JSON manifest describing the deck variants")
+    parser.add_argument("-o", "--output-dir", help="Directory for the generated decks (overrides the manifest)")
+    args = parser.parse_args()
+
+    try:
+        manifest = load_manifest(args.manifest)
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    output_files = build_batch(manifest, args.output_dir)
+    elapsed = time.perf_counter() - start
+
+    for output_file in output_files:
+        print(f"✅ {output_file}")
+    print()
+    print(f"✅ Built {len(output_files)} decks in {elapsed:.2f}s "
+          f"({len(output_files) / elapsed:.1f} decks/second)")
+
+if __name__ == "__main__":
+    main()
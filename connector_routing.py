@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""
+Orthogonal Connector Routing
+Routes elbow connectors between shapes around the other shapes on a slide,
+over a visibility graph that is built once per set of obstacles and cached
+"""
+
+import heapq
+import itertools
+import math
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+
+# Connection sites of rectangle-like presets, by index: (x fraction, y fraction, outward direction)
+SITES = (
+    (0.5, 0.0, (0, -1)),    # 0: top
+    (0.0, 0.5, (-1, 0)),    # 1: left
+    (0.5, 1.0, (0, 1)),     # 2: bottom
+    (1.0, 0.5, (1, 0)),     # 3: right
+)
+
+# Clearance kept around obstacles, and the length of the stub leaving each site, in inches
+MARGIN = 0.1
+
+# Cost of one bend, in inches of extra path
+BEND_COST = 0.6
+
+# Routes with more bends than this cannot be drawn as a preset elbow connector
+MAX_BENDS = 4
+
+# Search states expanded before giving up; keeps routing time bounded on crowded slides
+MAX_EXPANSIONS = 60_000
+
+Route = namedtuple("Route", "source_site target_site points")
+
+_graphs = {}
+_MAX_CACHED_GRAPHS = 64
+
+class VisibilityGraph:
+    """Orthogonal grid over every obstacle edge and connection site, with blocked nodes and segments
+
+    Obstacles are (left, top, width, height) rectangles in inches, inflated by
+    the margin. Points strictly inside an inflated obstacle are blocked, so
+    routes may run along the clearance line between two neighboring shapes.
+    """
+
+    def __init__(self, obstacles, margin=MARGIN):
+        self.margin = margin
+        boxes = [(left - margin, top - margin, left + width + margin, top + height + margin)
+                 for left, top, width, height in obstacles]
+
+        xs, ys = set(), set()
+        for (left, top, width, height), (x0, y0, x1, y1) in zip(obstacles, boxes):
+            xs.update((x0, x1, left + width / 2))
+            ys.update((y0, y1, top + height / 2))
+        self.xs = sorted(xs)
+        self.ys = sorted(ys)
+        self.x_index = {x: i for i, x in enumerate(self.xs)}
+        self.y_index = {y: j for j, y in enumerate(self.ys)}
+
+        # blocked[j][i]: node (i, j) is inside an obstacle
+        # free_h[j][i]: segment (i, j)-(i + 1, j) is clear; free_v[i][j]: segment (i, j)-(i, j + 1) is clear
+        self.blocked = []
+        self.free_h = []
+        for y in self.ys:
+            spans = [(x0, x1) for x0, y0, x1, y1 in boxes if y0 < y < y1]
+            self.blocked.append(self._inside(self.xs, spans))
+            self.free_h.append(self._clear(self.xs, spans))
+        self.free_v = [self._clear(self.ys, [(y0, y1) for x0, y0, x1, y1 in boxes if x0 < x < x1])
+                       for x in self.xs]
+
+    @staticmethod
+    def _inside(coords, spans):
+        """Which coords lie strictly inside any span"""
+        inside = [False] * len(coords)
+        for start, end in spans:
+            for k in range(bisect_right(coords, start), bisect_left(coords, end)):
+                inside[k] = True
+        return inside
+
+    @staticmethod
+    def _clear(coords, spans):
+        """Which gaps between consecutive coords no span overlaps"""
+        free = [True] * max(len(coords) - 1, 0)
+        for start, end in spans:
+            for k in range(max(bisect_right(coords, start) - 1, 0), min(bisect_left(coords, end), len(free))):
+                free[k] = False
+        return free
+
+    def neighbor(self, i, j, direction):
+        """Grid node one step from (i, j) in direction, or None when the way is blocked"""
+        dx, dy = direction
+        if dx:
+            k = i if dx > 0 else i - 1
+            if 0 <= k < len(self.xs) - 1 and self.free_h[j][k]:
+                return i + dx, j
+        else:
+            k = j if dy > 0 else j - 1
+            if 0 <= k < len(self.ys) - 1 and self.free_v[i][k]:
+                return i, j + dy
+        return None
+
+def visibility_graph(obstacles, margin=MARGIN):
+    """Cached VisibilityGraph for an obstacle set; every connector on a slide shares one"""
+    key = (tuple(obstacles), margin)
+    graph = _graphs.get(key)
+    if graph is None:
+        if len(_graphs) >= _MAX_CACHED_GRAPHS:
+            _graphs.pop(next(iter(_graphs)))
+        graph = _graphs[key] = VisibilityGraph(obstacles, margin)
+    return graph
+
+def site_point(rect, site):
+    """Position of a connection site on a (left, top, width, height) rectangle"""
+    left, top, width, height = rect
+    fx, fy, _ = SITES[site]
+    return left + fx * width, top + fy * height
+
+def contains(outer, inner):
+    """Whether the (left, top, width, height) rectangle outer encloses inner"""
+    return (outer[0] <= inner[0] and outer[1] <= inner[1]
+            and outer[0] + outer[2] >= inner[0] + inner[2] and outer[1] + outer[3] >= inner[1] + inner[3])
+
+def midpoint(points):
+    """Point halfway along a polyline, measured along its length"""
+    segments = list(zip(points, points[1:]))
+    remaining = sum(math.dist(start, end) for start, end in segments) / 2
+    for (x1, y1), (x2, y2) in segments:
+        length = math.dist((x1, y1), (x2, y2))
+        if length and remaining <= length:
+            fraction = remaining / length
+            return x1 + (x2 - x1) * fraction, y1 + (y2 - y1) * fraction
+        remaining -= length
+    return points[-1]
+
+def _simplify(points):
+    """Drop repeated and collinear interior points"""
+    simplified = []
+    for point in points:
+        if simplified and point == simplified[-1]:
+            continue
+        if len(simplified) >= 2:
+            (ax, ay), (bx, by) = simplified[-2], simplified[-1]
+            if (ax == bx == point[0]) or (ay == by == point[1]):
+                simplified[-1] = point
+                continue
+        simplified.append(point)
+    return simplified
+
+def route(obstacles, source, target, margin=MARGIN):
+    """Route an orthogonal path from obstacles[source] to obstacles[target] around the rest
+
+    Tries every connection site pair in one search and returns
+    Route(source_site, target_site, points) with points in inches from the
+    source site to the target site, or None when no route with at most
+    MAX_BENDS bends was found within the search budget.
+    """
+    graph = visibility_graph(obstacles, margin)
+    rects = [obstacles[source], obstacles[target]]
+
+    def stub(rect, site):
+        x, y = site_point(rect, site)
+        (dx, dy) = SITES[site][2]
+        node = (graph.x_index.get(x + dx * margin if dx else x), graph.y_index.get(y + dy * margin if dy else y))
+        if None in node or graph.blocked[node[1]][node[0]]:
+            return None
+        return node
+
+    goals = {}
+    for site in range(len(SITES)):
+        node = stub(rects[1], site)
+        if node is not None:
+            inward = tuple(-d for d in SITES[site][2])
+            goals.setdefault(node, []).append((site, inward))
+    if not goals:
+        return None
+    goal_points = [(graph.xs[i], graph.ys[j]) for i, j in goals]
+
+    def estimate(i, j):
+        x, y = graph.xs[i], graph.ys[j]
+        return min(abs(x - gx) + abs(y - gy) for gx, gy in goal_points)
+
+    # State: (node, direction); each carries the bends taken so far and a back pointer.
+    # The counter breaks cost ties without comparing states.
+    heap = []
+    best = {}
+    counter = itertools.count()
+    for site in range(len(SITES)):
+        node = stub(rects[0], site)
+        if node is not None:
+            direction = SITES[site][2]
+            state = (node, direction)
+            best[state] = (margin, 0, None, site)
+            heapq.heappush(heap, (margin + estimate(*node), next(counter), margin, 0, state))
+
+    finish = None
+    expansions = 0
+    while heap and expansions < MAX_EXPANSIONS:
+        _, _, cost, bends, state = heapq.heappop(heap)
+        if best[state][0] < cost:
+            continue
+        if state[0] == "goal":
+            finish = state
+            break
+        expansions += 1
+        node, direction = state
+
+        for site, inward in goals.get(node, ()):
+            turn = direction != inward
+            if bends + turn <= MAX_BENDS:
+                goal = ("goal", site)
+                total = cost + margin + (BEND_COST if turn else 0)
+                if goal not in best or total < best[goal][0]:
+                    best[goal] = (total, bends + turn, state, site)
+                    heapq.heappush(heap, (total, next(counter), total, bends + turn, goal))
+
+        for turn_to in (direction, (direction[1], direction[0]), (-direction[1], -direction[0])):
+            turn = turn_to != direction
+            if bends + turn > MAX_BENDS:
+                continue
+            next_node = graph.neighbor(node[0], node[1], turn_to)
+            if next_node is None:
+                continue
+            step = (abs(graph.xs[next_node[0]] - graph.xs[node[0]])
+                    + abs(graph.ys[next_node[1]] - graph.ys[node[1]]))
+            total = cost + step + (BEND_COST if turn else 0)
+            next_state = (next_node, turn_to)
+            if next_state not in best or total < best[next_state][0]:
+                best[next_state] = (total, bends + turn, state, None)
+                heapq.heappush(heap, (total + estimate(*next_node), next(counter), total, bends + turn, next_state))
+
+    if finish is None:
+        return None
+
+    # Walk the back pointers from the goal to the source stub
+    target_site = finish[1]
+    nodes = []
+    state = best[finish][2]
+    while True:
+        nodes.append(state[0])
+        _, _, previous, site = best[state]
+        if previous is None:
+            source_site = site
+            break
+        state = previous
+    nodes.reverse()
+
+    points = [site_point(rects[0], source_site)]
+    points += [(graph.xs[i], graph.ys[j]) for i, j in nodes]
+    points.append(site_point(rects[1], target_site))
+    return Route(source_site, target_site, _simplify(points))
+
+def nearest_sites(source_rect, target_rect):
+    """(source site, target site) pair whose points are closest, for drawing a straight connector"""
+    def distance(sites):
+        (x1, y1), (x2, y2) = site_point(source_rect, sites[0]), site_point(target_rect, sites[1])
+        return abs(x2 - x1) + abs(y2 - y1)
+    return min(((s, t) for s in range(len(SITES)) for t in range(len(SITES))), key=distance)
+
+# Preset connector drawing a route with the given number of bends
+CONNECTOR_PRESETS = ("straightConnector1", "bentConnector2", "bentConnector3", "bentConnector4", "bentConnector5")
+
+# Smallest box extent an elbow's guides can be expressed against, in inches
+MIN_EXTENT = 0.002
+
+ConnectorGeometry = namedtuple("ConnectorGeometry", "preset left top width height rotation flip_h flip_v adjustments")
+
+def connector_geometry(points):
+    """Express an orthogonal polyline as a preset connector's transform and guide values
+
+    Preset elbows all leave their start horizontally, so a route that leaves
+    vertically is drawn in a frame turned a quarter turn and the connector is
+    rotated back by 90 degrees. Guide values are fractions of the box in
+    1/100000ths, measured from the start point, which absorbs any flips.
+    """
+    points = _simplify(points)
+    bends = len(points) - 2
+    if bends > MAX_BENDS:
+        raise ValueError(f"A preset connector draws at most {MAX_BENDS} bends, got {bends}")
+
+    vertical_first = bends > 0 and points[0][0] == points[1][0]
+    if vertical_first:
+        points = [(y, -x) for x, y in points]
+
+    (sx, sy), (ex, ey) = points[0], points[-1]
+    # Elbows with guides along an axis need some extent on it to measure against
+    if bends >= 2 and abs(ex - sx) < MIN_EXTENT:
+        ex = sx + MIN_EXTENT
+    if bends >= 3 and abs(ey - sy) < MIN_EXTENT:
+        ey = sy + MIN_EXTENT
+
+    def u(x):
+        return round((x - sx) / (ex - sx) * 100000)
+
+    def v(y):
+        return round((y - sy) / (ey - sy) * 100000)
+
+    # bentConnector3-5 guides: first vertical leg's x, middle horizontal leg's y, second vertical leg's x
+    corners = points[1:-1]
+    adjustments = []
+    if bends >= 2:
+        adjustments.append(u(corners[0][0]))
+    if bends >= 3:
+        adjustments.append(v(corners[1][1]))
+    if bends >= 4:
+        adjustments.append(u(corners[2][0]))
+
+    width, height = abs(ex - sx), abs(ey - sy)
+    center_x, center_y = (sx + ex) / 2, (sy + ey) / 2
+    if vertical_first:
+        center_x, center_y = -center_y, center_x
+    return ConnectorGeometry(CONNECTOR_PRESETS[bends], center_x - width / 2, center_y - height / 2, width, height,
+                             90 if vertical_first else 0, ex < sx, ey < sy, adjustments)
+
+def connector_path(geometry):
+    """Polyline a preset connector draws, in its geometry's units; the inverse of connector_geometry"""
+    guides = [value / 100000 for value in geometry.adjustments]
+    guides += [0.5] * (3 - len(guides))     # Unset guides default to the midpoint
+    a1, a2, a3 = guides
+    local = {
+        "bentConnector2": [(0, 0), (1, 0), (1, 1)],
+        "bentConnector3": [(0, 0), (a1, 0), (a1, 1), (1, 1)],
+        "bentConnector4": [(0, 0), (a1, 0), (a1, a2), (1, a2), (1, 1)],
+        "bentConnector5": [(0, 0), (a1, 0), (a1, a2), (a3, a2), (a3, 1), (1, 1)],
+    }.get(geometry.preset, [(0, 0), (1, 1)])
+
+    center_x = geometry.left + geometry.width / 2
+    center_y = geometry.top + geometry.height / 2
+    turn = math.radians(geometry.rotation)
+    cos, sin = math.cos(turn), math.sin(turn)
+    points = []
+    for u, v in local:
+        if geometry.flip_h:
+            u = 1 - u
+        if geometry.flip_v:
+            v = 1 - v
+        # Offset from the box center, rotated clockwise (y points down) about it
+        x, y = (u - 0.5) * geometry.width, (v - 0.5) * geometry.height
+        points.append((center_x + x * cos - y * sin, center_y + x * sin + y * cos))
+    return points
+
+def main():
+    """Time graph construction and routing on a grid of boxes"""
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Benchmark connector routing on a crowded slide")
+    parser.add_argument("--shapes", type=int, default=144, help="Number of boxes to lay out in a square grid")
+    parser.add_argument("--connectors", type=int, default=50, help="Number of connectors to route")
+    args = parser.parse_args()
+
+    columns = max(1, round(args.shapes ** 0.5))
+    obstacles = [(0.5 + (i % columns) * 0.9, 1 + (i // columns) * 0.5, 0.6, 0.3) for i in range(args.shapes)]
+
+    start = time.perf_counter()
+    visibility_graph(obstacles)
+    built = time.perf_counter() - start
+
+    start = time.perf_counter()
+    routed = 0
+    for k in range(args.connectors):
+        source = (k * 7) % args.shapes
+        target = (k * 13 + args.shapes // 2) % args.shapes
+        if source != target and route(obstacles, source, target) is not None:
+            routed += 1
+    elapsed = time.perf_counter() - start
+
+    print(f"✅ Built the graph for {args.shapes} shapes in {built * 1000:.1f} ms")
+    print(f"✅ Routed {routed}/{args.connectors} connectors in {elapsed * 1000:.1f} ms "
+          f"({elapsed * 1000 / max(args.connectors, 1):.1f} ms each)")
+
+if __name__ == "__main__":
+    main()
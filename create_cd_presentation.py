@@ -4,187 +4,75 @@ Harness CD Workflow Presentation Generator
 Creates a comprehensive PowerPoint presentation for VM and ECS deployments
 """
 
-from pptx import Presentation
-from pptx.util import Inches, Pt
-from pptx.enum.text import PP_ALIGN
-from pptx.dml.color import RGBColor
-from pptx.enum.shapes import MSO_SHAPE
+import argparse
 
-# Color scheme
-PRIMARY_COLOR = RGBColor(0, 102, 204)      # Blue
-SECONDARY_COLOR = RGBColor(0, 168, 107)    # Green
-ACCENT_COLOR = RGBColor(255, 102, 0)       # Orange
-DARK_GRAY = RGBColor(51, 51, 51)           # Dark Gray
-LIGHT_GRAY = RGBColor(242, 242, 242)       # Light Gray
-
-def create_presentation():
-    """Create the PowerPoint presentation"""
-    prs = Presentation()
-    prs.slide_width = Inches(10)
-    prs.slide_height = Inches(7.5)
-
-    # Slide 1: Title Slide
-    create_title_slide(prs)
-
-    # Slide 2: Agenda
-    create_agenda_slide(prs)
-
-    # Slide 3: Introduction to Harness CD
-    create_intro_slide(prs)
-
-    # Slide 4: CD Flow Overview
-    create_cd_flow_overview_slide(prs)
-
-    # Slide 5: VM Deployment Architecture
-    create_vm_architecture_slide(prs)
-
-    # Slide 6: VM Deployment Dataflow
-    create_vm_dataflow_slide(prs)
-
-    # Slide 7: VM Deployment Components
-    create_vm_components_slide(prs)
-
-    # Slide 8: VM Deployment Pipeline Steps
-    create_vm_pipeline_steps_slide(prs)
-
-    # Slide 9: VM Pre-Deployment Phase
-    create_vm_pre_deployment_slide(prs)
-
-    # Slide 10: VM Deployment Execution
-    create_vm_deployment_execution_slide(prs)
-
-    # Slide 11: VM Post-Deployment Phase
-    create_vm_post_deployment_slide(prs)
-
-    # Slide 12: ECS Deployment Architecture
-    create_ecs_architecture_slide(prs)
-
-    # Slide 13: ECS Deployment Dataflow
-    create_ecs_dataflow_slide(prs)
-
-    # Slide 14: ECS Components
-    create_ecs_components_slide(prs)
-
-    # Slide 15: ECS Task Definition
-    create_ecs_task_definition_slide(prs)
+import presentation_core as core
+from presentation_core import PP_ALIGN, Color, TableCell
 
-    # Slide 16: ECS Deployment Strategies
-    create_ecs_deployment_strategies_slide(prs)
-
-    # Slide 17: ECS Rolling Deployment
-    create_ecs_rolling_deployment_slide(prs)
-
-    # Slide 18: ECS Blue-Green Deployment
-    create_ecs_blue_green_slide(prs)
-
-    # Slide 19: ECS Canary Deployment
-    create_ecs_canary_deployment_slide(prs)
-
-    # Slide 20: Deployment Comparison
-    create_deployment_comparison_slide(prs)
-
-    # Slide 21: Best Practices - VM
-    create_vm_best_practices_slide(prs)
-
-    # Slide 22: Best Practices - ECS
-    create_ecs_best_practices_slide(prs)
-
-    # Slide 23: Security & Compliance
-    create_security_compliance_slide(prs)
-
-    # Slide 24: Monitoring & Verification
-    create_monitoring_verification_slide(prs)
+# Color scheme
+PRIMARY_COLOR = Color(0, 102, 204)      # Blue
+SECONDARY_COLOR = Color(0, 168, 107)    # Green
+ACCENT_COLOR = Color(255, 102, 0)       # Orange
+DARK_GRAY = Color(51, 51, 51)           # Dark Gray
+LIGHT_GRAY = Color(242, 242, 242)       # Light Gray
+WHITE = Color(255, 255, 255)
 
-    # Slide 25: Rollback Strategies
-    create_rollback_strategies_slide(prs)
+DEFAULT_OUTPUT_FILE = "/Users/tejasodanapalli/Desktop/Dailywork/Harness_CD_VM_ECS_Deployment_Workflows.pptx"
 
-    # Slide 26: Implementation Timeline
-    create_implementation_timeline_slide(prs)
+# Per-deck variant settings (overridden by build_deck_batch.py)
+CUSTOMER_NAME = None
+FOOTER_YEAR = None
 
-    # Slide 27: Key Takeaways
-    create_key_takeaways_slide(prs)
+def new_presentation():
+    """Create an empty 4:3 presentation"""
+    return core.new_presentation(10, 7.5)
 
-    # Slide 28: Next Steps
-    create_next_steps_slide(prs)
+def slide_indices(slides=None):
+    """Resolve a slide selection (builder names or 1-based numbers) to SLIDE_BUILDERS indices"""
+    return core.slide_indices(SLIDE_BUILDERS, slides)
 
-    # Slide 29: Resources
-    create_resources_slide(prs)
+def create_presentation(slides=None):
+    """Create the PowerPoint presentation"""
+    prs = new_presentation()
 
-    # Slide 30: Thank You
-    create_thank_you_slide(prs)
+    for index in slide_indices(slides):
+        SLIDE_BUILDERS[index](prs)
 
     return prs
 
 def add_title_to_slide(slide, title_text):
     """Add a title to a slide"""
     # Add title as a text box since we're using blank layout
-    title_box = slide.shapes.add_textbox(Inches(0.5), Inches(0.3), Inches(9), Inches(0.8))
-    text_frame = title_box.text_frame
-    p = text_frame.paragraphs[0]
-    p.text = title_text
-    p.font.size = Pt(44)
-    p.font.bold = True
-    p.font.color.rgb = PRIMARY_COLOR
-
-def add_textbox(slide, left, top, width, height, text, font_size=18, bold=False, color=DARK_GRAY):
+    core.add_title(slide, title_text, 9, 44, PRIMARY_COLOR)
+
+def add_textbox(slide, left, top, width, height, text, font_size=18, bold=False, color=None):
     """Add a text box to a slide"""
-    textbox = slide.shapes.add_textbox(Inches(left), Inches(top), Inches(width), Inches(height))
-    text_frame = textbox.text_frame
-    text_frame.word_wrap = True
-    p = text_frame.paragraphs[0]
-    p.text = text
-    p.font.size = Pt(font_size)
-    p.font.bold = bold
-    p.font.color.rgb = color
-    return textbox
+    if color is None:
+        color = DARK_GRAY
+    return core.add_text_box(slide, left, top, width, height, text, font_size, bold, color)
 
 def add_bullet_points(slide, left, top, width, height, items, font_size=18):
     """Add bullet points to a slide"""
-    textbox = slide.shapes.add_textbox(Inches(left), Inches(top), Inches(width), Inches(height))
-    text_frame = textbox.text_frame
-    text_frame.word_wrap = True
-
-    for i, item in enumerate(items):
-        if i > 0:
-            p = text_frame.add_paragraph()
-        else:
-            p = text_frame.paragraphs[0]
-        p.text = item
-        p.level = 0
-        p.font.size = Pt(font_size)
-        p.font.color.rgb = DARK_GRAY
-        p.space_before = Pt(12)
-
-def add_diagram_box(slide, left, top, width, height, text, color=PRIMARY_COLOR):
+    core.add_bullet_list(slide, left, top, width, height, items, font_size, DARK_GRAY, space_before=12)
+
+def add_diagram_box(slide, left, top, width, height, text, color=None):
     """Add a diagram box to a slide"""
-    shape = slide.shapes.add_shape(
-        MSO_SHAPE.ROUNDED_RECTANGLE,
-        Inches(left), Inches(top), Inches(width), Inches(height)
-    )
-    shape.fill.solid()
-    shape.fill.fore_color.rgb = color
-    shape.line.color.rgb = color
-
-    text_frame = shape.text_frame
-    text_frame.text = text
-    text_frame.word_wrap = True
-    p = text_frame.paragraphs[0]
-    p.font.size = Pt(14)
-    p.font.bold = True
-    p.font.color.rgb = RGBColor(255, 255, 255)
-    p.alignment = PP_ALIGN.CENTER
-
-    return shape
+    if color is None:
+        color = PRIMARY_COLOR
+    return core.add_shape_box(slide, left, top, width, height, text, color, WHITE, 14, True,
+                              middle=False, paragraph_per_line=True)
 
 def add_arrow(slide, x1, y1, x2, y2):
     """Add an arrow connector between two points"""
-    connector = slide.shapes.add_connector(
-        1,  # Straight connector
-        Inches(x1), Inches(y1), Inches(x2), Inches(y2)
-    )
-    connector.line.color.rgb = DARK_GRAY
-    connector.line.width = Pt(2)
-    return connector
+    return core.add_arrow(slide, x1, y1, x2, y2, DARK_GRAY, 2)
+
+def add_table(slide, left, top, col_widths, header, rows, header_height=0.6, row_height=0.5, font_size=12):
+    """Add a table with a header row; the first column of each row is bold"""
+    table_rows = [(header_height, [TableCell(text, None, PRIMARY_COLOR, 14, True, "left") for text in header])]
+    for row in rows:
+        cells = [TableCell(text, None, DARK_GRAY, font_size, i == 0, "left") for i, text in enumerate(row)]
+        table_rows.append((row_height, cells))
+    return core.add_table(slide, left, top, col_widths, table_rows)
 
 # ============================================================================
 # SLIDE CREATION FUNCTIONS
@@ -192,7 +80,7 @@ def add_arrow(slide, x1, y1, x2, y2):
 
 def create_title_slide(prs):
     """Slide 1: Title Slide"""
-    slide = prs.slides.add_slide(prs.slide_layouts[6])  # Blank layout
+    slide = core.blank_slide(prs)  # Blank layout
 
     # Main title
     title_box = add_textbox(slide, 1, 2.5, 8, 1,
@@ -207,14 +95,19 @@ def create_title_slide(prs):
     subtitle_box.text_frame.paragraphs[0].alignment = PP_ALIGN.CENTER
 
     # Additional info
+    info_text = "Detailed Architecture & Implementation Guide"
+    if FOOTER_YEAR:
+        info_text = f"{info_text} | {FOOTER_YEAR}"
+    if CUSTOMER_NAME:
+        info_text = f"Prepared for {CUSTOMER_NAME}\n{info_text}"
     info_box = add_textbox(slide, 1, 5, 8, 0.5,
-                          "Detailed Architecture & Implementation Guide",
+                          info_text,
                           font_size=24, bold=False, color=DARK_GRAY)
     info_box.text_frame.paragraphs[0].alignment = PP_ALIGN.CENTER
 
 def create_agenda_slide(prs):
     """Slide 2: Agenda"""
-    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    slide = core.blank_slide(prs)
     add_title_to_slide(slide, "Agenda")
 
     items = [
@@ -232,7 +125,7 @@ def create_agenda_slide(prs):
 
 def create_intro_slide(prs):
     """Slide 3: Introduction to Harness CD"""
-    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    slide = core.blank_slide(prs)
     add_title_to_slide(slide, "What is Harness CD?")
 
     # Definition
@@ -266,7 +159,7 @@ def create_intro_slide(prs):
 
 def create_cd_flow_overview_slide(prs):
     """Slide 4: CD Flow Overview"""
-    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    slide = core.blank_slide(prs)
     add_title_to_slide(slide, "CD Flow Overview")
 
     # Flow diagram
@@ -307,7 +200,7 @@ def create_cd_flow_overview_slide(prs):
 
 def create_vm_architecture_slide(prs):
     """Slide 5: VM Deployment Architecture"""
-    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    slide = core.blank_slide(prs)
     add_title_to_slide(slide, "VM Deployment Architecture")
 
     # Harness Platform
@@ -339,7 +232,7 @@ def create_vm_architecture_slide(prs):
 
 def create_vm_dataflow_slide(prs):
     """Slide 6: VM Deployment Dataflow"""
-    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    slide = core.blank_slide(prs)
     add_title_to_slide(slide, "VM Deployment Dataflow")
 
     flow_items = [
@@ -366,7 +259,7 @@ def create_vm_dataflow_slide(prs):
 
 def create_vm_components_slide(prs):
     """Slide 7: VM Deployment Components"""
-    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    slide = core.blank_slide(prs)
     add_title_to_slide(slide, "VM Deployment Components")
 
     # Component boxes
@@ -385,7 +278,7 @@ def create_vm_components_slide(prs):
 
 def create_vm_pipeline_steps_slide(prs):
     """Slide 8: VM Deployment Pipeline Steps"""
-    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    slide = core.blank_slide(prs)
     add_title_to_slide(slide, "VM Pipeline: Detailed Steps")
 
     steps = [
@@ -416,7 +309,7 @@ def create_vm_pipeline_steps_slide(prs):
 
 def create_vm_pre_deployment_slide(prs):
     """Slide 9: VM Pre-Deployment Phase"""
-    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    slide = core.blank_slide(prs)
     add_title_to_slide(slide, "VM Pre-Deployment Phase")
 
     # Phase diagram
@@ -446,7 +339,7 @@ def create_vm_pre_deployment_slide(prs):
 
 def create_vm_deployment_execution_slide(prs):
     """Slide 10: VM Deployment Execution"""
-    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    slide = core.blank_slide(prs)
     add_title_to_slide(slide, "VM Deployment Execution")
 
     # Execution flow
@@ -486,7 +379,7 @@ def create_vm_deployment_execution_slide(prs):
 
 def create_vm_post_deployment_slide(prs):
     """Slide 11: VM Post-Deployment Phase"""
-    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    slide = core.blank_slide(prs)
     add_title_to_slide(slide, "VM Post-Deployment Phase")
 
     add_diagram_box(slide, 3, 1.5, 4, 0.6, "Post-Deployment Phase", PRIMARY_COLOR)
@@ -518,7 +411,7 @@ def create_vm_post_deployment_slide(prs):
 
 def create_ecs_architecture_slide(prs):
     """Slide 12: ECS Deployment Architecture"""
-    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    slide = core.blank_slide(prs)
     add_title_to_slide(slide, "ECS Deployment Architecture")
 
     # Harness Platform
@@ -555,7 +448,7 @@ def create_ecs_architecture_slide(prs):
 
 def create_ecs_dataflow_slide(prs):
     """Slide 13: ECS Deployment Dataflow"""
-    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    slide = core.blank_slide(prs)
     add_title_to_slide(slide, "ECS Deployment Dataflow")
 
     flow_items = [
@@ -586,7 +479,7 @@ def create_ecs_dataflow_slide(prs):
 
 def create_ecs_components_slide(prs):
     """Slide 14: ECS Components"""
-    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    slide = core.blank_slide(prs)
     add_title_to_slide(slide, "Amazon ECS Components")
 
     components = [
@@ -604,7 +497,7 @@ def create_ecs_components_slide(prs):
 
 def create_ecs_task_definition_slide(prs):
     """Slide 15: ECS Task Definition"""
-    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    slide = core.blank_slide(prs)
     add_title_to_slide(slide, "ECS Task Definition")
 
     add_textbox(slide, 1, 1.5, 8, 0.4, "Task Definition Structure:", font_size=18, bold=True)
@@ -643,7 +536,7 @@ def create_ecs_task_definition_slide(prs):
 
 def create_ecs_deployment_strategies_slide(prs):
     """Slide 16: ECS Deployment Strategies"""
-    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    slide = core.blank_slide(prs)
     add_title_to_slide(slide, "ECS Deployment Strategies")
 
     strategies = [
@@ -667,7 +560,7 @@ def create_ecs_deployment_strategies_slide(prs):
 
 def create_ecs_rolling_deployment_slide(prs):
     """Slide 17: ECS Rolling Deployment"""
-    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    slide = core.blank_slide(prs)
     add_title_to_slide(slide, "ECS Rolling Deployment")
 
     add_textbox(slide, 1, 1.5, 8, 0.4, "Rolling Update Process:", font_size=18, bold=True)
@@ -710,7 +603,7 @@ def create_ecs_rolling_deployment_slide(prs):
 
 def create_ecs_blue_green_slide(prs):
     """Slide 18: ECS Blue-Green Deployment"""
-    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    slide = core.blank_slide(prs)
     add_title_to_slide(slide, "ECS Blue-Green Deployment")
 
     add_textbox(slide, 1, 1.5, 8, 0.4, "Blue-Green Deployment Process:", font_size=18, bold=True)
@@ -749,7 +642,7 @@ def create_ecs_blue_green_slide(prs):
 
 def create_ecs_canary_deployment_slide(prs):
     """Slide 19: ECS Canary Deployment"""
-    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    slide = core.blank_slide(prs)
     add_title_to_slide(slide, "ECS Canary Deployment")
 
     add_textbox(slide, 1, 1.5, 8, 0.4, "Canary Deployment Process:", font_size=18, bold=True)
@@ -794,39 +687,16 @@ def create_ecs_canary_deployment_slide(prs):
 
 def create_deployment_comparison_slide(prs):
     """Slide 20: Deployment Comparison"""
-    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    slide = core.blank_slide(prs)
     add_title_to_slide(slide, "Deployment Strategy Comparison")
 
-    # Table headers
-    add_textbox(slide, 1, 1.5, 2, 0.4, "Strategy", font_size=14, bold=True, color=PRIMARY_COLOR)
-    add_textbox(slide, 3, 1.5, 1.5, 0.4, "Downtime", font_size=14, bold=True, color=PRIMARY_COLOR)
-    add_textbox(slide, 4.5, 1.5, 1.5, 0.4, "Rollback", font_size=14, bold=True, color=PRIMARY_COLOR)
-    add_textbox(slide, 6, 1.5, 1.5, 0.4, "Complexity", font_size=14, bold=True, color=PRIMARY_COLOR)
-    add_textbox(slide, 7.5, 1.5, 1.5, 0.4, "Best For", font_size=14, bold=True, color=PRIMARY_COLOR)
-
-    # Rolling Update
-    y = 2.1
-    add_textbox(slide, 1, y, 2, 0.3, "Rolling Update", font_size=12, bold=True)
-    add_textbox(slide, 3, y, 1.5, 0.3, "Minimal", font_size=12)
-    add_textbox(slide, 4.5, y, 1.5, 0.3, "Manual", font_size=12)
-    add_textbox(slide, 6, y, 1.5, 0.3, "Low", font_size=12)
-    add_textbox(slide, 7.5, y, 1.5, 0.3, "Standard", font_size=11)
-
-    # Blue-Green
-    y = 2.6
-    add_textbox(slide, 1, y, 2, 0.3, "Blue-Green", font_size=12, bold=True)
-    add_textbox(slide, 3, y, 1.5, 0.3, "Zero", font_size=12)
-    add_textbox(slide, 4.5, y, 1.5, 0.3, "Instant", font_size=12)
-    add_textbox(slide, 6, y, 1.5, 0.3, "Medium", font_size=12)
-    add_textbox(slide, 7.5, y, 1.5, 0.3, "Critical apps", font_size=11)
-
-    # Canary
-    y = 3.1
-    add_textbox(slide, 1, y, 2, 0.3, "Canary", font_size=12, bold=True)
-    add_textbox(slide, 3, y, 1.5, 0.3, "Zero", font_size=12)
-    add_textbox(slide, 4.5, y, 1.5, 0.3, "Automatic", font_size=12)
-    add_textbox(slide, 6, y, 1.5, 0.3, "High", font_size=12)
-    add_textbox(slide, 7.5, y, 1.5, 0.3, "High-risk", font_size=11)
+    add_table(slide, 1, 1.5, [2, 1.5, 1.5, 1.5, 1.5],
+              ["Strategy", "Downtime", "Rollback", "Complexity", "Best For"],
+              [
+                  ["Rolling Update", "Minimal", "Manual", "Low", "Standard"],
+                  ["Blue-Green", "Zero", "Instant", "Medium", "Critical apps"],
+                  ["Canary", "Zero", "Automatic", "High", "High-risk"],
+              ])
 
     # Decision matrix
     add_textbox(slide, 1, 4, 8, 0.4, "Decision Matrix:", font_size=16, bold=True)
@@ -851,7 +721,7 @@ def create_deployment_comparison_slide(prs):
 
 def create_vm_best_practices_slide(prs):
     """Slide 21: Best Practices - VM"""
-    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    slide = core.blank_slide(prs)
     add_title_to_slide(slide, "VM Deployment Best Practices")
 
     practices = [
@@ -883,7 +753,7 @@ def create_vm_best_practices_slide(prs):
 
 def create_ecs_best_practices_slide(prs):
     """Slide 22: Best Practices - ECS"""
-    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    slide = core.blank_slide(prs)
     add_title_to_slide(slide, "ECS Deployment Best Practices")
 
     practices = [
@@ -915,7 +785,7 @@ def create_ecs_best_practices_slide(prs):
 
 def create_security_compliance_slide(prs):
     """Slide 23: Security & Compliance"""
-    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    slide = core.blank_slide(prs)
     add_title_to_slide(slide, "Security & Compliance")
 
     # Security features
@@ -951,7 +821,7 @@ def create_security_compliance_slide(prs):
 
 def create_monitoring_verification_slide(prs):
     """Slide 24: Monitoring & Verification"""
-    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    slide = core.blank_slide(prs)
     add_title_to_slide(slide, "Monitoring & Continuous Verification")
 
     # Monitoring tools
@@ -993,7 +863,7 @@ def create_monitoring_verification_slide(prs):
 
 def create_rollback_strategies_slide(prs):
     """Slide 25: Rollback Strategies"""
-    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    slide = core.blank_slide(prs)
     add_title_to_slide(slide, "Rollback Strategies")
 
     # Rollback types
@@ -1036,7 +906,7 @@ def create_rollback_strategies_slide(prs):
 
 def create_implementation_timeline_slide(prs):
     """Slide 26: Implementation Timeline"""
-    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    slide = core.blank_slide(prs)
     add_title_to_slide(slide, "Implementation Timeline")
 
     timeline = [
@@ -1076,7 +946,7 @@ def create_implementation_timeline_slide(prs):
 
 def create_key_takeaways_slide(prs):
     """Slide 27: Key Takeaways"""
-    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    slide = core.blank_slide(prs)
     add_title_to_slide(slide, "Key Takeaways")
 
     takeaways = [
@@ -1114,7 +984,7 @@ def create_key_takeaways_slide(prs):
 
 def create_next_steps_slide(prs):
     """Slide 28: Next Steps"""
-    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    slide = core.blank_slide(prs)
     add_title_to_slide(slide, "Next Steps")
 
     steps = [
@@ -1154,7 +1024,7 @@ def create_next_steps_slide(prs):
 
 def create_resources_slide(prs):
     """Slide 29: Resources"""
-    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    slide = core.blank_slide(prs)
     add_title_to_slide(slide, "Resources & Documentation")
 
     resources = [
@@ -1189,7 +1059,7 @@ def create_resources_slide(prs):
 
 def create_thank_you_slide(prs):
     """Slide 30: Thank You"""
-    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    slide = core.blank_slide(prs)
 
     # Thank you message
     thank_you_box = add_textbox(slide, 1, 2.5, 8, 1,
@@ -1217,23 +1087,72 @@ def create_thank_you_slide(prs):
         contact_box.text_frame.paragraphs[0].alignment = PP_ALIGN.CENTER
         y_pos += 0.4
 
+# ============================================================================
+# SLIDE ORDER
+# ============================================================================
+
+SLIDE_BUILDERS = [
+    create_title_slide,                         # Slide 1
+    create_agenda_slide,                        # Slide 2
+    create_intro_slide,                         # Slide 3
+    create_cd_flow_overview_slide,              # Slide 4
+    create_vm_architecture_slide,               # Slide 5
+    create_vm_dataflow_slide,                   # Slide 6
+    create_vm_components_slide,                 # Slide 7
+    create_vm_pipeline_steps_slide,             # Slide 8
+    create_vm_pre_deployment_slide,             # Slide 9
+    create_vm_deployment_execution_slide,       # Slide 10
+    create_vm_post_deployment_slide,            # Slide 11
+    create_ecs_architecture_slide,              # Slide 12
+    create_ecs_dataflow_slide,                  # Slide 13
+    create_ecs_components_slide,                # Slide 14
+    create_ecs_task_definition_slide,           # Slide 15
+    create_ecs_deployment_strategies_slide,     # Slide 16
+    create_ecs_rolling_deployment_slide,        # Slide 17
+    create_ecs_blue_green_slide,                # Slide 18
+    create_ecs_canary_deployment_slide,         # Slide 19
+    create_deployment_comparison_slide,         # Slide 20
+    create_vm_best_practices_slide,             # Slide 21
+    create_ecs_best_practices_slide,            # Slide 22
+    create_security_compliance_slide,           # Slide 23
+    create_monitoring_verification_slide,       # Slide 24
+    create_rollback_strategies_slide,           # Slide 25
+    create_implementation_timeline_slide,       # Slide 26
+    create_key_takeaways_slide,                 # Slide 27
+    create_next_steps_slide,                    # Slide 28
+    create_resources_slide,                     # Slide 29
+    create_thank_you_slide,                     # Slide 30
+]
+
 # ============================================================================
 # MAIN FUNCTION
 # ============================================================================
 
 def main():
     """Main function to generate the presentation"""
+    parser = argparse.ArgumentParser(description="Generate the Harness CD workflow presentation")
+    parser.add_argument("-o", "--output", default=DEFAULT_OUTPUT_FILE,
+                        help="Path of the .pptx file to write")
+    parser.add_argument("--list-slides", action="store_true",
+                        help="List the slides without building anything")
+    args = parser.parse_args()
+
+    if args.list_slides:
+        for number, build_slide in enumerate(SLIDE_BUILDERS, 1):
+            print(f"{number:>3}  {build_slide.__name__}")
+        return
+
     print("Creating Harness CD Workflow Presentation...")
 
     try:
         prs = create_presentation()
 
-        output_file = "/Users/tejasodanapalli/Desktop/Dailywork/Harness_CD_VM_ECS_Deployment_Workflows.pptx"
+        output_file = args.output
         prs.save(output_file)
 
         print(f"✓ Presentation created successfully!")
         print(f"✓ File saved: {output_file}")
-        print(f"✓ Total slides: 30")
+        print(f"✓ Total slides: {len(prs.slides)}")
         print("\nPresentation includes:")
         print("  • VM Deployment Architecture & Workflow")
         print("  • ECS Deployment Architecture & Workflow")
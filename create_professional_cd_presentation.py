@@ -4,154 +4,558 @@ Professional Harness CD Architecture Presentation
 Customer-sharable, comprehensive, and visually clear
 """
 
-from pptx import Presentation
-from pptx.util import Inches, Pt
-from pptx.enum.text import PP_ALIGN, MSO_AUTO_SIZE, MSO_VERTICAL_ANCHOR
-from pptx.dml.color import RGBColor
-from pptx.enum.shapes import MSO_SHAPE
-from pptx.enum.dml import MSO_THEME_COLOR
+import argparse
+import hashlib
+import inspect
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import zipfile
+
+import presentation_core as core
+import connector_routing
+import font_embed
+import icon_cache
+import inventory_topology
+import pipeline_import
+import slide_layout
+import slide_specs
+import text_fit
+from presentation_core import PP_ALIGN, Color
 
 # Professional Color Palette
-HARNESS_BLUE = RGBColor(0, 125, 240)        # Primary brand color
-DARK_BLUE = RGBColor(0, 51, 160)            # Secondary
-SUCCESS_GREEN = RGBColor(34, 197, 94)       # Success indicators
-WARNING_ORANGE = RGBColor(251, 146, 60)     # Warnings/Important
-ERROR_RED = RGBColor(239, 68, 68)           # Errors
-LIGHT_GRAY = RGBColor(243, 244, 246)        # Background
-MEDIUM_GRAY = RGBColor(156, 163, 175)       # Secondary text
-DARK_GRAY = RGBColor(55, 65, 81)            # Primary text
-WHITE = RGBColor(255, 255, 255)
-
-def create_presentation():
-    """Create the comprehensive presentation"""
-    prs = Presentation()
-    prs.slide_width = Inches(13.333)  # 16:9 aspect ratio
-    prs.slide_height = Inches(7.5)
-
-    # Create all slides
-    create_title_slide(prs)
-    create_agenda_slide(prs)
-    create_introduction_slide(prs)
-    create_architecture_overview_slide(prs)
-    create_deployment_strategies_overview_slide(prs)
+HARNESS_BLUE = Color(0, 125, 240)        # Primary brand color
+DARK_BLUE = Color(0, 51, 160)            # Secondary
+SUCCESS_GREEN = Color(34, 197, 94)       # Success indicators
+WARNING_ORANGE = Color(251, 146, 60)     # Warnings/Important
+ERROR_RED = Color(239, 68, 68)           # Errors
+LIGHT_GRAY = Color(243, 244, 246)        # Background
+MEDIUM_GRAY = Color(156, 163, 175)       # Secondary text
+DARK_GRAY = Color(55, 65, 81)            # Primary text
+WHITE = Color(255, 255, 255)
+
+DEFAULT_OUTPUT_FILE = "/Users/tejasodanapalli/Desktop/Dailywork/Harness_CD_Professional_Architecture.pptx"
+DEFAULT_CACHE_DIR = ".slide_cache"
+SPEC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "specs")
+
+# Document title for --web and --pdf exports
+DECK_TITLE = "Harness CD Architecture"
+
+# Per-deck variant settings (overridden by build_deck_batch.py)
+CUSTOMER_NAME = None
+FOOTER_YEAR = 2026
+
+def new_presentation():
+    """Create an empty 16:9 presentation"""
+    return core.new_presentation(13.333, 7.5)
+
+def slide_indices(slides=None):
+    """Resolve a slide selection (builder names or 1-based numbers) to SLIDE_BUILDERS indices"""
+    return core.slide_indices(SLIDE_BUILDERS, slides)
+
+def create_presentation(jobs=1, slides=None, pipelines=(), inventories=()):
+    """Create the comprehensive presentation, followed by slides for any pipeline files and inventories"""
+    indices = slide_indices(slides)
+    if jobs > 1:
+        prs = create_presentation_parallel(jobs, indices)
+    else:
+        prs = new_presentation()
+
+        # Create all slides
+        for index in indices:
+            SLIDE_BUILDERS[index](prs)
+
+    for pipeline_file in pipelines:
+        add_pipeline_slides(prs, pipeline_file)
+    for inventory in inventories:
+        add_inventory_slides(prs, inventory)
 
-    # VM Deployment Section
-    create_vm_architecture_overview_slide(prs)
-    create_vm_detailed_architecture_slide(prs)
-    create_vm_deployment_flow_phase1_slide(prs)
-    create_vm_deployment_flow_phase2_slide(prs)
-    create_vm_deployment_flow_phase3_slide(prs)
-    create_vm_deployment_pipeline_slide(prs)
-    create_vm_rollback_slide(prs)
+    return prs
 
-    # ECS Deployment Section
-    create_ecs_architecture_overview_slide(prs)
-    create_ecs_detailed_architecture_slide(prs)
-    create_ecs_deployment_flow_phase1_slide(prs)
-    create_ecs_deployment_flow_phase2_slide(prs)
-    create_ecs_blue_green_detailed_slide(prs)
-    create_ecs_canary_detailed_slide(prs)
-    create_ecs_pipeline_slide(prs)
+def build_slide_blobs(indices):
+    """Build the given slides in a scratch deck; returns their serialized XML and their --fit issues
+
+    Issues come as (position of the slide in indices, TextFitIssue) and are
+    taken out of TEXT_FIT_REPORT, so the caller can file them under the
+    slides' places in the final deck with merge_text_fit_issues().
+    """
+    reported = len(core.TEXT_FIT_REPORT)
+    prs = new_presentation()
+    for index in indices:
+        SLIDE_BUILDERS[index](prs)
+    positions = {str(slide.part.partname): i for i, slide in enumerate(prs.slides)}
+    issues = [(positions[issue.slide], issue) for issue in core.TEXT_FIT_REPORT[reported:]]
+    del core.TEXT_FIT_REPORT[reported:]
+    return [slide.part.blob for slide in prs.slides], issues
+
+def merge_text_fit_issues(issues, first_slide):
+    """Add build_slide_blobs() issues to TEXT_FIT_REPORT, for slides numbered on from first_slide"""
+    for position, issue in issues:
+        core.TEXT_FIT_REPORT.append(issue._replace(slide=f"/ppt/slides/slide{first_slide + position}.xml"))
+
+def create_presentation_parallel(jobs, indices):
+    """Build slides across a process pool and merge them, in order, into one deck"""
+    chunk_size = -(-len(indices) // jobs)
+    chunks = [indices[i:i + chunk_size] for i in range(0, len(indices), chunk_size)]
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    blobs = []
+    with ProcessPoolExecutor(max_workers=jobs, initializer=apply_build_state, initargs=(build_state(),)) as pool:
+        for chunk_blobs, issues in pool.map(build_slide_blobs, chunks):
+            merge_text_fit_issues(issues, len(blobs) + 1)
+            blobs += chunk_blobs
+
+    return assemble_presentation(blobs)
+
+def build_state():
+    """Variant settings, palette, text fit mode and icons a worker process needs to build slides like this one"""
+    return {
+        "settings": {"CUSTOMER_NAME": CUSTOMER_NAME, "FOOTER_YEAR": FOOTER_YEAR, **palette()},
+        "text_fit": core.TEXT_FIT,
+        "icons": core.ICONS,
+    }
+
+def apply_build_state(state):
+    """Pool initializer: apply build_state() from the parent, which spawned workers would otherwise lose"""
+    globals().update(state["settings"])
+    core.set_text_fit(state["text_fit"])
+    core.set_icons(state["icons"])
+
+def assemble_presentation(blobs):
+    """Create a deck whose slides are the given serialized slide parts, in order"""
+    prs = new_presentation()
+    layout = prs.slide_layouts[6]
+    for blob in blobs:
+        # Every builder starts from the blank layout, so only the slide's own XML differs
+        slide = prs.slides.add_slide(layout)
+        built = core.pptx_api().parse_xml(blob)
+        _adopt_children(slide._element, built, slide._element.cSld)
+        _adopt_children(slide._element.cSld, built.cSld, slide._element.cSld.spTree)
+        _adopt_children(slide._element.cSld.spTree, built.cSld.spTree)
 
-    # Network & Security
-    create_network_architecture_slide(prs)
-    create_security_architecture_slide(prs)
-    create_monitoring_slide(prs)
+    return prs
 
-    # Best Practices & Implementation
-    create_deployment_comparison_slide(prs)
-    create_best_practices_slide(prs)
-    create_implementation_roadmap_slide(prs)
-    create_benefits_slide(prs)
+def _adopt_children(element, source, keep=None):
+    """Replace element's children with source's, in order, keeping the child keep in place of its counterpart
 
-    # Closing
-    create_key_takeaways_slide(prs)
-    create_next_steps_slide(prs)
-    create_thank_you_slide(prs)
+    The slide and its shape tree stay the elements python-pptx's Slide and
+    SlideShapes proxies already hold, so the returned deck can be edited.
+    """
+    for child in list(element):
+        element.remove(child)
+    for child in list(source):
+        element.append(keep if keep is not None and child.tag == keep.tag else child)
+    for name, value in source.attrib.items():
+        element.set(name, value)
 
-    return prs
+# =============================================================================
+# INCREMENTAL BUILD CACHE
+# =============================================================================
+
+def shared_source():
+    """This module's source minus the slide builders: every helper, draw-list renderer and setting slides use"""
+    source = inspect.getsource(sys.modules[__name__])
+    for build_slide in SLIDE_BUILDERS:
+        source = source.replace(inspect.getsource(build_slide), "", 1)
+    return source
+
+def shared_fingerprint():
+    """Hash of everything every slide depends on: helpers, palette, variant settings and deck size"""
+    digest = hashlib.sha256()
+    digest.update(core.pptx_api().version.encode())
+    digest.update(inspect.getsource(core).encode())
+    digest.update(shared_source().encode())
+    digest.update(inspect.getsource(slide_specs).encode())
+    digest.update(inspect.getsource(slide_layout).encode())
+    digest.update(inspect.getsource(text_fit).encode())
+    digest.update(inspect.getsource(connector_routing).encode())
+    for name, value in sorted(palette().items()):
+        digest.update(f"{name}={value}".encode())
+    digest.update(f"{CUSTOMER_NAME}|{FOOTER_YEAR}|{core.TEXT_FIT}".encode())
+    return digest.hexdigest()
+
+def slide_fingerprints():
+    """Fingerprint each slide builder's source (and its inline data or spec file) plus the shared inputs"""
+    shared = shared_fingerprint()
+    fingerprints = []
+    for build_slide in SLIDE_BUILDERS:
+        digest = hashlib.sha256((shared + inspect.getsource(build_slide)).encode())
+        spec_file = getattr(build_slide, "spec_file", None)
+        if spec_file is not None:
+            with open(os.path.join(SPEC_DIR, spec_file), "rb") as f:
+                digest.update(f.read())
+        fingerprints.append(digest.hexdigest())
+    return fingerprints
+
+def load_cache_manifest(cache_dir):
+    """Read the manifest recording which fingerprints each output file was built from"""
+    try:
+        with open(os.path.join(cache_dir, "manifest.json")) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_cache_manifest(cache_dir, manifest):
+    """Write the cache manifest"""
+    with open(os.path.join(cache_dir, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2)
+
+def splice_slides(output_file, changed_blobs):
+    """Rewrite only the changed slide parts inside an existing .pptx"""
+    changed = {f"ppt/slides/slide{index + 1}.xml": blob for index, blob in changed_blobs.items()}
+    fd, tmp_file = tempfile.mkstemp(suffix=".pptx", dir=os.path.dirname(os.path.abspath(output_file)))
+    os.close(fd)
+    try:
+        with zipfile.ZipFile(output_file) as zin, \
+                zipfile.ZipFile(tmp_file, "w", compression=zipfile.ZIP_DEFLATED) as zout:
+            for info in zin.infolist():
+                if info.filename in changed:
+                    zout.writestr(info.filename, changed[info.filename])
+                else:
+                    zout.writestr(info, zin.read(info))
+        os.replace(tmp_file, output_file)
+    except BaseException:
+        os.remove(tmp_file)
+        raise
+
+def build_incremental(output_file, cache_dir=DEFAULT_CACHE_DIR, jobs=1, fonts=()):
+    """Re-render only slides whose inputs changed and splice them into output_file
+
+    fonts are font files to embed, subset to the deck's text, before the
+    manifest records the output. --fit issues are cached with each slide and
+    reported for every slide, rebuilt or not. Returns the indices of the
+    slides that were rebuilt.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    fingerprints = slide_fingerprints()
+
+    blobs, issues = {}, {}
+    missing = []
+    for index, fingerprint in enumerate(fingerprints):
+        cached_file = os.path.join(cache_dir, fingerprint + ".xml")
+        if os.path.exists(cached_file):
+            with open(cached_file, "rb") as f:
+                blobs[index] = f.read()
+            # --fit issues found when the slide was built; the fingerprint covers the fit mode
+            issues_file = os.path.join(cache_dir, fingerprint + ".fit.json")
+            if os.path.exists(issues_file):
+                with open(issues_file) as f:
+                    issues[index] = [(0, core.TextFitIssue(None, *issue)) for issue in json.load(f)]
+        else:
+            missing.append(index)
+
+    if missing:
+        if jobs > 1:
+            from concurrent.futures import ProcessPoolExecutor
+
+            with ProcessPoolExecutor(max_workers=jobs, initializer=apply_build_state,
+                                     initargs=(build_state(),)) as pool:
+                built = list(pool.map(build_slide_blobs, [[index] for index in missing]))
+        else:
+            built = [build_slide_blobs([index]) for index in missing]
+        for index, ((blob,), slide_issues) in zip(missing, built):
+            blobs[index], issues[index] = blob, slide_issues
+            with open(os.path.join(cache_dir, fingerprints[index] + ".xml"), "wb") as f:
+                f.write(blob)
+            if slide_issues:
+                with open(os.path.join(cache_dir, fingerprints[index] + ".fit.json"), "w") as f:
+                    json.dump([issue[1:] for _, issue in slide_issues], f)
+    for index in sorted(issues):
+        merge_text_fit_issues(issues[index], index + 1)
+
+    manifest = load_cache_manifest(cache_dir)
+    key = os.path.abspath(output_file)
+    previous = manifest.get(key)
+    up_to_date = (
+        previous is not None
+        and os.path.exists(output_file)
+        and previous["size"] == os.path.getsize(output_file)
+        and previous["mtime"] == os.path.getmtime(output_file)
+        and len(previous["slides"]) == len(fingerprints)
+    )
+
+    if up_to_date:
+        changed = [i for i, fp in enumerate(fingerprints) if previous["slides"][i] != fp]
+        if changed:
+            splice_slides(output_file, {index: blobs[index] for index in changed})
+    else:
+        changed = list(range(len(fingerprints)))
+        assemble_presentation([blobs[index] for index in changed]).save(output_file)
+    if fonts:
+        font_embed.embed_fonts(output_file, fonts)
+
+    manifest[key] = {
+        "size": os.path.getsize(output_file),
+        "mtime": os.path.getmtime(output_file),
+        "slides": fingerprints,
+    }
+    save_cache_manifest(cache_dir, manifest)
+    return changed
+
+# =============================================================================
+# STREAMING OUTPUT
+# =============================================================================
+
+def save_streaming(output_file, slides=None):
+    """Write the deck to output_file, flushing each slide to the ZIP as soon as it is built
+
+    Only one slide's object graph is alive at a time, so peak memory does not
+    grow with the number of slides.
+    """
+    indices = slide_indices(slides)
+
+    # Package skeleton (presentation part, content types, layouts, theme) with
+    # one blank placeholder slide per builder; the placeholders are not written
+    skeleton = new_presentation()
+    layout = skeleton.slide_layouts[6]
+    for _ in indices:
+        skeleton.slides.add_slide(layout)
+    skeleton_file = io.BytesIO()
+    skeleton.save(skeleton_file)
+    del skeleton
+
+    scratch = new_presentation()
+    with zipfile.ZipFile(output_file, "w", compression=zipfile.ZIP_DEFLATED) as zout:
+        with zipfile.ZipFile(skeleton_file) as zin:
+            for info in zin.infolist():
+                if not info.filename.startswith("ppt/slides/"):
+                    zout.writestr(info, zin.read(info))
+        del skeleton_file
+
+        for number, index in enumerate(indices, 1):
+            reported = len(core.TEXT_FIT_REPORT)
+            SLIDE_BUILDERS[index](scratch)
+            if len(scratch.slides) != 1:
+                raise RuntimeError(f"{SLIDE_BUILDERS[index].__name__} must add exactly one slide")
+
+            # Every slide is built as the scratch deck's slide1; report --fit issues under the real one
+            partname = f"/ppt/slides/slide{number}.xml"
+            for i in range(reported, len(core.TEXT_FIT_REPORT)):
+                core.TEXT_FIT_REPORT[i] = core.TEXT_FIT_REPORT[i]._replace(slide=partname)
+
+            slide_part = scratch.slides[0].part
+            zout.writestr(f"ppt/slides/slide{number}.xml", slide_part.blob)
+            zout.writestr(f"ppt/slides/_rels/slide{number}.xml.rels", slide_part.rels.xml)
+            core.drop_slide(scratch, 0)
+
+# =============================================================================
+# PROFILING
+# =============================================================================
+
+def _timed_helper(helper, stats):
+    """Wrap a helper so its calls and wall time accumulate into stats"""
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return helper(*args, **kwargs)
+        finally:
+            entry = stats.setdefault(helper.__name__, {"calls": 0, "wall_ms": 0.0})
+            entry["calls"] += 1
+            entry["wall_ms"] += (time.perf_counter() - start) * 1000
+    return wrapper
+
+def profile_presentation(slides=None):
+    """Build the deck with every slide builder and helper instrumented
+
+    Returns (prs, report) where report holds wall time, shape count, tracemalloc
+    peak and serialized XML size for each slide, plus per-helper call stats.
+    """
+    helper_stats = {}
+    module_globals = globals()
+    originals = {helper.__name__: helper for helper in PROFILED_HELPERS}
+    report = {"slides": [], "total_wall_ms": 0.0}
+
+    prs = new_presentation()
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    try:
+        for name, helper in originals.items():
+            module_globals[name] = _timed_helper(helper, helper_stats)
+
+        for number, index in enumerate(slide_indices(slides), 1):
+            build_slide = SLIDE_BUILDERS[index]
+            helper_stats.clear()
+            tracemalloc.reset_peak()
+            base_memory = tracemalloc.get_traced_memory()[0]
+
+            start = time.perf_counter()
+            build_slide(prs)
+            wall_ms = (time.perf_counter() - start) * 1000
+
+            slide = prs.slides[-1]
+            report["slides"].append({
+                "number": number,
+                "builder": build_slide.__name__,
+                "wall_ms": round(wall_ms, 3),
+                "shape_count": len(slide.shapes),
+                "tracemalloc_peak_bytes": tracemalloc.get_traced_memory()[1] - base_memory,
+                "xml_bytes": len(slide.part.blob),
+                "helpers": {
+                    name: {"calls": entry["calls"], "wall_ms": round(entry["wall_ms"], 3)}
+                    for name, entry in sorted(helper_stats.items())
+                },
+            })
+            report["total_wall_ms"] += wall_ms
+    finally:
+        module_globals.update(originals)
+        if not tracing:
+            tracemalloc.stop()
+
+    report["total_wall_ms"] = round(report["total_wall_ms"], 3)
+    report["import_ms"] = dict(core.IMPORT_TIMINGS)
+    return prs, report
+
+def folded_stacks(report):
+    """Render a profile report as folded stacks (microseconds) for flamegraph tools"""
+    lines = []
+    for slide in report["slides"]:
+        builder = slide["builder"]
+        helper_ms = sum(entry["wall_ms"] for entry in slide["helpers"].values())
+        lines.append(f"create_presentation;{builder} {max(0, round((slide['wall_ms'] - helper_ms) * 1000))}")
+        for name, entry in slide["helpers"].items():
+            lines.append(f"create_presentation;{builder};{name} {round(entry['wall_ms'] * 1000)}")
+    return "\n".join(lines) + "\n"
+
+def write_profile_report(report, report_file):
+    """Write the JSON report and a .folded flamegraph file next to it"""
+    with open(report_file, "w") as f:
+        json.dump(report, f, indent=2)
+    with open(os.path.splitext(report_file)[0] + ".folded", "w") as f:
+        f.write(folded_stacks(report))
 
 def add_slide_with_title(prs, title_text):
     """Add a blank slide with title"""
-    slide = prs.slides.add_slide(prs.slide_layouts[6])
-
-    # Add title
-    title_box = slide.shapes.add_textbox(Inches(0.5), Inches(0.3), Inches(12.3), Inches(0.8))
-    title_frame = title_box.text_frame
-    title_frame.word_wrap = True
-    p = title_frame.paragraphs[0]
-    p.text = title_text
-    p.font.size = Pt(40)
-    p.font.bold = True
-    p.font.color.rgb = HARNESS_BLUE
-
+    slide = core.blank_slide(prs)
+    core.add_title(slide, title_text, 12.3, 40, HARNESS_BLUE, word_wrap=True)
     return slide
 
-def add_text_box(slide, left, top, width, height, text, font_size=16, bold=False, color=DARK_GRAY, align=PP_ALIGN.LEFT):
+def add_text_box(slide, left, top, width, height, text, font_size=16, bold=False, color=None, align=None):
     """Add a text box to slide"""
-    box = slide.shapes.add_textbox(Inches(left), Inches(top), Inches(width), Inches(height))
-    frame = box.text_frame
-    frame.word_wrap = True
-    p = frame.paragraphs[0]
-    p.text = text
-    p.font.size = Pt(font_size)
-    p.font.bold = bold
-    p.font.color.rgb = color
-    p.alignment = align
-    return box
-
-def add_shape_box(slide, left, top, width, height, text, bg_color, text_color=WHITE, font_size=14, bold=True):
+    if color is None:
+        color = DARK_GRAY
+    if align is None:
+        align = PP_ALIGN.LEFT
+    return core.add_text_box(slide, left, top, width, height, text, font_size, bold, color, align)
+
+def add_shape_box(slide, left, top, width, height, text, bg_color, text_color=None, font_size=14, bold=True):
     """Add a colored shape with text"""
-    shape = slide.shapes.add_shape(
-        MSO_SHAPE.ROUNDED_RECTANGLE,
-        Inches(left), Inches(top), Inches(width), Inches(height)
-    )
-    shape.fill.solid()
-    shape.fill.fore_color.rgb = bg_color
-    shape.line.color.rgb = bg_color
-
-    frame = shape.text_frame
-    frame.word_wrap = True
-    frame.vertical_anchor = MSO_VERTICAL_ANCHOR.MIDDLE
-    p = frame.paragraphs[0]
-    p.text = text
-    p.font.size = Pt(font_size)
-    p.font.bold = bold
-    p.font.color.rgb = text_color
-    p.alignment = PP_ALIGN.CENTER
-
-    return shape
-
-def add_arrow(slide, x1, y1, x2, y2, color=MEDIUM_GRAY):
-    """Add an arrow connector"""
-    connector = slide.shapes.add_connector(
-        1,  # Straight connector
-        Inches(x1), Inches(y1), Inches(x2), Inches(y2)
-    )
-    connector.line.color.rgb = color
-    connector.line.width = Pt(2.5)
-    return connector
+    if text_color is None:
+        text_color = WHITE
+    return core.add_shape_box(slide, left, top, width, height, text, bg_color, text_color, font_size, bold)
+
+def add_arrow(slide, x1, y1, x2, y2, color=None, head=False):
+    """Add an arrow connector; head draws an arrowhead at (x2, y2)"""
+    if color is None:
+        color = MEDIUM_GRAY
+    return core.add_arrow(slide, x1, y1, x2, y2, color, 2.5, head)
+
+def add_routed_arrow(slide, source, target, color=None):
+    """Add an elbow connector from source to target that steers around the shapes already drawn;
+    returns its path's points"""
+    if color is None:
+        color = MEDIUM_GRAY
+    return core.add_routed_arrow(slide, source, target, color, 2.5)
+
+def add_glued_arrow(slide, source, target, color=None):
+    """Add a straight arrow from source to target, glued to the nearest sides of both"""
+    if color is None:
+        color = MEDIUM_GRAY
+    return core.add_glued_arrow(slide, source, target, color, 2.5)
 
 def add_bullet_list(slide, left, top, width, height, items, font_size=16, indent_level=0):
     """Add a bullet list"""
-    box = slide.shapes.add_textbox(Inches(left), Inches(top), Inches(width), Inches(height))
-    frame = box.text_frame
-    frame.word_wrap = True
-
-    for i, item in enumerate(items):
-        if i == 0:
-            p = frame.paragraphs[0]
+    return core.add_bullet_list(slide, left, top, width, height, items, font_size, DARK_GRAY,
+                                space_before=6, space_after=6, indent_level=indent_level)
+
+def add_table(slide, left, top, col_widths, rows):
+    """Add a table; rows are (height, [core.TableCell, ...]) pairs"""
+    return core.add_table(slide, left, top, col_widths, rows)
+
+def draw_layout(slide, layout, left, top, width):
+    """Solve a slide_layout tree at the given position and draw it; returns its bottom edge"""
+    placed, bottom = slide_layout.solve(layout, left, top, width)
+    helpers = {"box": add_shape_box, "text": add_text_box, "bullets": add_bullet_list}
+    for op, rect, content, style in placed:
+        if op == "arrow":
+            add_arrow(slide, *rect, **style)
         else:
-            p = frame.add_paragraph()
+            helpers[op](slide, *rect, content, **style)
+    return bottom
 
-        p.text = item
-        p.level = indent_level if isinstance(indent_level, int) else indent_level.get(i, 0)
-        p.font.size = Pt(font_size)
-        p.font.color.rgb = DARK_GRAY
-        p.space_before = Pt(6)
-        p.space_after = Pt(6)
+# =============================================================================
+# DECLARATIVE SLIDE SPECS
+# =============================================================================
 
-    return box
+def palette():
+    """Current palette colors by name"""
+    return {name: value for name, value in globals().items() if isinstance(value, Color)}
+
+def render_slide_spec(prs, spec_file):
+    """Add a slide drawn from a compiled spec draw list"""
+    return render_draw_list(prs, slide_specs.load_spec(spec_file, palette()))
+
+def render_draw_list(prs, draw_list):
+    """Draw a slide_specs-format draw list; each "slide" op starts a new slide. Returns the last slide
+
+    Besides the slide_specs ops, a ("link", (source, target, color)) op glues
+    an arrow between two of the slide's boxes, indexed in drawing order like a
+    list (negative indexes count back from the latest box).
+    """
+    slide = None
+    boxes = []
+    for op, args in draw_list:
+        if op == "box":
+            boxes.append(add_shape_box(slide, *args))
+        elif op == "text":
+            add_text_box(slide, *args)
+        elif op == "arrow":
+            add_arrow(slide, *args)
+        elif op == "link":
+            source, target, color = args
+            add_glued_arrow(slide, boxes[source], boxes[target], color)
+        elif op == "bullets":
+            add_bullet_list(slide, *args)
+        elif op == "table":
+            add_table(slide, *args)
+        else:
+            title, background = args
+            boxes = []
+            if title is None:
+                slide = core.blank_slide(prs)
+            else:
+                slide = add_slide_with_title(prs, title)
+            if background is not None:
+                core.set_background(slide, background)
+    return slide
+
+def spec_slide_builder(name, spec_file, doc):
+    """Create a slide builder whose content lives in specs/<spec_file>"""
+    def build_slide(prs):
+        render_slide_spec(prs, os.path.join(SPEC_DIR, spec_file))
+
+    build_slide.__name__ = build_slide.__qualname__ = name
+    build_slide.__doc__ = doc
+    build_slide.spec_file = spec_file
+    return build_slide
+
+def add_pipeline_slides(prs, pipeline_file):
+    """Add flow slides drawn from a Harness pipeline YAML file's stage/step graph"""
+    pipeline = pipeline_import.load_pipeline(pipeline_file)
+    for title, flow in pipeline_import.flow_slides(pipeline, palette()):
+        slide = add_slide_with_title(prs, title)
+        draw_layout(slide, flow, left=pipeline_import.AREA_LEFT, top=pipeline_import.AREA_TOP,
+                    width=pipeline_import.AREA_WIDTH)
+
+def add_inventory_slides(prs, inventory_path):
+    """Add a topology slide for an Ansible inventory file or directory"""
+    inventory = inventory_topology.load_inventory(inventory_path)
+    render_draw_list(prs, inventory_topology.topology_ops(inventory, palette()))
 
 # =============================================================================
 # SLIDE CREATION FUNCTIONS
@@ -159,13 +563,10 @@ def add_bullet_list(slide, left, top, width, height, items, font_size=16, indent
 
 def create_title_slide(prs):
     """Slide 1: Title Slide"""
-    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    slide = core.blank_slide(prs)
 
     # Background color
-    background = slide.background
-    fill = background.fill
-    fill.solid()
-    fill.fore_color.rgb = HARNESS_BLUE
+    core.set_background(slide, HARNESS_BLUE)
 
     # Main title
     title_box = add_text_box(slide, 1, 2.5, 11.3, 1.5,
@@ -178,8 +579,11 @@ def create_title_slide(prs):
                                 font_size=32, bold=False, color=WHITE, align=PP_ALIGN.CENTER)
 
     # Footer
+    footer_text = f"Comprehensive Architecture Guide | {FOOTER_YEAR}"
+    if CUSTOMER_NAME:
+        footer_text = f"Prepared for {CUSTOMER_NAME} | {footer_text}"
     footer_box = add_text_box(slide, 1, 6.5, 11.3, 0.5,
-                              "Comprehensive Architecture Guide | 2026",
+                              footer_text,
                               font_size=18, bold=False, color=WHITE, align=PP_ALIGN.CENTER)
 
 def create_agenda_slide(prs):
@@ -266,35 +670,32 @@ def create_architecture_overview_slide(prs):
         "Secrets\nVault"
     ]
     x_pos = 2.5
+    component_boxes = []
     for comp in components:
-        add_shape_box(slide, x_pos, y_start, 1.8, 0.7, comp,
-                     DARK_BLUE, WHITE, font_size=11, bold=True)
+        component_boxes.append(add_shape_box(slide, x_pos, y_start, 1.8, 0.7, comp,
+                                             DARK_BLUE, WHITE, font_size=11, bold=True))
         x_pos += 2
 
-    # Arrow down
-    add_arrow(slide, 6.5, y_start + 0.7, 6.5, y_start + 1.2, HARNESS_BLUE)
     add_text_box(slide, 5.5, y_start + 0.85, 2, 0.3,
                 "WebSocket/HTTPS (TLS 1.3)", font_size=11, color=MEDIUM_GRAY, align=PP_ALIGN.CENTER)
 
     # Delegates
     y_start += 1.5
-    add_shape_box(slide, 3.5, y_start, 6, 0.8, "Harness Delegates (Customer Network/VPC)",
-                 WARNING_ORANGE, WHITE, font_size=18)
+    delegate_plane = add_shape_box(slide, 3.5, y_start, 6, 0.8, "Harness Delegates (Customer Network/VPC)",
+                                   WARNING_ORANGE, WHITE, font_size=18)
+    # Arrow down, around the protocol label
+    add_routed_arrow(slide, component_boxes[1], delegate_plane, HARNESS_BLUE)
 
     # Delegate types
     y_start += 1
     delegates = ["Delegate 1\n(Active)", "Delegate 2\n(Active)", "Delegate 3\n(Standby)"]
     x_pos = 3.5
+    delegate_boxes = []
     for deleg in delegates:
-        add_shape_box(slide, x_pos, y_start, 2, 0.6, deleg,
-                     WARNING_ORANGE, WHITE, font_size=12)
+        delegate_boxes.append(add_shape_box(slide, x_pos, y_start, 2, 0.6, deleg,
+                                            WARNING_ORANGE, WHITE, font_size=12))
         x_pos += 2.3
 
-    # Arrows to targets
-    add_arrow(slide, 4.5, y_start + 0.6, 3.5, y_start + 1.3, WARNING_ORANGE)
-    add_arrow(slide, 6.5, y_start + 0.6, 6.5, y_start + 1.3, WARNING_ORANGE)
-    add_arrow(slide, 8.5, y_start + 0.6, 9.5, y_start + 1.3, WARNING_ORANGE)
-
     # Target Infrastructure
     y_start += 1.5
     targets = [
@@ -303,10 +704,15 @@ def create_architecture_overview_slide(prs):
         ("Kubernetes\nClusters", HARNESS_BLUE)
     ]
     x_pos = 2.5
+    target_boxes = []
     for target, color in targets:
-        add_shape_box(slide, x_pos, y_start, 2.3, 0.7, target, color, WHITE, font_size=14)
+        target_boxes.append(add_shape_box(slide, x_pos, y_start, 2.3, 0.7, target, color, WHITE, font_size=14))
         x_pos += 2.8
 
+    # Arrows to targets
+    for delegate_box, target_box in zip(delegate_boxes, target_boxes):
+        add_routed_arrow(slide, delegate_box, target_box, WARNING_ORANGE)
+
 def create_deployment_strategies_overview_slide(prs):
     """Slide 5: Deployment Strategies Overview"""
     slide = add_slide_with_title(prs, "Deployment Strategies")
@@ -383,20 +789,16 @@ def create_vm_architecture_overview_slide(prs):
     y += 0.9
     comps = ["Pipeline", "Service", "Environment", "Infrastructure"]
     x = 3.5
+    comp_boxes = []
     for comp in comps:
-        add_shape_box(slide, x, y, 1.5, 0.5, comp, DARK_BLUE, WHITE, font_size=11)
+        comp_boxes.append(add_shape_box(slide, x, y, 1.5, 0.5, comp, DARK_BLUE, WHITE, font_size=11))
         x += 1.6
 
-    # Arrow
-    add_arrow(slide, 6.5, y + 0.5, 6.5, y + 1, HARNESS_BLUE)
-
     # Delegate
     y += 1.2
-    add_shape_box(slide, 4, y, 5, 0.6, "Harness Delegate\n(Customer Data Center/Private Cloud)",
-                 WARNING_ORANGE, WHITE, font_size=14)
-
-    add_text_box(slide, 5, y + 0.7, 3, 0.3, "SSH Connection", font_size=11, color=MEDIUM_GRAY, align=PP_ALIGN.CENTER)
-    add_arrow(slide, 6.5, y + 0.6, 6.5, y + 1.1, WARNING_ORANGE)
+    delegate = add_shape_box(slide, 4, y, 5, 0.6, "Harness Delegate\n(Customer Data Center/Private Cloud)",
+                             WARNING_ORANGE, WHITE, font_size=14)
+    add_routed_arrow(slide, comp_boxes[1], delegate, HARNESS_BLUE)
 
     # VM Servers
     y += 1.4
@@ -407,10 +809,17 @@ def create_vm_architecture_overview_slide(prs):
         ("Production\n10+ VMs", 6.5)
     ]
 
+    env_boxes = []
     for env, x_pos in envs:
         is_prod = "Production" in env
         color = ERROR_RED if is_prod else DARK_BLUE
-        add_shape_box(slide, x_pos, y, 1.6, 0.7, env, color, WHITE, font_size=12)
+        env_boxes.append(add_shape_box(slide, x_pos, y, 1.6, 0.7, env, color, WHITE, font_size=12))
+
+    # SSH connections, named just above and right of the middle of the rightmost one
+    for env_box in env_boxes:
+        path = add_routed_arrow(slide, delegate, env_box, WARNING_ORANGE)
+    x, y_mid = connector_routing.midpoint(path)
+    add_text_box(slide, x + 0.1, y_mid - 0.35, 2, 0.3, "SSH Connection", font_size=11, color=MEDIUM_GRAY)
 
     # Key points
     y += 1
@@ -1383,20 +1792,6 @@ def create_ecs_canary_detailed_slide(prs):
     """Slide 18: ECS Canary Deployment Detailed"""
     slide = add_slide_with_title(prs, "ECS Canary Deployment Strategy")
 
-    y = 1.5
-
-    # Strategy overview
-    add_shape_box(slide, 1, y, 11, 0.5,
-                 "🐤 Canary: Gradual Rollout with Progressive Validation",
-                 WARNING_ORANGE, WHITE, font_size=18, bold=True)
-
-    y += 0.6
-
-    # Canary phases
-    add_text_box(slide, 1, y, 11, 0.3, "Canary Deployment Phases:", font_size=16, bold=True, color=WARNING_ORANGE)
-
-    y += 0.4
-
     canary_phases = [
         {
             "phase": "Phase 1: 10% Canary",
@@ -1428,37 +1823,6 @@ def create_ecs_canary_detailed_slide(prs):
         }
     ]
 
-    for i, phase in enumerate(canary_phases):
-        # Phase box
-        add_shape_box(slide, 1, y, 11, 0.35, phase['phase'],
-                     phase['color'], WHITE, font_size=13, bold=True)
-
-        y += 0.4
-
-        # Details
-        details = [
-            f"Tasks: {phase['tasks']}",
-            f"Duration: {phase['duration']}",
-            f"Validation: {phase['validation']}"
-        ]
-
-        x = 1.5
-        for detail in details:
-            add_text_box(slide, x, y, 3.3, 0.2, f"• {detail}", font_size=10, color=DARK_GRAY)
-            x += 3.5
-
-        # Arrow to next phase
-        if i < len(canary_phases) - 1:
-            add_arrow(slide, 6.5, y + 0.25, 6.5, y + 0.45, phase['color'])
-
-        y += 0.5
-
-    # Monitoring & Auto-Rollback
-    y += 0.2
-    add_text_box(slide, 1, y, 11, 0.3, "🤖 Automated Validation & Rollback:", font_size=16, bold=True, color=DARK_BLUE)
-
-    y += 0.35
-
     validation_metrics = [
         {
             "metric": "Error Rate",
@@ -1482,25 +1846,51 @@ def create_ecs_canary_detailed_slide(prs):
         }
     ]
 
-    for metric in validation_metrics:
-        add_shape_box(slide, 1.5, y, 2.5, 0.3, metric['metric'],
-                     HARNESS_BLUE, WHITE, font_size=11, bold=True)
-        add_text_box(slide, 4.1, y + 0.05, 2.5, 0.22, metric['threshold'], font_size=10, color=DARK_GRAY)
-        add_text_box(slide, 6.7, y + 0.05, 4.5, 0.22, metric['action'], font_size=10, color=ERROR_RED)
-        y += 0.38
-
-    # Benefits
-    y += 0.1
-    add_text_box(slide, 1, y, 11, 0.3, "✅ Why Use Canary?", font_size=16, bold=True, color=SUCCESS_GREEN)
-
-    y += 0.35
     benefits = [
         "✓ Risk mitigation: Limits blast radius to small percentage of traffic initially",
         "✓ Progressive validation: Extended validation time at each stage",
         "✓ Automatic safety: AI-powered rollback on any metric degradation",
         "✓ Business-safe: Minimal impact if issues occur (only affects canary percentage)"
     ]
-    add_bullet_list(slide, 1.5, y, 10, 0.9, benefits, font_size=13)
+
+    # Each phase is a row: the phase box beside its tasks, duration and validation
+    phases = slide_layout.stack([
+        slide_layout.row([
+            slide_layout.box(phase['phase'], phase['color'], font_size=13, width=2.6),
+            slide_layout.text(f"• Tasks: {phase['tasks']}", font_size=10),
+            slide_layout.text(f"• Duration: {phase['duration']}", font_size=10),
+            slide_layout.text(f"• Validation: {phase['validation']}", font_size=10, flex=1.5),
+        ], gap=0.15, align="stretch")
+        for phase in canary_phases
+    ], gap=0.08)
+
+    metrics = slide_layout.stack([
+        slide_layout.row([
+            slide_layout.box(metric['metric'], HARNESS_BLUE, font_size=11, width=1.9),
+            slide_layout.text(metric['threshold'], font_size=10),
+            slide_layout.text(metric['action'], font_size=10, color=ERROR_RED),
+        ], gap=0.1, align="middle")
+        for metric in validation_metrics
+    ], gap=0.06)
+
+    draw_layout(slide, slide_layout.stack([
+        # Strategy overview
+        slide_layout.box("🐤 Canary: Gradual Rollout with Progressive Validation",
+                   WARNING_ORANGE, font_size=18, height=0.5),
+        slide_layout.text("Canary Deployment Phases:", font_size=16, bold=True, color=WARNING_ORANGE),
+        phases,
+        # Monitoring & auto-rollback beside the benefits
+        slide_layout.row([
+            slide_layout.stack([
+                slide_layout.text("🤖 Automated Validation & Rollback:", font_size=16, bold=True, color=DARK_BLUE),
+                metrics,
+            ], gap=0.05, flex=1.4),
+            slide_layout.stack([
+                slide_layout.text("✅ Why Use Canary?", font_size=16, bold=True, color=SUCCESS_GREEN),
+                slide_layout.bullets(benefits, font_size=11),
+            ], gap=0.05),
+        ], gap=0.4),
+    ], gap=0.12), left=1, top=1.5, width=11)
 
 def create_ecs_pipeline_slide(prs):
     """Slide 19: ECS Pipeline Configuration"""
@@ -1867,116 +2257,9 @@ def create_monitoring_slide(prs):
                  "⏱️ Verification Timeline: 5-minute canary → 10-minute blue-green → 30-minute production soak",
                  WARNING_ORANGE, WHITE, font_size=12, bold=False)
 
-def create_deployment_comparison_slide(prs):
-    """Slide 23: Deployment Strategy Comparison"""
-    slide = add_slide_with_title(prs, "Deployment Strategy Comparison")
-
-    y = 1.5
-
-    # Comparison table header
-    headers = ["Strategy", "Downtime", "Rollback Speed", "Resource Cost", "Complexity", "Best For"]
-    x_positions = [1, 3, 4.8, 6.6, 8.4, 10]
-    widths = [1.8, 1.6, 1.6, 1.6, 1.6, 2]
-
-    for header, x, width in zip(headers, x_positions, widths):
-        add_shape_box(slide, x, y, width, 0.4, header, DARK_BLUE, WHITE, font_size=12, bold=True)
-
-    # Comparison data
-    comparisons = [
-        {
-            "strategy": "Rolling Update",
-            "downtime": "Minimal",
-            "rollback": "Manual\n5-10 min",
-            "cost": "Low\n(1x)",
-            "complexity": "Low",
-            "best_for": "Standard\ndeployments",
-            "color": HARNESS_BLUE
-        },
-        {
-            "strategy": "Blue-Green",
-            "downtime": "Zero",
-            "rollback": "Instant\n< 1 min",
-            "cost": "High\n(2x)",
-            "complexity": "Medium",
-            "best_for": "Critical\napplications",
-            "color": SUCCESS_GREEN
-        },
-        {
-            "strategy": "Canary",
-            "downtime": "Zero",
-            "rollback": "Auto\n2-3 min",
-            "cost": "Medium\n(1.1-1.5x)",
-            "complexity": "High",
-            "best_for": "High-risk\nchanges",
-            "color": WARNING_ORANGE
-        }
-    ]
-
-    y += 0.5
-    for comparison in comparisons:
-        # Strategy name
-        add_shape_box(slide, 1, y, 1.8, 0.45, comparison['strategy'],
-                     comparison['color'], WHITE, font_size=11, bold=True)
-
-        # Comparison values
-        values = [
-            comparison['downtime'],
-            comparison['rollback'],
-            comparison['cost'],
-            comparison['complexity'],
-            comparison['best_for']
-        ]
-
-        x = 3
-        for value, width in zip(values, widths[1:]):
-            add_text_box(slide, x, y + 0.08, width, 0.35, value, font_size=10, color=DARK_GRAY, align=PP_ALIGN.CENTER)
-            x += width + 0.2
-
-        y += 0.55
-
-    # Decision Guide
-    y += 0.3
-    add_text_box(slide, 1, y, 11, 0.3, "Decision Guide:", font_size=16, bold=True, color=HARNESS_BLUE)
-
-    y += 0.35
-
-    decision_guide = [
-        {
-            "scenario": "Low-risk, frequent deployments",
-            "recommendation": "Rolling Update",
-            "rationale": "Cost-effective, simple, sufficient for most cases"
-        },
-        {
-            "scenario": "Zero-downtime requirement",
-            "recommendation": "Blue-Green",
-            "rationale": "Instant switch, full validation, immediate rollback"
-        },
-        {
-            "scenario": "Major version upgrade or risky change",
-            "recommendation": "Canary",
-            "rationale": "Progressive rollout, early issue detection, automated safety"
-        },
-        {
-            "scenario": "Limited infrastructure capacity",
-            "recommendation": "Rolling Update or Canary",
-            "rationale": "Don't require 2x resources like Blue-Green"
-        }
-    ]
-
-    for guide in decision_guide:
-        add_shape_box(slide, 1.5, y, 3.5, 0.35, guide['scenario'],
-                     LIGHT_GRAY, DARK_GRAY, font_size=10, bold=True)
-        add_shape_box(slide, 5.1, y, 1.8, 0.35, guide['recommendation'],
-                     SUCCESS_GREEN, WHITE, font_size=10, bold=True)
-        add_text_box(slide, 7, y + 0.05, 4.5, 0.28, guide['rationale'], font_size=9, color=DARK_GRAY)
-        y += 0.45
-
-    # Final recommendation
-    y += 0.2
-    add_shape_box(slide, 2, y, 9, 0.55,
-                 "💡 Recommendation: Start with Rolling for non-prod, " +
-                 "graduate to Blue-Green/Canary for production critical services",
-                 HARNESS_BLUE, WHITE, font_size=12, bold=False)
+create_deployment_comparison_slide = spec_slide_builder(
+    "create_deployment_comparison_slide", "deployment_comparison.json",
+    "Slide 23: Deployment Strategy Comparison")
 
 def create_best_practices_slide(prs):
     """Slide 24: Best Practices"""
@@ -2419,13 +2702,10 @@ def create_next_steps_slide(prs):
 
 def create_thank_you_slide(prs):
     """Slide 29: Thank You"""
-    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    slide = core.blank_slide(prs)
 
     # Background color
-    background = slide.background
-    fill = background.fill
-    fill.solid()
-    fill.fore_color.rgb = HARNESS_BLUE
+    core.set_background(slide, HARNESS_BLUE)
 
     # Thank you message
     add_text_box(slide, 1, 2.5, 11.3, 1,
@@ -2451,25 +2731,253 @@ def create_thank_you_slide(prs):
                     font_size=18, color=WHITE, align=PP_ALIGN.CENTER)
         y += 0.45
 
+# =============================================================================
+# SLIDE ORDER
+# =============================================================================
+
+SLIDE_BUILDERS = [
+    create_title_slide,
+    create_agenda_slide,
+    create_introduction_slide,
+    create_architecture_overview_slide,
+    create_deployment_strategies_overview_slide,
+
+    # VM Deployment Section
+    create_vm_architecture_overview_slide,
+    create_vm_detailed_architecture_slide,
+    create_vm_deployment_flow_phase1_slide,
+    create_vm_deployment_flow_phase2_slide,
+    create_vm_deployment_flow_phase3_slide,
+    create_vm_deployment_pipeline_slide,
+    create_vm_rollback_slide,
+
+    # ECS Deployment Section
+    create_ecs_architecture_overview_slide,
+    create_ecs_detailed_architecture_slide,
+    create_ecs_deployment_flow_phase1_slide,
+    create_ecs_deployment_flow_phase2_slide,
+    create_ecs_blue_green_detailed_slide,
+    create_ecs_canary_detailed_slide,
+    create_ecs_pipeline_slide,
+
+    # Network & Security
+    create_network_architecture_slide,
+    create_security_architecture_slide,
+    create_monitoring_slide,
+
+    # Best Practices & Implementation
+    create_deployment_comparison_slide,
+    create_best_practices_slide,
+    create_implementation_roadmap_slide,
+    create_benefits_slide,
+
+    # Closing
+    create_key_takeaways_slide,
+    create_next_steps_slide,
+    create_thank_you_slide,
+]
+
+# Helpers instrumented by --profile
+PROFILED_HELPERS = [
+    add_slide_with_title,
+    add_text_box,
+    add_shape_box,
+    add_arrow,
+    add_routed_arrow,
+    add_glued_arrow,
+    add_bullet_list,
+    add_table,
+]
+
 # =============================================================================
 # MAIN FUNCTION
 # =============================================================================
 
+def print_text_fit_report():
+    """Print the boxes --fit found too small for their text"""
+    if core.TEXT_FIT is None:
+        return
+    if not core.TEXT_FIT_REPORT:
+        print("✅ All text fits its boxes")
+        return
+
+    action = "shrunk" if core.TEXT_FIT == "shrink" else "would need shrinking"
+    print(f"⚠️ {len(core.TEXT_FIT_REPORT)} boxes {action}:")
+    for issue in core.TEXT_FIT_REPORT:
+        slide = os.path.splitext(os.path.basename(issue.slide))[0]
+        text = issue.text.replace("\n", " / ")
+        outcome = "overflows even at" if issue.overflow else "fits at"
+        print(f"  • {slide}: {text!r} {issue.font_size}pt {outcome} {issue.fit_size}pt")
+
+def embed_output_fonts(args):
+    """Embed --embed-font subsets into the written deck"""
+    if not args.embed_font:
+        return
+    for font in font_embed.embed_fonts(args.output, args.embed_font):
+        print(f"✅ Embedded {font.face.typeface} {font.face.style} ({font.size / 1024:.0f} KB subset)")
+        if not font.used:
+            print(f"⚠️ No text is set in {font.face.typeface}; embedding it changes nothing")
+
+def render_thumbnails(args):
+    """Render --thumbnails PNGs of the written deck for review without PowerPoint"""
+    if not args.thumbnails:
+        return
+    import slide_thumbnails
+
+    paths, rendered = slide_thumbnails.render_deck(args.output, args.thumbnails, jobs=os.cpu_count() or 1)
+    print(f"✅ Thumbnails: {len(paths)} in {args.thumbnails} ({rendered} rendered, {len(paths) - rendered} cached)")
+
+def export_deck(backend, pipelines=(), inventories=()):
+    """Draw every slide through an export_backend.Backend (SVG, PDF) instead of python-pptx"""
+    core.set_backend(backend)
+    try:
+        deck = create_presentation(pipelines=pipelines, inventories=inventories)
+        deck.close()
+    except BaseException:
+        backend.abort()
+        raise
+    finally:
+        core.set_backend(None)
+    return deck.slide_count
+
+def check_output(args):
+    """Run the layout checker over the written deck for --check/--strict"""
+    if not (args.check or args.strict):
+        return
+    import deck_check
+
+    issues = deck_check.check_file(args.output)
+    deck_check.print_report(args.output, issues)
+    if args.strict and issues:
+        sys.exit(1)
+
 def main():
     """Main function to generate the presentation"""
+    parser = argparse.ArgumentParser(description="Generate the Harness CD architecture presentation")
+    parser.add_argument("-o", "--output", default=DEFAULT_OUTPUT_FILE,
+                        help="Path of the .pptx file to write")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="Build slides across N worker processes")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Re-render only changed slides and splice them into the existing output")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR,
+                        help="Directory holding cached slide parts for --incremental")
+    parser.add_argument("--stream", action="store_true",
+                        help="Write each slide to the output as soon as it is built to keep memory flat")
+    parser.add_argument("--profile", metavar="REPORT_JSON",
+                        help="Profile each slide and write a JSON report plus a .folded flamegraph file")
+    parser.add_argument("--fit", choices=core.TEXT_FIT_MODES,
+                        help="Measure every box's text at build time: report overflow (check) "
+                             "or shrink fonts to the largest size that fits (shrink)")
+    parser.add_argument("--icons", action="store_true",
+                        help="Draw the emoji that start box text as pictures, rasterized once and shared by every slide")
+    parser.add_argument("--icon-font", metavar="PATH",
+                        help="Color emoji font to rasterize --icons with (default: first installed one)")
+    parser.add_argument("--embed-font", action="append", metavar="PATH",
+                        help="Embed this font file, subset to the deck's text (repeat for each weight)")
+    parser.add_argument("--thumbnails", metavar="DIR",
+                        help="Render every slide of the written deck to PNG in DIR")
+    parser.add_argument("--pipeline", action="append", metavar="YAML",
+                        help="Append flow slides generated from this Harness pipeline file (repeatable)")
+    parser.add_argument("--inventory", action="append", metavar="PATH",
+                        help="Append a topology slide for this Ansible inventory file or directory (repeatable)")
+    parser.add_argument("--web", metavar="DIR",
+                        help="Write the slides as SVG plus an index.html into DIR instead of a .pptx")
+    parser.add_argument("--pdf", metavar="PDF_FILE",
+                        help="Write the slides as a vector PDF, page by page, instead of a .pptx")
+    parser.add_argument("--check", action="store_true",
+                        help="Check the written deck for off-slide shapes and overflowing text")
+    parser.add_argument("--strict", action="store_true",
+                        help="Like --check, but exit non-zero if the deck has any layout issue")
+    parser.add_argument("--list-slides", action="store_true",
+                        help="List the slides without building anything")
+    args = parser.parse_args()
+    if args.fit == "check" and (args.jobs > 1 or args.incremental):
+        parser.error("--fit check reports from a single full build; drop --jobs/--incremental")
+    if args.profile and (args.jobs > 1 or args.incremental or args.stream):
+        parser.error("--profile times each slide in a single in-process build; drop --jobs/--incremental/--stream")
+    core.set_text_fit(args.fit)
+    if args.icons:
+        # Slide parts cached or built in other processes carry no picture relationships
+        if args.jobs > 1 or args.incremental or args.stream:
+            parser.error("--icons needs a single in-process build; drop --jobs/--incremental/--stream")
+        try:
+            core.set_icons(icon_cache.IconCache(args.icon_font))
+        except (OSError, RuntimeError) as e:
+            parser.error(str(e))
+
+    pipelines, inventories = args.pipeline or (), args.inventory or ()
+    if (pipelines or inventories) and (args.incremental or args.stream or args.profile):
+        parser.error("--pipeline/--inventory slides are added to a full build; "
+                     "drop --incremental/--stream/--profile")
+
+    if args.web and args.pdf:
+        parser.error("--web and --pdf each draw the whole deck; pick one")
+    if args.web or args.pdf:
+        if args.jobs > 1 or args.incremental or args.stream or args.profile or args.icons or args.fit:
+            parser.error("--web/--pdf draw every slide in one pass; drop --jobs/--incremental/--stream/--profile/"
+                         "--icons/--fit")
+        if args.embed_font or args.thumbnails or args.check or args.strict:
+            parser.error("--web/--pdf write no .pptx; drop --embed-font/--thumbnails/--check/--strict")
+
+    if args.list_slides:
+        for number, build_slide in enumerate(SLIDE_BUILDERS, 1):
+            print(f"{number:>3}  {build_slide.__name__}")
+        return
+
+    if args.web:
+        import web_export
+
+        count = export_deck(web_export.WebBackend(args.web, title=DECK_TITLE), pipelines, inventories)
+        print(f"✅ Exported {count} slides: {os.path.join(args.web, 'index.html')}")
+        return
+
+    if args.pdf:
+        import pdf_export
+
+        count = export_deck(pdf_export.PdfBackend(args.pdf, title=DECK_TITLE), pipelines, inventories)
+        print(f"✅ Exported {count} pages: {args.pdf}")
+        return
+
+    if args.incremental:
+        changed = build_incremental(args.output, args.cache_dir, jobs=args.jobs, fonts=args.embed_font or ())
+        print(f"✅ Rebuilt {len(changed)} of {len(SLIDE_BUILDERS)} slides: {args.output}")
+        render_thumbnails(args)
+        print_text_fit_report()
+        check_output(args)
+        return
+
+    if args.stream:
+        save_streaming(args.output)
+        print(f"✅ Streamed {len(SLIDE_BUILDERS)} slides: {args.output}")
+        embed_output_fonts(args)
+        render_thumbnails(args)
+        print_text_fit_report()
+        check_output(args)
+        return
+
     print("Creating Professional Harness CD Architecture Presentation...")
     print("This is a customer-sharable, comprehensive presentation")
     print()
 
     try:
-        prs = create_presentation()
+        if args.profile:
+            prs, report = profile_presentation()
+            write_profile_report(report, args.profile)
+            print(f"✅ Profile written: {args.profile}")
+        else:
+            prs = create_presentation(jobs=args.jobs, pipelines=pipelines, inventories=inventories)
 
-        output_file = "/Users/tejasodanapalli/Desktop/Dailywork/Harness_CD_Professional_Architecture.pptx"
+        output_file = args.output
         prs.save(output_file)
 
         print("✅ Presentation created successfully!")
         print(f"✅ File saved: {output_file}")
-        print(f"✅ Total slides: 29")
+        print(f"✅ Total slides: {len(prs.slides)}")
+        embed_output_fonts(args)
+        render_thumbnails(args)
+        print_text_fit_report()
+        check_output(args)
         print()
         print("📊 Slide Breakdown:")
         print("  • Slides 1-5: Introduction & Overview")
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Deck Geometry Checker
+Extracts every shape's geometry into NumPy arrays and checks bounds, off-slide
+placement and text overflow for a whole deck in one vectorized sweep
+"""
+
+import sys
+from collections import defaultdict, namedtuple
+
+import presentation_core as core
+import text_fit
+
+EMU_PER_INCH = 914400
+EMU_PER_POINT = 12700
+
+# Font size python-pptx text inherits from the default template when none is set
+DEFAULT_FONT_SIZE = 18
+
+# MSO_SHAPE_TYPE.AUTO_SHAPE, without importing python-pptx's enums
+AUTO_SHAPE = 1
+
+# Overlap index cell size, and the smallest intersection (either side) worth reporting
+GRID_CELL = EMU_PER_INCH
+MIN_OVERLAP = EMU_PER_INCH // 20
+
+_A = "{http://schemas.openxmlformats.org/drawingml/2006/main}"
+
+ShapeIssue = namedtuple("ShapeIssue", "slide shape kind detail")
+
+# One paragraph's text and effective style: size in points, spacing before plus after in
+# points, color as a hex string or None, align as the a:pPr algn value or None
+Paragraph = namedtuple("Paragraph", "text size bold spacing color align")
+
+# Issue kinds, in report order
+ISSUE_KINDS = {
+    "off-slide": "lies entirely outside the slide",
+    "out-of-bounds": "extends past the slide edge",
+    "text-overflow": "text is taller than its shape",
+    "text-off-slide": "text runs past the bottom of the slide",
+    "overlap": "partly overlaps another shape",
+}
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:  # Only the checker needs NumPy; building decks does not
+        raise RuntimeError("NumPy is required to check decks (pip install numpy)") from None
+    return numpy
+
+def paragraphs(tx_body):
+    """Yield a Paragraph for each paragraph of a text body"""
+    for p in tx_body.iterchildren(f"{_A}p"):
+        parts = []
+        size = bold = color = None
+        for child in p:
+            if child.tag in (f"{_A}r", f"{_A}fld"):
+                t = child.find(f"{_A}t")
+                parts.append((t.text or "") if t is not None else "")
+                r_pr = child.find(f"{_A}rPr")
+                if r_pr is not None:
+                    size, bold, color = _run_style(r_pr, size, bold, color)
+            elif child.tag == f"{_A}br":
+                parts.append("\n")
+        # Paragraph-level defaults (what paragraph.font sets) apply to runs that set nothing
+        p_pr = p.find(f"{_A}pPr")
+        for r_pr in (p.find(f"{_A}pPr/{_A}defRPr"), p.find(f"{_A}endParaRPr")):
+            if r_pr is not None:
+                size, bold, color = _run_style(r_pr, size, bold, color)
+        if size is None:
+            size = DEFAULT_FONT_SIZE
+
+        spacing = 0
+        if p_pr is not None:
+            for spc in (f"{_A}spcBef", f"{_A}spcAft"):
+                pts = p_pr.find(f"{spc}/{_A}spcPts")
+                if pts is not None:
+                    spacing += int(pts.get("val")) / 100
+        align = p_pr.get("algn") if p_pr is not None else None
+        yield Paragraph("".join(parts), size, bool(bold), spacing, color, align)
+
+def _run_style(r_pr, size, bold, color):
+    """Fill in whichever of size, bold and color are still unset from a run properties element"""
+    if size is None and r_pr.get("sz"):
+        size = int(r_pr.get("sz")) / 100
+    if bold is None and r_pr.get("b"):
+        bold = r_pr.get("b") in ("1", "true")
+    if color is None:
+        rgb = r_pr.find(f"{_A}solidFill/{_A}srgbClr")
+        if rgb is not None:
+            color = rgb.get("val")
+    return size, bold, color
+
+def _text_extent(shape, width):
+    """(line count, height in EMU) of a shape's text laid out at its width, insets included"""
+    lines = 0
+    height = 2 * text_fit.INSET_Y * 72
+    for paragraph in paragraphs(shape.text_frame._txBody):
+        count = len(text_fit.text_lines(paragraph.text, width / EMU_PER_INCH, paragraph.size, paragraph.bold))
+        lines += count
+        height += count * paragraph.size * text_fit.LINE_SPACING + paragraph.spacing
+    return lines, height * EMU_PER_POINT
+
+def extract_geometry(prs):
+    """Collect every shape's position, size and laid-out text height as NumPy arrays
+
+    Returns (names, arrays) where names[i] is (slide number, shape name) and
+    arrays holds slide, left, top, width, height, text_height (EMU), text_lines,
+    and fixed (True for shapes that do not grow to fit their text).
+    """
+    np = _numpy()
+    names = []
+    columns = {key: [] for key in ("slide", "left", "top", "width", "height", "text_height", "text_lines", "fixed",
+                                   "connector")}
+
+    for number, slide in enumerate(prs.slides, 1):
+        for shape in slide.shapes:
+            if shape.left is None or shape.width is None:
+                continue
+            lines, text_height = 0, 0
+            if shape.has_text_frame and shape.text_frame.text:
+                lines, text_height = _text_extent(shape, shape.width)
+
+            names.append((number, shape.name))
+            columns["slide"].append(number)
+            columns["left"].append(shape.left)
+            columns["top"].append(shape.top)
+            columns["width"].append(shape.width)
+            columns["height"].append(shape.height)
+            columns["text_height"].append(text_height)
+            columns["text_lines"].append(lines)
+            # Text boxes grow to fit their text; autoshapes keep their size and let it spill
+            columns["fixed"].append(not shape.is_placeholder and shape.shape_type == AUTO_SHAPE)
+            columns["connector"].append(shape._element.tag.endswith("}cxnSp"))
+
+    arrays = {
+        "slide": np.array(columns["slide"], dtype=np.int32),
+        "left": np.array(columns["left"], dtype=np.int64),
+        "top": np.array(columns["top"], dtype=np.int64),
+        "width": np.array(columns["width"], dtype=np.int64),
+        "height": np.array(columns["height"], dtype=np.int64),
+        "text_height": np.array(columns["text_height"], dtype=np.float64),
+        "text_lines": np.array(columns["text_lines"], dtype=np.int32),
+        "fixed": np.array(columns["fixed"], dtype=bool),
+        "connector": np.array(columns["connector"], dtype=bool),
+    }
+    return names, arrays
+
+def _drawn_height(arrays):
+    """Shape heights as drawn: text boxes grow to hold their text, autoshapes do not"""
+    np = _numpy()
+    grown = np.maximum(arrays["height"], arrays["text_height"].astype(np.int64))
+    return np.where(arrays["fixed"], arrays["height"], grown)
+
+def candidate_pairs(arrays):
+    """Index pairs (i < j) of shapes on the same slide whose boxes share a grid cell
+
+    Each slide gets its own uniform grid; a shape is bucketed into every cell
+    its box covers, so only shapes that are near each other are ever compared.
+    Connectors are left out: arrows are meant to touch the boxes they join.
+    """
+    np = _numpy()
+    left, top = arrays["left"], arrays["top"]
+    right, bottom = left + arrays["width"], top + _drawn_height(arrays)
+    col0, row0 = left // GRID_CELL, top // GRID_CELL
+    col1, row1 = (right - 1) // GRID_CELL, (bottom - 1) // GRID_CELL
+
+    pairs = set()
+    cells = defaultdict(list)
+    slide = None
+    for i in np.flatnonzero(~arrays["connector"]):
+        if arrays["slide"][i] != slide:
+            slide = arrays["slide"][i]
+            cells.clear()
+        for col in range(col0[i], col1[i] + 1):
+            for row in range(row0[i], row1[i] + 1):
+                bucket = cells[col, row]
+                pairs.update((j, i) for j in bucket)
+                bucket.append(i)
+
+    if not pairs:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+    first, second = np.array(sorted(pairs), dtype=np.intp).T
+    return first, second
+
+def overlapping_pairs(arrays):
+    """Shape index pairs whose boxes partly overlap (intersect without one containing the other)"""
+    np = _numpy()
+    first, second = candidate_pairs(arrays)
+    left, top = arrays["left"], arrays["top"]
+    right, bottom = left + arrays["width"], top + _drawn_height(arrays)
+
+    overlap_w = np.minimum(right[first], right[second]) - np.maximum(left[first], left[second])
+    overlap_h = np.minimum(bottom[first], bottom[second]) - np.maximum(top[first], top[second])
+    intersects = (overlap_w >= MIN_OVERLAP) & (overlap_h >= MIN_OVERLAP)
+
+    # A label placed inside a panel is layering, not a collision
+    def contains(a, b):
+        return (left[a] <= left[b]) & (top[a] <= top[b]) & (right[a] >= right[b]) & (bottom[a] >= bottom[b])
+    nested = contains(first, second) | contains(second, first)
+
+    hits = intersects & ~nested
+    return first[hits], second[hits], overlap_w[hits], overlap_h[hits]
+
+def check_geometry(names, arrays, slide_width, slide_height):
+    """Run every check over the extracted arrays at once and return ShapeIssues in slide order"""
+    np = _numpy()
+    left, top = arrays["left"], arrays["top"]
+    right, bottom = left + arrays["width"], top + arrays["height"]
+    text_height = arrays["text_height"]
+
+    off_slide = (right <= 0) | (bottom <= 0) | (left >= slide_width) | (top >= slide_height)
+    out_of_bounds = ~off_slide & ((left < 0) | (top < 0) | (right > slide_width) | (bottom > slide_height))
+    # Like text_fit, a last line may run into the bottom inset and a single line always fits
+    text_overflow = (arrays["fixed"] & (arrays["text_lines"] > 1)
+                     & (text_height > arrays["height"] + text_fit.INSET_Y * EMU_PER_INCH))
+    text_off_slide = ~off_slide & (top + text_height > slide_height + text_fit.INSET_Y * EMU_PER_INCH)
+
+    masks = {
+        "off-slide": off_slide,
+        "out-of-bounds": out_of_bounds,
+        "text-overflow": text_overflow,
+        "text-off-slide": text_off_slide,
+    }
+    details = {
+        "off-slide": lambda i: f"at ({left[i] / EMU_PER_INCH:.2f}in, {top[i] / EMU_PER_INCH:.2f}in)",
+        "out-of-bounds": lambda i: (f"spans ({left[i] / EMU_PER_INCH:.2f}, {top[i] / EMU_PER_INCH:.2f})-"
+                                    f"({right[i] / EMU_PER_INCH:.2f}, {bottom[i] / EMU_PER_INCH:.2f})in"),
+        "text-overflow": lambda i: (f"needs {text_height[i] / EMU_PER_INCH:.2f}in, "
+                                    f"has {arrays['height'][i] / EMU_PER_INCH:.2f}in"),
+        "text-off-slide": lambda i: f"ends at {(top[i] + text_height[i]) / EMU_PER_INCH:.2f}in",
+    }
+
+    issues = []
+    for kind, mask in masks.items():
+        for i in np.flatnonzero(mask):
+            slide, shape = names[i]
+            issues.append(ShapeIssue(slide, shape, kind, details[kind](i)))
+    for i, j, overlap_w, overlap_h in zip(*overlapping_pairs(arrays)):
+        slide, shape = names[i]
+        issues.append(ShapeIssue(slide, shape, "overlap",
+                                 f"with {names[j][1]!r}, {overlap_w / EMU_PER_INCH:.2f}in x "
+                                 f"{overlap_h / EMU_PER_INCH:.2f}in"))
+    issues.sort(key=lambda issue: issue.slide)
+    return issues
+
+def check_presentation(prs):
+    """Check every shape in a python-pptx Presentation and return its ShapeIssues"""
+    names, arrays = extract_geometry(prs)
+    return check_geometry(names, arrays, prs.slide_width, prs.slide_height)
+
+def check_file(path):
+    """Check a saved .pptx file and return its ShapeIssues"""
+    return check_presentation(core.pptx_api().Presentation(path))
+
+def print_report(path, issues):
+    """Print one line per issue, grouped under the deck's path"""
+    if not issues:
+        print(f"✅ {path}: every shape is on the slide, clear of its neighbors and its text fits")
+        return
+    print(f"⚠️ {path}: {len(issues)} layout issues")
+    for issue in issues:
+        print(f"  • slide {issue.slide} {issue.shape!r}: {ISSUE_KINDS[issue.kind]} ({issue.detail})")
+
+def main():
+    """Check saved decks and optionally fail on any issue"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Check decks for off-slide, overlapping and overflowing shapes")
+    parser.add_argument("decks", nargs="+", help=".pptx files to check")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="Check decks across N worker processes")
+    parser.add_argument("--strict", action="store_true",
+                        help="Exit non-zero if any deck has an issue")
+    args = parser.parse_args()
+
+    if args.jobs > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+            results = list(pool.map(check_file, args.decks))
+    else:
+        results = map(check_file, args.decks)
+
+    failed = False
+    for path, issues in zip(args.decks, results):
+        print_report(path, issues)
+        failed = failed or bool(issues)
+
+    if args.strict and failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Export Backend
+Records the presentation_core draw calls as plain drawing ops in inches, so
+the slide builders can feed writers for formats other than .pptx without
+python-pptx; finished slides are handed to the writer one at a time
+"""
+
+import math
+from collections import namedtuple
+
+import connector_routing
+import text_fit
+
+# A drawn box in inches; what the helpers return in place of a python-pptx shape
+Shape = namedtuple("Shape", "left top width height")
+
+# One laid-out line of text: x is the left edge, center or right edge for its align,
+# y is the baseline, both in inches
+TextLine = namedtuple("TextLine", "x y text size bold color align")
+
+# Corner radius of a rounded rectangle, as a fraction of its shorter side (the roundRect default)
+ROUND_RECT_RADIUS = 0.16667
+
+# Outline width python-pptx shapes get when only the line color is set, in points
+DEFAULT_LINE_WIDTH = 0.75
+
+# Calibri's ascent, in ems; the baseline sits this far below the top of each line's em box
+ASCENT = 0.75
+
+# Size of paragraphs left unstyled, such as the extra lines of a paragraph_per_line box, in points
+DEFAULT_FONT_SIZE = 18
+
+# Indent of each bullet level in text boxes, in inches
+LEVEL_INDENT = 0.5
+
+# Title text box geometry used by add_title, in inches
+TITLE_LEFT, TITLE_TOP, TITLE_HEIGHT = 0.5, 0.3, 0.8
+
+def _align(align):
+    """Alignment name ("left", "center", "right") for a PP_ALIGN member, its name or None"""
+    if align is None:
+        return "left"
+    return getattr(align, "name", align).lower()
+
+def layout_text(rect, paragraphs, middle=False, wrap=True):
+    """Lay paragraphs out in a text frame; paragraphs are
+    (text, size, bold, color, align, level, space before, space after) tuples
+
+    Lines break where the text-fit engine breaks them and the frame keeps
+    python-pptx's default insets. Returns [TextLine, ...].
+    """
+    left, top, width, height = rect
+    laid_out = []
+    text_height = 0
+    for i, (text, size, bold, color, align, level, before, after) in enumerate(paragraphs):
+        indent = level * LEVEL_INDENT
+        if wrap:
+            lines = text_fit.text_lines(text, width - indent, size, bold)
+        else:
+            lines = text.split("\n")
+        before = before if i else 0
+        laid_out.append((lines, size, bold, color, _align(align), indent, before, after))
+        text_height += (len(lines) * size * text_fit.LINE_SPACING + before + after) / 72
+
+    y = top + (height - text_height) / 2 if middle else top + text_fit.INSET_Y
+    text_lines = []
+    for lines, size, bold, color, align, indent, before, after in laid_out:
+        pitch = size * text_fit.LINE_SPACING / 72
+        if align == "center":
+            x = left + indent / 2 + width / 2
+        elif align == "right":
+            x = left + width - text_fit.INSET_X
+        else:
+            x = left + text_fit.INSET_X + indent
+        y += before / 72
+        for line in lines:
+            baseline = y + (pitch - size / 72) / 2 + ASCENT * size / 72
+            text_lines.append(TextLine(x, baseline, line, size, bold, color, align))
+            y += pitch
+        y += after / 72
+    return text_lines
+
+def _arrowhead(start, end, width):
+    """Points of the open head at end of a line from start, sized to the line width in points"""
+    (x1, y1), (x2, y2) = start, end
+    length = math.hypot(x2 - x1, y2 - y1) or 1
+    ux, uy = (x2 - x1) / length, (y2 - y1) / length
+    size = max(0.08, width * 0.04)
+    return [(x2 - size * (ux - uy / 2), y2 - size * (uy + ux / 2)), (x2, y2),
+            (x2 - size * (ux + uy / 2), y2 - size * (uy - ux / 2))]
+
+class Slide:
+    """A slide's background and drawing ops, in drawing order
+
+    ops are ("rect", (rect, radius, fill, line, line width in points)),
+    ("text", [TextLine, ...]) and ("line", (points, color, width in points));
+    shapes holds every box drawn so far, for routing connectors around them.
+    """
+
+    def __init__(self, number):
+        self.number = number
+        self.background = None
+        self.ops = []
+        self.shapes = []
+
+class Deck:
+    """A deck being exported; each slide goes to the backend's writer once the next one starts"""
+
+    def __init__(self, backend, width, height):
+        self.backend = backend
+        self.width = width
+        self.height = height
+        self.slide_count = 0
+        self._current = None
+
+    def add_slide(self):
+        self.flush()
+        self.slide_count += 1
+        self._current = Slide(self.slide_count)
+        return self._current
+
+    def flush(self):
+        """Write the slide in progress, if any"""
+        if self._current is not None:
+            self.backend.write_slide(self, self._current)
+            self._current = None
+
+    def close(self):
+        """Write the last slide and let the backend finish its output"""
+        self.flush()
+        self.backend.close(self)
+
+class Backend:
+    """The presentation_core helpers, recording ops instead of python-pptx shapes
+
+    Subclasses implement write_slide(deck, slide) and, if the output needs
+    finishing once every slide is written, close(deck); abort() releases the
+    output when a slide fails to draw.
+    """
+
+    def new_presentation(self, width, height):
+        return Deck(self, width, height)
+
+    def blank_slide(self, prs):
+        return prs.add_slide()
+
+    def write_slide(self, deck, slide):
+        raise NotImplementedError
+
+    def close(self, deck):
+        pass
+
+    def abort(self):
+        pass
+
+    def set_background(self, slide, color):
+        slide.background = color
+
+    def _box(self, slide, left, top, width, height):
+        shape = Shape(left, top, width, height)
+        slide.shapes.append(shape)
+        return shape
+
+    def add_title(self, slide, text, width, font_size, color, word_wrap=None):
+        shape = self._box(slide, TITLE_LEFT, TITLE_TOP, width, TITLE_HEIGHT)
+        slide.ops.append(("text", layout_text(shape, [(text, font_size, True, color, None, 0, 0, 0)],
+                                              wrap=bool(word_wrap))))
+        return shape
+
+    def add_text_box(self, slide, left, top, width, height, text, font_size, bold, color, align=None):
+        shape = self._box(slide, left, top, width, height)
+        slide.ops.append(("text", layout_text(shape, [(text, font_size, bold, color, align, 0, 0, 0)])))
+        return shape
+
+    def add_shape_box(self, slide, left, top, width, height, text, bg_color, text_color, font_size, bold,
+                      middle=True, paragraph_per_line=False):
+        shape = self._box(slide, left, top, width, height)
+        radius = ROUND_RECT_RADIUS * min(width, height)
+        slide.ops.append(("rect", (shape, radius, bg_color, bg_color, DEFAULT_LINE_WIDTH)))
+        if paragraph_per_line:
+            first, *rest = text.split("\n")
+            paragraphs = [(first, font_size, bold, text_color, "center", 0, 0, 0)]
+            paragraphs += [(line, DEFAULT_FONT_SIZE, False, None, None, 0, 0, 0) for line in rest]
+        else:
+            paragraphs = [(text, font_size, bold, text_color, "center", 0, 0, 0)]
+        slide.ops.append(("text", layout_text(shape, paragraphs, middle)))
+        return shape
+
+    def add_arrow(self, slide, x1, y1, x2, y2, color, width, head=False):
+        slide.ops.append(("line", ([(x1, y1), (x2, y2)], color, width)))
+        if head:
+            slide.ops.append(("line", (_arrowhead((x1, y1), (x2, y2), width), color, width)))
+
+    def add_glued_arrow(self, slide, source, target, color, width):
+        source_site, target_site = connector_routing.nearest_sites(source, target)
+        self.add_arrow(slide, *connector_routing.site_point(source, source_site),
+                       *connector_routing.site_point(target, target_site), color, width, head=True)
+
+    def add_routed_arrow(self, slide, source, target, color, width):
+        obstacles = []
+        for shape in slide.shapes:
+            if shape is source:
+                source_index = len(obstacles)
+            elif shape is target:
+                target_index = len(obstacles)
+            elif connector_routing.contains(shape, source) or connector_routing.contains(shape, target):
+                continue
+            obstacles.append(shape)
+
+        route = connector_routing.route(obstacles, source_index, target_index)
+        if route is None:
+            source_site, target_site = connector_routing.nearest_sites(source, target)
+            points = [connector_routing.site_point(source, source_site),
+                      connector_routing.site_point(target, target_site)]
+        else:
+            points = route.points
+        slide.ops.append(("line", (points, color, width)))
+        return points
+
+    def add_bullet_list(self, slide, left, top, width, height, items, font_size, color,
+                        space_before, space_after=None, indent_level=0):
+        shape = self._box(slide, left, top, width, height)
+        paragraphs = []
+        for i, item in enumerate(items):
+            level = indent_level if isinstance(indent_level, int) else indent_level.get(i, 0)
+            paragraphs.append((item, font_size, False, color, None, level, space_before, space_after or 0))
+        slide.ops.append(("text", layout_text(shape, paragraphs)))
+        return shape
+
+    def add_table(self, slide, left, top, col_widths, rows):
+        shape = self._box(slide, left, top, sum(col_widths), sum(row_height for row_height, _ in rows))
+        y = top
+        for row_height, cells in rows:
+            if len(cells) != len(col_widths):
+                raise ValueError(f"Expected {len(col_widths)} cells per row, got {len(cells)}")
+            x = left
+            for col_width, cell in zip(col_widths, cells):
+                rect = (x, y, col_width, row_height)
+                if cell.fill is not None:
+                    slide.ops.append(("rect", (rect, 0, cell.fill, None, 0)))
+                slide.ops.append(("text", layout_text(rect, [(cell.text, cell.font_size, cell.bold, cell.text_color,
+                                                              cell.align, 0, 0, 0)], middle=True)))
+                x += col_width
+            y += row_height
+        return shape
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Font Subsetting and Embedding
+Embeds fonts into a saved deck, subset to the glyphs its slides use, with
+subsets cached on disk by font and glyph set so batch builds reuse them
+"""
+
+import hashlib
+import html
+import io
+import logging
+import os
+import re
+import struct
+import tempfile
+import zipfile
+from collections import namedtuple
+
+DEFAULT_CACHE_DIR = ".font_cache"
+
+_P = "http://schemas.openxmlformats.org/presentationml/2006/main"
+_R = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_PKG_RELS = "http://schemas.openxmlformats.org/package/2006/relationships"
+_CONTENT_TYPES = "http://schemas.openxmlformats.org/package/2006/content-types"
+_FONT_REL_TYPE = f"{_R}/font"
+_FONT_CONTENT_TYPE = "application/x-fontdata"
+
+# presentation.xml children that must follow p:embeddedFontLst, in schema order
+_AFTER_EMBEDDED_FONTS = ("custShowLst", "photoAlbum", "custDataLst", "kinsoku", "defaultTextStyle",
+                         "modifyVerifier", "extLst")
+
+# OS/2 fsType bits that forbid embedding the font in a document
+_RESTRICTED_LICENSE = 0x0002
+_BITMAP_EMBEDDING_ONLY = 0x0200
+
+# EOT (Embedded OpenType) header constants; PowerPoint stores embedded fonts as uncompressed EOT
+_EOT_VERSION = 0x00020001
+_EOT_MAGIC = 0x504C
+_DEFAULT_CHARSET = 1
+
+# One font file to embed: the typeface name slides refer to and its slot in p:embeddedFont
+FontFace = namedtuple("FontFace", "path typeface style")
+
+# An embedded face, its subset size in bytes, and whether the deck's text is set in its typeface at all
+EmbeddedFont = namedtuple("EmbeddedFont", "face size used")
+
+# (font digest, glyph set digest) -> EOT bytes
+_subsets = {}
+
+def _font_tools():
+    try:
+        from fontTools import subset, ttLib
+    except ImportError:  # Only embedding needs fontTools; building decks does not
+        raise RuntimeError("fontTools is required to embed fonts (pip install fonttools)") from None
+    return subset, ttLib
+
+def _name(font, *name_ids):
+    for name_id in name_ids:
+        record = font["name"].getName(name_id, 3, 1) or font["name"].getName(name_id, 1, 0)
+        if record is not None:
+            return record.toUnicode()
+    return ""
+
+def read_face(path):
+    """Read a font file's typeface name and style (regular, bold, italic or boldItalic)"""
+    _, ttLib = _font_tools()
+    font = ttLib.TTFont(path, lazy=True)
+    fs_selection = font["OS/2"].fsSelection
+    bold, italic = bool(fs_selection & 0x20), bool(fs_selection & 0x01)
+    style = {(False, False): "regular", (True, False): "bold",
+             (False, True): "italic", (True, True): "boldItalic"}[bold, italic]
+    # Typographic family first, so "Calibri Light"-style families keep their name
+    return FontFace(path, _name(font, 16, 1), style)
+
+def deck_characters(zin):
+    """Every character in the text runs of a deck's slides"""
+    characters = {" "}
+    for name in zin.namelist():
+        if re.fullmatch(r"ppt/slides/slide\d+\.xml", name):
+            for text in re.findall(rb"<a:t(?: [^>]*)?>([^<]*)</a:t>", zin.read(name)):
+                characters.update(html.unescape(text.decode("utf-8")))
+    return characters
+
+def deck_typefaces(zin):
+    """Latin typefaces a deck's text can be set in: the theme's fonts plus any set on runs or placeholders"""
+    typefaces = set()
+    for name in zin.namelist():
+        if re.fullmatch(r"ppt/(theme|slides|slideLayouts|slideMasters)/\w+\.xml", name):
+            for typeface in re.findall(rb'<a:latin typeface="([^"]*)"', zin.read(name)):
+                typefaces.add(html.unescape(typeface.decode("utf-8")))
+    # "+mn-lt" and "+mj-lt" name the theme fonts, already counted
+    return {typeface for typeface in typefaces if typeface and not typeface.startswith("+")}
+
+def _eot(font_data, font):
+    """Wrap subset TrueType data in an uncompressed EOT header"""
+    os2, head = font["OS/2"], font["head"]
+    names = [_name(font, 1), _name(font, 2), _name(font, 5), _name(font, 4)]
+
+    header = struct.pack(
+        "<4L10sBBLHH4L2LL4LH",
+        0, len(font_data), _EOT_VERSION, 0,
+        bytes(getattr(os2.panose, field) for field in (
+            "bFamilyType", "bSerifStyle", "bWeight", "bProportion", "bContrast",
+            "bStrokeVariation", "bArmStyle", "bLetterForm", "bMidline", "bXHeight")),
+        _DEFAULT_CHARSET, os2.fsSelection & 0x01, os2.usWeightClass, os2.fsType, _EOT_MAGIC,
+        os2.ulUnicodeRange1, os2.ulUnicodeRange2, os2.ulUnicodeRange3, os2.ulUnicodeRange4,
+        os2.ulCodePageRange1, os2.ulCodePageRange2, head.checkSumAdjustment,
+        0, 0, 0, 0, 0,
+    )
+    for value in names:
+        encoded = value.encode("utf-16-le")
+        header += struct.pack("<H", len(encoded)) + encoded
+        header += struct.pack("<H", 0)      # Padding before the next name
+    header += struct.pack("<H", 0)          # Empty root string
+
+    size = len(header) + len(font_data)
+    return struct.pack("<L", size) + header[4:] + font_data
+
+def subset_font(path, characters, cache_dir=DEFAULT_CACHE_DIR):
+    """EOT data for the font at path, subset to characters; cached by font and glyph set"""
+    with open(path, "rb") as f:
+        font_digest = hashlib.sha256(f.read()).hexdigest()
+    glyphs_digest = hashlib.sha256("".join(sorted(characters)).encode()).hexdigest()
+    key = (font_digest, glyphs_digest)
+
+    eot = _subsets.get(key)
+    if eot is not None:
+        return eot
+
+    cached_file = os.path.join(cache_dir, f"{font_digest[:16]}-{glyphs_digest[:16]}.fntdata")
+    if os.path.exists(cached_file):
+        with open(cached_file, "rb") as f:
+            eot = f.read()
+    else:
+        subset, ttLib = _font_tools()
+        font = ttLib.TTFont(path)
+        fs_type = font["OS/2"].fsType
+        if fs_type & (_RESTRICTED_LICENSE | _BITMAP_EMBEDDING_ONLY):
+            raise RuntimeError(f"{path}: the font's license does not allow embedding (fsType {fs_type:#06x})")
+
+        options = subset.Options()
+        options.name_IDs = ["*"]            # Keep the names PowerPoint matches typefaces on
+        options.notdef_outline = True
+        options.drop_tables += ["DSIG"]
+        subsetter = subset.Subsetter(options)
+        subsetter.populate(unicodes=[ord(char) for char in characters])
+        # fontTools logs every table it drops ("FFTM NOT subset; ...") to stderr
+        logger = logging.getLogger("fontTools.subset")
+        level = logger.level
+        logger.setLevel(logging.ERROR)
+        try:
+            subsetter.subset(font)
+        finally:
+            logger.setLevel(level)
+
+        out = io.BytesIO()
+        font.save(out)
+        font_data = out.getvalue()
+        eot = _eot(font_data, ttLib.TTFont(io.BytesIO(font_data)))
+
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(cached_file, "wb") as f:
+            f.write(eot)
+
+    _subsets[key] = eot
+    return eot
+
+def _embedded_font_list(faces, rel_ids):
+    """p:embeddedFontLst markup with one p:embeddedFont per typeface"""
+    by_typeface = {}
+    for face, rel_id in zip(faces, rel_ids):
+        by_typeface.setdefault(face.typeface, []).append((face.style, rel_id))
+
+    order = ("regular", "bold", "italic", "boldItalic")
+    entries = []
+    for typeface, styles in by_typeface.items():
+        slots = "".join(f'<p:{style} r:id="{rel_id}"/>'
+                        for style, rel_id in sorted(styles, key=lambda slot: order.index(slot[0])))
+        entries.append(f'<p:embeddedFont><p:font typeface="{typeface}"/>{slots}</p:embeddedFont>')
+    return f'<p:embeddedFontLst xmlns:p="{_P}" xmlns:r="{_R}">{"".join(entries)}</p:embeddedFontLst>'
+
+def embed_fonts(pptx_file, font_paths, cache_dir=DEFAULT_CACHE_DIR):
+    """Embed subsets of the given font files into a saved deck, replacing any fonts it embeds already
+
+    Only a typeface the deck's text is set in changes how it renders (for
+    the generated decks, the theme's Calibri); EmbeddedFont.used is False
+    for any other, so callers can warn. Returns [EmbeddedFont, ...].
+    """
+    from lxml import etree
+
+    faces = [read_face(path) for path in font_paths]
+    with zipfile.ZipFile(pptx_file) as zin:
+        characters = deck_characters(zin)
+        typefaces = deck_typefaces(zin)
+        fonts = [subset_font(face.path, characters, cache_dir) for face in faces]
+
+        rels = etree.fromstring(zin.read("ppt/_rels/presentation.xml.rels"))
+        for rel in list(rels):
+            if rel.get("Type") == _FONT_REL_TYPE:
+                rels.remove(rel)
+        next_id = max((int(rel.get("Id")[3:]) for rel in rels if rel.get("Id")[3:].isdigit()), default=0) + 1
+        rel_ids = [f"rId{next_id + i}" for i in range(len(faces))]
+        for i, rel_id in enumerate(rel_ids, 1):
+            etree.SubElement(rels, f"{{{_PKG_RELS}}}Relationship",
+                             Id=rel_id, Type=_FONT_REL_TYPE, Target=f"fonts/font{i}.fntdata")
+
+        presentation = etree.fromstring(zin.read("ppt/presentation.xml"))
+        for old in presentation.findall(f"{{{_P}}}embeddedFontLst"):
+            presentation.remove(old)
+        font_list = etree.fromstring(_embedded_font_list(faces, rel_ids))
+        following = [child for child in presentation if etree.QName(child).localname in _AFTER_EMBEDDED_FONTS]
+        if following:
+            following[0].addprevious(font_list)
+        else:
+            presentation.append(font_list)
+        presentation.set("embedTrueTypeFonts", "1")
+        presentation.set("saveSubsetFonts", "1")
+
+        content_types = etree.fromstring(zin.read("[Content_Types].xml"))
+        if not any(default.get("Extension") == "fntdata" for default in content_types):
+            content_types.insert(0, etree.Element(f"{{{_CONTENT_TYPES}}}Default",
+                                                  Extension="fntdata", ContentType=_FONT_CONTENT_TYPE))
+
+        replaced = {
+            "[Content_Types].xml": content_types,
+            "ppt/presentation.xml": presentation,
+            "ppt/_rels/presentation.xml.rels": rels,
+        }
+        fd, tmp_file = tempfile.mkstemp(suffix=".pptx", dir=os.path.dirname(os.path.abspath(pptx_file)))
+        os.close(fd)
+        try:
+            with zipfile.ZipFile(tmp_file, "w", compression=zipfile.ZIP_DEFLATED) as zout:
+                for info in zin.infolist():
+                    if info.filename.startswith("ppt/fonts/"):
+                        continue
+                    if info.filename in replaced:
+                        zout.writestr(info.filename, etree.tostring(
+                            replaced[info.filename], xml_declaration=True, encoding="UTF-8", standalone=True))
+                    else:
+                        zout.writestr(info, zin.read(info))
+                for i, font in enumerate(fonts, 1):
+                    zout.writestr(f"ppt/fonts/font{i}.fntdata", font)
+        except BaseException:
+            os.remove(tmp_file)
+            raise
+
+    os.replace(tmp_file, pptx_file)
+    return [EmbeddedFont(face, len(font), face.typeface in typefaces) for face, font in zip(faces, fonts)]
+
+def main():
+    """Embed font subsets into saved decks"""
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Embed fonts, subset to the glyphs used, into .pptx files")
+    parser.add_argument("decks", nargs="+", help=".pptx files to embed fonts into")
+    parser.add_argument("--font", action="append", required=True, metavar="PATH",
+                        help="TrueType/OpenType font file to embed (repeat for each weight)")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="Directory holding cached subsets")
+    args = parser.parse_args()
+
+    for deck in args.decks:
+        start = time.perf_counter()
+        embedded = embed_fonts(deck, args.font, args.cache_dir)
+        elapsed = time.perf_counter() - start
+        summary = ", ".join(f"{font.face.typeface} {font.face.style} ({font.size / 1024:.0f} KB)" for font in embedded)
+        print(f"✅ {deck}: embedded {summary} in {elapsed * 1000:.0f} ms")
+        for font in embedded:
+            if not font.used:
+                print(f"⚠️ {deck}: no text is set in {font.face.typeface}; embedding it changes nothing")
+
+if __name__ == "__main__":
+    main()
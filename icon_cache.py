@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Emoji Icon Cache
+Rasterizes each distinct emoji icon once with Pillow and keeps the PNGs in
+memory and on disk, so every slide that uses an icon shares one media part
+"""
+
+import hashlib
+import io
+import os
+import unicodedata
+
+DEFAULT_CACHE_DIR = ".icon_cache"
+
+# Raster height in pixels; icons are drawn at most about half an inch tall
+ICON_PIXELS = 128
+
+# Color emoji fonts tried in order when none is given
+EMOJI_FONTS = (
+    "/usr/share/fonts/truetype/noto/NotoColorEmoji.ttf",
+    "/usr/share/fonts/noto/NotoColorEmoji.ttf",
+    "/usr/share/fonts/google-noto-emoji/NotoColorEmoji.ttf",
+    "/System/Library/Fonts/Apple Color Emoji.ttc",
+    "C:\\Windows\\Fonts\\seguiemj.ttf",
+)
+
+# Bitmap emoji fonts (CBDT) only load at their one strike size
+_BITMAP_STRIKE = 109
+
+# Characters that attach to the emoji before them
+_VARIATION_SELECTOR = "\ufe0f"
+_ZERO_WIDTH_JOINER = "\u200d"
+_KEYCAP = "\u20e3"
+
+# What an icon leaves behind in the text: an em space holds the emoji's one-em slot
+ICON_SPACE = "\u2003"
+
+def _starts_icon(text, i):
+    char = text[i]
+    if unicodedata.category(char) != "So":
+        return False
+    return unicodedata.east_asian_width(char) == "W" or text[i + 1:i + 2] == _VARIATION_SELECTOR
+
+def split_icon(text):
+    """Split a leading run of emoji off text; returns (icon, number of emoji, rest)
+
+    Variation selectors, skin tones, keycaps and zero-width-joiner sequences
+    stay with the emoji they modify. icon is "" when text does not start
+    with an emoji.
+    """
+    i = count = 0
+    while i < len(text) and _starts_icon(text, i):
+        count += 1
+        i += 1
+        while i < len(text):
+            char = text[i]
+            if char in (_VARIATION_SELECTOR, _KEYCAP) or "\U0001F3FB" <= char <= "\U0001F3FF":
+                i += 1
+            elif char == _ZERO_WIDTH_JOINER and i + 1 < len(text):
+                i += 2
+            else:
+                break
+    return text[:i], count, text[i:]
+
+def find_emoji_font():
+    """Path of the first installed color emoji font, or None"""
+    for path in EMOJI_FONTS:
+        if os.path.exists(path):
+            return path
+    return None
+
+class IconCache:
+    """PNG rasters of emoji icons, cached in memory and in cache_dir across builds
+
+    Files are keyed on the icon, the font file and the raster size, so a new
+    font or size never reuses a stale raster.
+    """
+
+    def __init__(self, font_path=None, cache_dir=DEFAULT_CACHE_DIR, pixels=ICON_PIXELS):
+        self.font_path = font_path or find_emoji_font()
+        if self.font_path is None:
+            raise RuntimeError("No color emoji font found; pass one with --icon-font")
+        self.cache_dir = cache_dir
+        self.pixels = pixels
+        self._font = None
+        self._pngs = {}
+        self.rendered = 0
+
+        stat = os.stat(self.font_path)
+        self._font_key = f"{os.path.abspath(self.font_path)}|{stat.st_size}|{stat.st_mtime_ns}|{pixels}"
+
+    def __getstate__(self):
+        # Loaded fonts do not pickle; a worker process loads its own on first render
+        return {**self.__dict__, "_font": None}
+
+    def _load_font(self):
+        try:
+            from PIL import ImageFont
+        except ImportError:  # Only needed to draw emoji as pictures
+            raise RuntimeError("Pillow is required to render emoji icons (pip install pillow)") from None
+        try:
+            return ImageFont.truetype(self.font_path, self.pixels)
+        except OSError:
+            return ImageFont.truetype(self.font_path, _BITMAP_STRIKE)
+
+    def _render(self, icon, count):
+        from PIL import Image, ImageDraw
+
+        if self._font is None:
+            self._font = self._load_font()
+        left, top, right, bottom = self._font.getbbox(icon)
+        glyphs = Image.new("RGBA", (max(right - left, 1), max(bottom - top, 1)))
+        ImageDraw.Draw(glyphs).text((-left, -top), icon, font=self._font, embedded_color=True)
+
+        # Scale into a count-ems-wide, one-em-tall canvas, centered
+        scale = min(self.pixels * count / glyphs.width, self.pixels / glyphs.height)
+        glyphs = glyphs.resize((max(round(glyphs.width * scale), 1), max(round(glyphs.height * scale), 1)),
+                               Image.LANCZOS)
+        canvas = Image.new("RGBA", (self.pixels * count, self.pixels))
+        canvas.paste(glyphs, ((canvas.width - glyphs.width) // 2, (canvas.height - glyphs.height) // 2))
+
+        out = io.BytesIO()
+        canvas.save(out, "PNG", optimize=True)
+        self.rendered += 1
+        return out.getvalue()
+
+    def png(self, icon, count=1):
+        """PNG bytes for an icon count emoji wide, rasterized at most once per font and size"""
+        png = self._pngs.get(icon)
+        if png is not None:
+            return png
+
+        digest = hashlib.sha256(f"{icon}|{self._font_key}".encode()).hexdigest()
+        cached_file = os.path.join(self.cache_dir, digest + ".png")
+        if os.path.exists(cached_file):
+            with open(cached_file, "rb") as f:
+                png = f.read()
+        else:
+            png = self._render(icon, count)
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(cached_file, "wb") as f:
+                f.write(png)
+
+        self._pngs[icon] = png
+        return png
+
+def main():
+    """Rasterize emoji into the on-disk cache and report what was reused"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Rasterize emoji icons into the icon cache")
+    parser.add_argument("icons", nargs="+", help="Emoji to rasterize")
+    parser.add_argument("--font", help="Color emoji font file (default: first installed one)")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="Directory holding cached rasters")
+    args = parser.parse_args()
+
+    cache = IconCache(args.font, args.cache_dir)
+    for text in args.icons:
+        icon, count, _ = split_icon(text)
+        if not icon:
+            print(f"⚠️ {text!r} does not start with an emoji")
+            continue
+        print(f"✅ {icon}: {len(cache.png(icon, count)):,} byte PNG")
+    print(f"✅ Rendered {cache.rendered}, reused {len(cache._pngs) - cache.rendered} from {args.cache_dir}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Inventory Topology
+Reads an Ansible YAML inventory (hosts.yml plus group_vars) and compiles
+topology slides showing its groups and hosts; groups with many hosts collapse
+into aggregated boxes so even thousands of hosts draw a bounded number of shapes
+"""
+
+import os
+import re
+from collections import Counter, namedtuple
+
+import text_fit
+
+DEFAULT_INVENTORY_FILE = "hosts.yml"
+
+# Groups with more hosts than this are drawn as one aggregated box
+MAX_HOSTS_PER_GROUP = 12
+
+# Group panels drawn per slide; further groups fold into one summary panel
+MAX_GROUPS = 6
+
+# Host variables shown under a host's name, and what marks the primary node
+ADDRESS_VAR = "ansible_host"
+ROLE_VARS = ("rabbitmq_node_type", "node_role", "role")
+PRIMARY_VARS = ("rabbitmq_is_primary", "is_primary")
+
+# group_vars entries naming the environment and a group's cluster
+ENVIRONMENT_VARS = ("environment_name", "deployment_env")
+CLUSTER_VARS = ("rabbitmq_cluster_name", "cluster_name")
+
+# Host box height and spacing inside a group panel, in inches, and its font size
+HOST_HEIGHT, HOST_GAP = 0.7, 0.1
+HOST_FONT_SIZE = 10
+
+# Drawing area below the title, in inches
+AREA_LEFT, AREA_TOP, AREA_WIDTH, AREA_HEIGHT = 0.8, 1.4, 11.7, 5.7
+
+Host = namedtuple("Host", "name address role primary")
+Group = namedtuple("Group", "name path hosts cluster")
+Inventory = namedtuple("Inventory", "environment groups host_count")
+
+class InventoryError(ValueError):
+    """Raised when a file is not an Ansible YAML inventory"""
+
+def _yaml_load(path):
+    try:
+        import yaml
+    except ImportError:  # Only reading inventories needs PyYAML
+        raise RuntimeError("PyYAML is required to read inventories (pip install pyyaml)") from None
+    with open(path, "rb") as f:
+        try:
+            return yaml.load(f, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+        except yaml.YAMLError as e:
+            raise InventoryError(f"{path}: {e}") from None
+
+def expand_hosts(pattern):
+    """Expand Ansible host ranges: "web[01:03]" -> web01, web02, web03; "db-[a:c]" -> db-a, db-b, db-c"""
+    match = re.search(r"\[([0-9a-z]+):([0-9a-z]+)(?::(\d+))?\]", pattern)
+    if match is None:
+        return [pattern]
+    start, end, step = match.group(1), match.group(2), int(match.group(3) or 1)
+    head, tail = pattern[:match.start()], pattern[match.end():]
+    if start.isdigit() and end.isdigit():
+        width = len(start) if start.startswith("0") else 0
+        values = [str(i).zfill(width) for i in range(int(start), int(end) + 1, step)]
+    else:
+        values = [chr(i) for i in range(ord(start), ord(end) + 1, step)]
+    return [name for value in values for name in expand_hosts(head + value + tail)]
+
+def _resolve(value, variables, depth=0):
+    """Substitute plain {{ name }} references; anything else (lookups, filters) is left as written"""
+    if not isinstance(value, str) or depth > 5:
+        return value
+    def substitute(match):
+        name = match.group(1)
+        return str(_resolve(variables[name], variables, depth + 1)) if name in variables else match.group(0)
+    return re.sub(r"\{\{\s*(\w+)\s*\}\}", substitute, value)
+
+def _first(variables, names):
+    for name in names:
+        if variables.get(name) is not None:
+            return _resolve(variables[name], variables)
+    return None
+
+def _group_vars(inventory_dir, group):
+    """Variables from group_vars/<group>.yml or group_vars/<group>/*.yml"""
+    variables = {}
+    base = os.path.join(inventory_dir, "group_vars", group)
+    paths = [base + ext for ext in (".yml", ".yaml") if os.path.isfile(base + ext)]
+    if os.path.isdir(base):
+        paths += sorted(os.path.join(base, name) for name in os.listdir(base) if name.endswith((".yml", ".yaml")))
+    for path in paths:
+        loaded = _yaml_load(path)
+        if isinstance(loaded, dict):
+            variables.update(loaded)
+    return variables
+
+def load_inventory(path):
+    """Read an inventory file (or a directory holding hosts.yml) into an Inventory"""
+    if os.path.isdir(path):
+        path = os.path.join(path, DEFAULT_INVENTORY_FILE)
+    inventory_dir = os.path.dirname(os.path.abspath(path))
+    data = _yaml_load(path)
+    if not isinstance(data, dict) or not data:
+        raise InventoryError(f"{path}: expected a YAML inventory mapping")
+
+    all_vars = _group_vars(inventory_dir, "all")
+    root = data.get("all")
+    if isinstance(root, dict):
+        all_vars.update(root.get("vars") or {})
+
+    groups = []
+    host_names = set()
+
+    def walk(name, group, path, inherited):
+        group = group or {}
+        variables = {**inherited, **_group_vars(inventory_dir, name), **(group.get("vars") or {})}
+        hosts = []
+        for pattern, host_vars in (group.get("hosts") or {}).items():
+            host_vars = {**variables, **(host_vars or {})}
+            role = _first(host_vars, ROLE_VARS)
+            primary = any(host_vars.get(var) is True for var in PRIMARY_VARS)
+            for host_name in expand_hosts(str(pattern)):
+                hosts.append(Host(host_name, host_vars.get(ADDRESS_VAR), role, primary))
+        if hosts:
+            groups.append(Group(name, path, tuple(hosts), _first(variables, CLUSTER_VARS)))
+            host_names.update(host.name for host in hosts)
+        for child, child_group in (group.get("children") or {}).items():
+            walk(child, child_group, path + (child,), variables)
+
+    if isinstance(root, dict):
+        walk("all", root, (), all_vars)
+    else:
+        for name, group in data.items():
+            walk(name, group, (name,), all_vars)
+
+    environment = _first(all_vars, ENVIRONMENT_VARS) or os.path.basename(inventory_dir)
+    return Inventory(environment, tuple(groups), len(host_names))
+
+# =============================================================================
+# TOPOLOGY SLIDES
+# =============================================================================
+
+def _host_text(host):
+    details = " · ".join(str(detail) for detail in (host.address, host.role) if detail)
+    return f"{host.name}\n{details}" if details else host.name
+
+def aggregate_text(hosts):
+    """One box's text summarizing many hosts: count, name range and role breakdown"""
+    names = sorted(host.name for host in hosts)
+    roles = Counter(host.role for host in hosts if host.role)
+    lines = [f"{len(hosts):,} hosts", f"{names[0]} … {names[-1]}"]
+    if roles:
+        lines.append(" · ".join(f"{role} ×{count:,}" for role, count in roles.most_common(3)))
+    primaries = sum(host.primary for host in hosts)
+    if primaries:
+        lines.append(f"{primaries} primary")
+    return "\n".join(lines)
+
+def _grid(count, width, height, max_columns):
+    """(columns, rows) for count cells filling a width x height area as evenly as possible"""
+    columns = max(1, min(count, max_columns, round((count * width / max(height, 0.1)) ** 0.5) or 1))
+    rows = -(-count // columns)
+    return columns, rows
+
+def _host_grid(group, width, height):
+    """(columns, rows) of host boxes in a panel's inner area, or None when the group is aggregated
+
+    Starting from the most even grid, columns are dropped until every host's
+    text fits its box; a group whose hosts fit no grid is aggregated too.
+    """
+    if len(group.hosts) > MAX_HOSTS_PER_GROUP:
+        return None
+    texts = [_host_text(host) for host in group.hosts]
+    columns, _ = _grid(len(texts), width, height, 4)
+    for columns in range(columns, 0, -1):
+        rows = -(-len(texts) // columns)
+        box_width = (width - HOST_GAP * (columns - 1)) / columns
+        box_height = min(HOST_HEIGHT, (height - HOST_GAP * (rows - 1)) / rows)
+        if not any(text_fit.fit_text(text, box_width, box_height, HOST_FONT_SIZE, True,
+                                     min_size=HOST_FONT_SIZE).overflow for text in texts):
+            return columns, rows
+    return None
+
+def _panel_height(group, width, height):
+    """Height a panel needs for its hosts, at most height"""
+    grid = _host_grid(group, width - 0.3, height - 0.8)
+    rows = 2 if grid is None else grid[1]
+    return min(height, 0.8 + rows * HOST_HEIGHT + (rows - 1) * HOST_GAP)
+
+def _panel_ops(group, left, top, width, height, palette):
+    title = " › ".join(group.path) if group.path else group.name
+    ops = [("box", (left, top, width, height, "", palette["LIGHT_GRAY"], palette["LIGHT_GRAY"], 10, False)),
+           ("text", (left + 0.1, top + 0.05, width - 0.2, 0.3, title, 13, True, palette["DARK_BLUE"], "LEFT"))]
+    subtitle = f"{len(group.hosts):,} hosts"
+    if group.cluster:
+        subtitle = f"{group.cluster} · {subtitle}"
+    ops.append(("text", (left + 0.1, top + 0.32, width - 0.2, 0.25, subtitle, 10, False,
+                         palette["MEDIUM_GRAY"], "LEFT")))
+
+    inner_left, inner_top = left + 0.15, top + 0.65
+    inner_width, inner_height = width - 0.3, height - 0.8
+    grid = _host_grid(group, inner_width, inner_height)
+    if grid is None:
+        ops.append(("box", (inner_left, inner_top, inner_width, inner_height, aggregate_text(group.hosts),
+                            palette["DARK_BLUE"], palette["WHITE"], 12, True)))
+        return ops
+
+    columns, rows = grid
+    box_width = (inner_width - HOST_GAP * (columns - 1)) / columns
+    box_height = min(HOST_HEIGHT, (inner_height - HOST_GAP * (rows - 1)) / rows)
+    for i, host in enumerate(group.hosts):
+        row, column = divmod(i, columns)
+        color = palette["SUCCESS_GREEN"] if host.primary else palette["HARNESS_BLUE"]
+        ops.append(("box", (inner_left + column * (box_width + HOST_GAP), inner_top + row * (box_height + HOST_GAP),
+                            box_width, box_height, _host_text(host), color, palette["WHITE"], HOST_FONT_SIZE, True)))
+    return ops
+
+def topology_ops(inventory, palette):
+    """Compile an inventory into a draw list in the slide_specs format ("slide", "box" and "text" ops)
+
+    Every group that holds hosts gets a panel; a group with more than
+    MAX_HOSTS_PER_GROUP hosts shows one aggregated box instead of its hosts,
+    and groups past MAX_GROUPS fold into a single summary panel, so the
+    shape count stays bounded whatever the inventory's size.
+    """
+    groups = list(inventory.groups)
+    if len(groups) > MAX_GROUPS:
+        # Keep the largest groups, in inventory order, and fold the smallest together
+        by_size = sorted(groups, key=lambda group: len(group.hosts), reverse=True)
+        kept = set(map(id, by_size[:MAX_GROUPS - 1]))
+        rest = [group for group in groups if id(group) not in kept]
+        # A host in several folded groups counts once, as in host_count
+        hosts = tuple({host.name: host for group in rest for host in group.hosts}.values())
+        groups = [group for group in groups if id(group) in kept]
+        groups.append(Group(f"{len(rest)} more groups", (), hosts, None))
+
+    ops = [("slide", (f"Topology: {inventory.environment} ({inventory.host_count:,} hosts)", None))]
+    if not groups:
+        ops.append(("text", (AREA_LEFT, AREA_TOP, AREA_WIDTH, 0.4, "No hosts in this inventory", 16, False,
+                             palette["MEDIUM_GRAY"], "LEFT")))
+        return ops
+
+    gap = 0.25
+    columns, rows = _grid(len(groups), AREA_WIDTH, AREA_HEIGHT, 3)
+    panel_width = (AREA_WIDTH - gap * (columns - 1)) / columns
+    share = (AREA_HEIGHT - gap * (rows - 1)) / rows
+    top = AREA_TOP
+    for row in range(rows):
+        row_groups = groups[row * columns:(row + 1) * columns]
+        # Panels in a row share the height of the tallest one's content
+        height = max(_panel_height(group, panel_width, share) for group in row_groups)
+        for column, group in enumerate(row_groups):
+            ops += _panel_ops(group, AREA_LEFT + column * (panel_width + gap), top, panel_width, height, palette)
+        top += height + gap
+    return ops
+
+def main():
+    """Summarize inventories and the shapes their topology slides would draw"""
+    import argparse
+    import time
+
+    import create_professional_cd_presentation as generator
+
+    parser = argparse.ArgumentParser(description="Read Ansible inventories and report their topology")
+    parser.add_argument("inventories", nargs="+", help="Inventory files or directories holding hosts.yml")
+    args = parser.parse_args()
+
+    for path in args.inventories:
+        start = time.perf_counter()
+        try:
+            inventory = load_inventory(path)
+        except InventoryError as e:
+            print(f"⚠️ {e}")
+            continue
+        ops = topology_ops(inventory, generator.palette())
+        elapsed = time.perf_counter() - start
+        print(f"✅ {path}: {inventory.environment}, {inventory.host_count:,} hosts in "
+              f"{len(inventory.groups)} groups -> {len(ops) - 1} shapes in {elapsed * 1000:.0f} ms")
+
+if __name__ == "__main__":
+    main()
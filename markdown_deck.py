@@ -0,0 +1,403 @@
+#!/usr/bin/env python3
+"""
+Markdown Deck Compiler
+Turns a Markdown guide's headings, bullet lists, paragraphs, tables and
+diagrams into slides drawn with the professional deck's helpers; documents are split into
+sections by heading and only sections whose text changed are compiled and
+rendered again, so editing a long guide rebuilds a handful of slides
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import re
+import sys
+import time
+from collections import namedtuple
+
+import text_diagrams
+import text_fit
+
+DEFAULT_CACHE_DIR = ".markdown_cache"
+
+# Headings at this level or above start a section (and slides); deeper ones become subheadings
+SECTION_LEVEL = 3
+
+# Content area below the slide title, in inches
+CONTENT_LEFT, CONTENT_TOP, CONTENT_WIDTH, CONTENT_BOTTOM = 0.8, 1.4, 11.7, 7.0
+
+# Slide title width and size as add_slide_with_title draws them; a wrapped title pushes content down
+TITLE_WIDTH, TITLE_SIZE = 12.3, 40
+
+# Body text sizes in points; BULLET_SPACING matches add_bullet_list's space before plus after
+BODY_SIZE, SUBHEAD_SIZE, TABLE_SIZE = 16, 18, 11
+BULLET_SPACING = 12
+BLOCK_GAP = 0.1
+
+# One heading and the Markdown under it, up to the next section heading; key hashes all three
+Section = namedtuple("Section", "level title body key")
+
+# Parsed content: "subhead" and "paragraph" hold text, "bullets" [(text, level), ...],
+# "table" (header cells, [row cells, ...]) and "code" (language, source)
+Block = namedtuple("Block", "kind content")
+
+# section key -> draw list, for sections already compiled in this process
+_compiled = {}
+
+_HEADING = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+_BULLET = re.compile(r"^(\s*)(?:[-*+]|\d+[.)])\s+(.*)$")
+_TABLE_RULE = re.compile(r"^\s*\|?\s*:?-{3,}:?\s*(\|\s*:?-{3,}:?\s*)*\|?\s*$")
+
+def split_sections(text):
+    """Split a document into Sections at headings of level SECTION_LEVEL or above
+
+    Only a line scan and a hash per section; fenced code is skipped so '#'
+    comments inside it are not taken for headings.
+    """
+    sections = []
+    level, title, body = 0, None, []
+    fenced = False
+
+    def close():
+        if title is not None or any(line.strip() for line in body):
+            key = hashlib.sha256(f"{level}\0{title}\0{''.join(body)}".encode()).hexdigest()
+            sections.append(Section(level, title, "".join(body), key))
+
+    for line in text.splitlines(keepends=True):
+        if line.lstrip().startswith(("```", "~~~")):
+            fenced = not fenced
+        match = None if fenced else _HEADING.match(line)
+        if match and len(match.group(1)) <= SECTION_LEVEL:
+            close()
+            level, title, body = len(match.group(1)), inline_text(match.group(2)), []
+        else:
+            body.append(line)
+    close()
+    return sections
+
+def inline_text(text):
+    """Plain text for a line of Markdown: emphasis, code spans, links, images and HTML removed"""
+    text = re.sub(r"!\[([^\]]*)\]\([^)]*\)", r"\1", text)
+    text = re.sub(r"\[([^\]]+)\]\([^)]*\)", r"\1", text)
+    text = re.sub(r"<br\s*/?>", " ", text)
+    text = re.sub(r"</?[a-zA-Z][^>]*>", "", text)
+    text = re.sub(r"(\*\*|__)(.+?)\1", r"\2", text)
+    text = re.sub(r"(?<![\w*])\*(?!\s)(.+?)(?<!\s)\*(?!\w)", r"\1", text)
+    text = re.sub(r"`([^`]*)`", r"\1", text)
+    return " ".join(text.split())
+
+def _cells(line):
+    return [inline_text(cell) for cell in line.strip().strip("|").split("|")]
+
+def _line_groups(lines):
+    groups = []
+    for line in lines:
+        if not groups or line.startswith("**"):
+            groups.append([])
+        groups[-1].append(line)
+    return groups
+
+def parse_blocks(body):
+    """Blocks of a section body; rules and quotes' markers are dropped"""
+    blocks = []
+    lines = body.splitlines()
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        stripped = line.strip()
+        if stripped.startswith(("```", "~~~")):
+            start = i + 1
+            i = start
+            while i < len(lines) and not lines[i].strip().startswith(("```", "~~~")):
+                i += 1
+            blocks.append(Block("code", (stripped[3:].strip().lower(), "\n".join(lines[start:i]) + "\n")))
+            i += 1
+            continue
+        if not stripped or re.fullmatch(r"[-*_]{3,}", stripped):
+            i += 1
+            continue
+
+        heading = _HEADING.match(line)
+        if heading:
+            blocks.append(Block("subhead", inline_text(heading.group(2))))
+            i += 1
+        elif stripped.startswith("|") and i + 1 < len(lines) and _TABLE_RULE.match(lines[i + 1]):
+            header = _cells(line)
+            rows = []
+            i += 2
+            while i < len(lines) and lines[i].strip().startswith("|"):
+                cells = _cells(lines[i])
+                rows.append((cells + [""] * len(header))[:len(header)])
+                i += 1
+            blocks.append(Block("table", (header, rows)))
+        elif _BULLET.match(line):
+            items, indents = [], []
+            while i < len(lines) and (_BULLET.match(lines[i]) or (lines[i].startswith("  ") and lines[i].strip()
+                                                                   and items)):
+                bullet = _BULLET.match(lines[i])
+                if bullet is None:          # A wrapped continuation of the previous item
+                    text, level = items[-1]
+                    items[-1] = (f"{text} {inline_text(lines[i])}", level)
+                else:
+                    indent = len(bullet.group(1).expandtabs(4))
+                    while indents and indent < indents[-1]:
+                        indents.pop()
+                    if not indents or indent > indents[-1]:
+                        indents.append(indent)
+                    items.append((inline_text(bullet.group(2)), min(len(indents) - 1, 4)))
+                i += 1
+            blocks.append(Block("bullets", items))
+        else:
+            paragraph = []
+            while (i < len(lines) and lines[i].strip() and not _HEADING.match(lines[i])
+                   and not _BULLET.match(lines[i]) and not lines[i].strip().startswith(("|", "```", "~~~"))):
+                paragraph.append(lines[i].strip().lstrip(">").strip())
+                i += 1
+            # Lines opening with bold text ("**Version:** 2.0") keep their own line, as metadata blocks read
+            text = "\n".join(inline_text(" ".join(group)) for group in _line_groups(paragraph))
+            # A paragraph that is all bold ("**1. Cloud-Native by Design**") reads as a subheading
+            if re.fullmatch(r"\*\*[^*]+\*\*:?", " ".join(paragraph).strip()):
+                blocks.append(Block("subhead", text))
+            elif text:
+                blocks.append(Block("paragraph", text))
+    return blocks
+
+# =============================================================================
+# SLIDE COMPILATION
+# =============================================================================
+
+def _text_height(text, width, font_size, bold=False):
+    lines = len(text_fit.text_lines(text, width, font_size, bold))
+    return lines * font_size * text_fit.LINE_SPACING / 72 + 2 * text_fit.INSET_Y
+
+def _bullet_height(text, level, font_size=BODY_SIZE):
+    lines = len(text_fit.text_lines(text, CONTENT_WIDTH - level * 0.5, font_size))
+    return (lines * font_size * text_fit.LINE_SPACING + BULLET_SPACING) / 72
+
+def _column_widths(header, rows):
+    longest = [max([len(header[c])] + [len(row[c]) for row in rows]) for c in range(len(header))]
+    weights = [min(max(length, 6), 40) for length in longest]
+    return [CONTENT_WIDTH * weight / sum(weights) for weight in weights]
+
+def _row_height(cells, col_widths, bold=False):
+    lines = max(len(text_fit.text_lines(cell, width, TABLE_SIZE, bold)) for cell, width in zip(cells, col_widths))
+    return round(lines * TABLE_SIZE * text_fit.LINE_SPACING / 72 + 0.15, 2)
+
+class _SlideWriter:
+    """Places blocks top to bottom, continuing on a new slide when the current one is full"""
+
+    def __init__(self, title, palette, diagram_cache_dir=text_diagrams.DEFAULT_CACHE_DIR):
+        self.title = title
+        self.palette = palette
+        self.diagram_cache_dir = diagram_cache_dir
+        self.ops = []
+        self.pages = 0
+        self.cursor = CONTENT_TOP
+        self.omitted = []               # Languages of code blocks left out
+
+    def new_slide(self):
+        title = self.title if not self.pages else f"{self.title} (cont.)"
+        self.ops.append(("slide", (title, None)))
+        self.pages += 1
+        extra_lines = len(text_fit.text_lines(title, TITLE_WIDTH, TITLE_SIZE, True)) - 1
+        self.cursor = CONTENT_TOP + extra_lines * TITLE_SIZE * text_fit.LINE_SPACING / 72
+
+    def room(self, height):
+        """Start a new slide unless height fits below the cursor (a fresh slide takes anything)"""
+        if self.pages == 0 or self.cursor + height > CONTENT_BOTTOM and self.ops[-1][0] != "slide":
+            self.new_slide()
+
+    def subhead(self, text):
+        height = _text_height(text, CONTENT_WIDTH, SUBHEAD_SIZE, True)
+        # Keep a subheading with at least a line of what follows it
+        self.room(height + 0.5)
+        self.ops.append(("text", (CONTENT_LEFT, self.cursor, CONTENT_WIDTH, height, text, SUBHEAD_SIZE, True,
+                                  self.palette["HARNESS_BLUE"], "LEFT")))
+        self.cursor += height
+
+    def paragraph(self, text, color="DARK_GRAY"):
+        height = _text_height(text, CONTENT_WIDTH, BODY_SIZE)
+        self.room(height)
+        self.ops.append(("text", (CONTENT_LEFT, self.cursor, CONTENT_WIDTH, height, text, BODY_SIZE, False,
+                                  self.palette[color], "LEFT")))
+        self.cursor += height + BLOCK_GAP
+
+    def bullets(self, items):
+        start = 0
+        while start < len(items):
+            self.room(_bullet_height(*items[start]))
+            height, end = 2 * text_fit.INSET_Y, start
+            while end < len(items):
+                item_height = _bullet_height(*items[end])
+                if end > start and self.cursor + height + item_height > CONTENT_BOTTOM:
+                    break
+                height += item_height
+                end += 1
+            chunk = items[start:end]
+            levels = {i: level for i, (_, level) in enumerate(chunk) if level}
+            self.ops.append(("bullets", (CONTENT_LEFT, self.cursor, CONTENT_WIDTH, round(height, 2),
+                                         [text for text, _ in chunk], BODY_SIZE, levels)))
+            self.cursor += height + BLOCK_GAP
+            start = end
+
+    def table(self, header, rows):
+        from presentation_core import TableCell
+
+        col_widths = _column_widths(header, rows)
+        palette = self.palette
+        header_row = (_row_height(header, col_widths, True),
+                      [TableCell(cell, palette["HARNESS_BLUE"], palette["WHITE"], TABLE_SIZE, True, "LEFT")
+                       for cell in header])
+        body_rows = [(_row_height(cells, col_widths),
+                      [TableCell(cell, palette["LIGHT_GRAY"] if r % 2 else None, palette["DARK_GRAY"], TABLE_SIZE,
+                                 False, "LEFT") for cell in cells])
+                     for r, cells in enumerate(rows)]
+
+        start = 0
+        while True:
+            self.room(header_row[0] + (body_rows[start][0] if start < len(body_rows) else 0))
+            height, end = header_row[0], start
+            while end < len(body_rows):
+                if end > start and self.cursor + height + body_rows[end][0] > CONTENT_BOTTOM:
+                    break
+                height += body_rows[end][0]
+                end += 1
+            # Every continuation repeats the header row
+            self.ops.append(("table", (CONTENT_LEFT, self.cursor, col_widths, [header_row] + body_rows[start:end])))
+            self.cursor += height + BLOCK_GAP
+            start = end
+            if start >= len(body_rows):
+                break
+
+    def code(self, language, source):
+        """Draw a diagram code block on slides of its own; other code is left out"""
+        pages = text_diagrams.load_layout(source, language, self.diagram_cache_dir)
+        if pages is None:
+            self.omitted.append(language or "text")
+            return
+        for i, layout in enumerate(pages):
+            if i or self.pages == 0 or self.ops[-1][0] != "slide":
+                self.new_slide()
+            self.ops += text_diagrams.diagram_ops(layout, self.palette, max(self.cursor, text_diagrams.AREA_TOP))
+            self.cursor = CONTENT_BOTTOM
+
+    def finish(self, heading_shown):
+        """Give a section that drew nothing a titled slide, noting any code left out, so no heading goes missing"""
+        if self.pages or heading_shown and not self.omitted:
+            return
+        self.new_slide()
+        if self.omitted:
+            count = len(self.omitted)
+            languages = ", ".join(sorted(set(self.omitted)))
+            self.paragraph(f"{count} code block{'s' if count > 1 else ''} ({languages}) not shown; "
+                           f"see the source document", "MEDIUM_GRAY")
+
+def compile_section(section, palette, diagram_cache_dir=text_diagrams.DEFAULT_CACHE_DIR):
+    """Draw list (slide_specs format) for one section
+
+    A level-1 heading gets a title slide and a level-2 heading a divider
+    slide; the section's content follows on slides titled with its heading,
+    continued on further slides as it fills them.
+    """
+    draw_list = _compiled.get(section.key)
+    if draw_list is not None:
+        return draw_list
+
+    ops = []
+    title = section.title or "Overview"
+    if section.level == 1:
+        ops.append(("slide", (None, palette["HARNESS_BLUE"])))
+        ops.append(("text", (1, 2.5, 11.3, 1.5, title, 48, True, palette["WHITE"], "CENTER")))
+    elif section.level == 2:
+        ops.append(("slide", (None, None)))
+        ops.append(("box", (CONTENT_LEFT, 2.8, CONTENT_WIDTH, 1.4, title, palette["DARK_BLUE"], palette["WHITE"],
+                            36, True)))
+
+    blocks = parse_blocks(section.body)
+    if section.level == 1:
+        # Opening paragraphs (version, date, audience, ...) become the title slide's subtitle
+        subtitle = []
+        while blocks and blocks[0].kind == "paragraph":
+            subtitle.append(blocks.pop(0).content)
+        if subtitle:
+            ops.append(("text", (1, 4.2, 11.3, 2.5, "\n".join(subtitle), 16, False, palette["WHITE"], "CENTER")))
+
+    writer = _SlideWriter(title, palette, diagram_cache_dir)
+    for block in blocks:
+        getattr(writer, block.kind)(*(block.content if block.kind in ("table", "code") else (block.content,)))
+    writer.finish(heading_shown=section.level in (1, 2))
+    ops += writer.ops
+
+    _compiled[section.key] = ops
+    return ops
+
+# =============================================================================
+# INCREMENTAL DECK BUILD
+# =============================================================================
+
+def _renderer_fingerprint(generator):
+    """Hash of everything a section's slides depend on besides its own text"""
+    digest = hashlib.sha256(generator.shared_fingerprint().encode())
+    digest.update(inspect.getsource(sys.modules[__name__]).encode())
+    digest.update(text_diagrams.layout_fingerprint().encode())
+    digest.update(inspect.getsource(generator.render_draw_list).encode())
+    return digest.hexdigest()
+
+def build_deck(markdown_file, output_file, cache_dir=DEFAULT_CACHE_DIR):
+    """Compile a Markdown file into a deck; returns (slide count, sections rendered, sections)
+
+    Each section's slide parts are cached under the hash of its text and the
+    renderer, so after an edit only the changed sections are parsed,
+    compiled and drawn; the rest are reused as serialized slide XML.
+    Diagram layouts are cached in cache_dir too, under diagrams/.
+    """
+    import create_professional_cd_presentation as generator
+
+    with open(markdown_file, encoding="utf-8") as f:
+        sections = split_sections(f.read())
+    fingerprint = _renderer_fingerprint(generator)
+    palette = generator.palette()
+
+    os.makedirs(cache_dir, exist_ok=True)
+    blobs = []
+    rendered = 0
+    for section in sections:
+        key = hashlib.sha256((fingerprint + section.key).encode()).hexdigest()
+        cached_file = os.path.join(cache_dir, key + ".json")
+        if os.path.exists(cached_file):
+            with open(cached_file) as f:
+                section_blobs = [blob.encode("utf-8") for blob in json.load(f)]
+        else:
+            prs = generator.new_presentation()
+            generator.render_draw_list(prs, compile_section(section, palette, os.path.join(cache_dir, "diagrams")))
+            section_blobs = [slide.part.blob for slide in prs.slides]
+            with open(cached_file, "w") as f:
+                json.dump([blob.decode("utf-8") for blob in section_blobs], f)
+            rendered += 1
+        blobs += section_blobs
+
+    generator.assemble_presentation(blobs).save(output_file)
+    return len(blobs), rendered, len(sections)
+
+def main():
+    """Compile Markdown guides into decks, re-rendering only changed sections"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compile Markdown documents into slide decks")
+    parser.add_argument("documents", nargs="+", help="Markdown files to compile")
+    parser.add_argument("-o", "--output-dir", default=".", help="Directory for the .pptx files")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="Directory holding cached section slides")
+    args = parser.parse_args()
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    for document in args.documents:
+        output_file = os.path.join(args.output_dir, os.path.splitext(os.path.basename(document))[0] + ".pptx")
+        start = time.perf_counter()
+        slides, rendered, sections = build_deck(document, output_file, args.cache_dir)
+        elapsed = time.perf_counter() - start
+        print(f"✅ {output_file}: {slides} slides, rendered {rendered} of {sections} sections "
+              f"in {elapsed:.2f}s")
+
+if __name__ == "__main__":
+    main()
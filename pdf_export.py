@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+PDF Export
+An export_backend writer that produces a vector PDF straight from the build:
+each slide becomes a compressed page content stream written to disk as soon
+as the slide is finished, so memory stays flat however long the deck is
+"""
+
+import os
+import zlib
+
+import export_backend
+import text_fit
+
+# Standard PDF fonts need no embedding; every viewer has Helvetica or a metric clone
+FONTS = {False: b"Helvetica", True: b"Helvetica-Bold"}
+
+# Bezier control point distance for a quarter circle, as a fraction of the radius
+_KAPPA = 0.5523
+
+# Helvetica and Helvetica-Bold advance widths (1/1000 em) for printable ASCII, from the AFM files
+_HELVETICA = (
+    278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+    1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+    333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+    556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,
+)
+_HELVETICA_BOLD = (
+    278, 333, 474, 556, 556, 889, 722, 238, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 333, 333, 584, 584, 584, 611,
+    975, 722, 722, 722, 722, 667, 611, 778, 722, 278, 556, 722, 611, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 333, 278, 333, 584, 556,
+    333, 556, 611, 556, 611, 556, 333, 611, 611, 278, 278, 556, 278, 889, 611, 611,
+    611, 611, 389, 556, 333, 611, 556, 778, 556, 556, 500, 389, 280, 389, 584,
+)
+
+def _helvetica_width(text, bold):
+    """Width of text in Helvetica, in ems; characters outside ASCII count as a digit"""
+    widths = _HELVETICA_BOLD if bold else _HELVETICA
+    return sum(widths[ord(char) - 32] if " " <= char <= "~" else 556 for char in text) / 1000
+
+def _encode(text):
+    """WinAnsi bytes for text, dropping characters the standard fonts cannot show (emoji, arrows, ...)"""
+    return text.encode("cp1252", errors="ignore").decode("cp1252").strip()
+
+def _num(value):
+    return f"{value:.2f}".rstrip("0").rstrip(".")
+
+def _rgb(color):
+    return " ".join(_num(channel / 255) for channel in color)
+
+def _round_rect(x, y, w, h, r):
+    """Path operators for a rectangle with corner radius r; (x, y) is the bottom-left corner"""
+    if r <= 0:
+        return f"{_num(x)} {_num(y)} {_num(w)} {_num(h)} re"
+    k = r * (1 - _KAPPA)
+    right, top = x + w, y + h
+    return " ".join([
+        f"{_num(x + r)} {_num(y)} m",
+        f"{_num(right - r)} {_num(y)} l",
+        f"{_num(right - k)} {_num(y)} {_num(right)} {_num(y + k)} {_num(right)} {_num(y + r)} c",
+        f"{_num(right)} {_num(top - r)} l",
+        f"{_num(right)} {_num(top - k)} {_num(right - k)} {_num(top)} {_num(right - r)} {_num(top)} c",
+        f"{_num(x + r)} {_num(top)} l",
+        f"{_num(x + k)} {_num(top)} {_num(x)} {_num(top - k)} {_num(x)} {_num(top - r)} c",
+        f"{_num(x)} {_num(y + r)} l",
+        f"{_num(x)} {_num(y + k)} {_num(x + k)} {_num(y)} {_num(x + r)} {_num(y)} c h",
+    ])
+
+def page_content(slide, width, height):
+    """PDF content stream operators for one recorded slide
+
+    Text is placed where the text-fit engine's Calibri metrics put it, and
+    lines wider in Helvetica than in Calibri are condensed to the same width
+    so they stay inside their boxes.
+    """
+    page_height = height * 72
+    ops = [f"{_rgb(slide.background or (255, 255, 255))} rg 0 0 {_num(width * 72)} {_num(page_height)} re f"]
+    for op, args in slide.ops:
+        if op == "rect":
+            (left, top, w, h), radius, fill, line, line_width = args
+            path = _round_rect(left * 72, page_height - (top + h) * 72, w * 72, h * 72, radius * 72)
+            if line is None:
+                ops.append(f"{_rgb(fill)} rg {path} f")
+            else:
+                ops.append(f"{_rgb(fill)} rg {_rgb(line)} RG {_num(line_width)} w {path} B")
+        elif op == "text":
+            for line in args:
+                text = _encode(line.text)
+                if not text:
+                    continue
+                em = line.size / 72
+                text_width = text_fit.font_metrics(bold=line.bold).width(text) * em
+                x = line.x
+                if line.align == "center":
+                    x -= text_width / 2
+                elif line.align == "right":
+                    x -= text_width
+                scale = min(100, 100 * text_fit.font_metrics(bold=line.bold).width(text)
+                            / _helvetica_width(text, line.bold))
+                ops.append(f"BT /F{int(line.bold) + 1} {_num(line.size)} Tf {_num(scale)} Tz "
+                           f"{_rgb(line.color or (0, 0, 0))} rg "
+                           f"{_num(x * 72)} {_num(page_height - line.y * 72)} Td "
+                           f"<{text.encode('cp1252').hex()}> Tj ET")
+        elif op == "line":
+            points, color, line_width = args
+            (x, y), *rest = points
+            path = f"{_num(x * 72)} {_num(page_height - y * 72)} m " + " ".join(
+                f"{_num(x * 72)} {_num(page_height - y * 72)} l" for x, y in rest)
+            ops.append(f"{_rgb(color)} RG {_num(line_width)} w 1 j {path} S")
+    return "\n".join(ops).encode("latin-1")
+
+class PdfBackend(export_backend.Backend):
+    """Streams a deck into a PDF file at path, one page object per finished slide"""
+
+    # Objects with fixed numbers; pages take the numbers after them
+    _CATALOG, _PAGES, _RESOURCES, _INFO = 1, 2, 3, 4
+
+    def __init__(self, path, title="Slides"):
+        self.path = path
+        self.title = title
+        self._file = open(path, "wb")
+        self._offsets = {}
+        self._pages = []
+        self._next_object = 7
+        self._file.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        self._write_object(self._RESOURCES, b"<< /Font << /F1 5 0 R /F2 6 0 R >> >>")
+        for number, bold in ((5, False), (6, True)):
+            self._write_object(number, b"<< /Type /Font /Subtype /Type1 /BaseFont /" + FONTS[bold]
+                               + b" /Encoding /WinAnsiEncoding >>")
+
+    def _write_object(self, number, body):
+        self._offsets[number] = self._file.tell()
+        self._file.write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+
+    def _allocate(self):
+        number = self._next_object
+        self._next_object += 1
+        return number
+
+    def write_slide(self, deck, slide):
+        content = zlib.compress(page_content(slide, deck.width, deck.height))
+        content_number, page_number = self._allocate(), self._allocate()
+        self._write_object(content_number, b"<< /Length %d /Filter /FlateDecode >>\nstream\n" % len(content)
+                           + content + b"\nendstream")
+        self._write_object(page_number, (
+            f"<< /Type /Page /Parent {self._PAGES} 0 R /Resources {self._RESOURCES} 0 R "
+            f"/MediaBox [0 0 {_num(deck.width * 72)} {_num(deck.height * 72)}] "
+            f"/Contents {content_number} 0 R >>").encode())
+        self._pages.append(page_number)
+
+    def close(self, deck):
+        with self._file:
+            kids = " ".join(f"{number} 0 R" for number in self._pages)
+            self._write_object(self._PAGES,
+                               f"<< /Type /Pages /Kids [{kids}] /Count {len(self._pages)} >>".encode())
+            self._write_object(self._CATALOG, f"<< /Type /Catalog /Pages {self._PAGES} 0 R >>".encode())
+            title = self.title.encode("cp1252", errors="replace").hex()
+            self._write_object(self._INFO, f"<< /Title <{title}> >>".encode())
+
+            xref = self._file.tell()
+            size = self._next_object
+            self._file.write(b"xref\n0 %d\n0000000000 65535 f \n" % size)
+            for number in range(1, size):
+                self._file.write(b"%010d 00000 n \n" % self._offsets[number])
+            self._file.write((f"trailer\n<< /Size {size} /Root {self._CATALOG} 0 R /Info {self._INFO} 0 R >>\n"
+                              f"startxref\n{xref}\n%%EOF\n").encode())
+
+    def abort(self):
+        """Close and remove the partly written PDF"""
+        self._file.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
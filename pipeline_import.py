@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Pipeline YAML Importer
+Streams Harness pipeline YAML into a stage/step graph and lays it out as flow
+slides; parsed graphs are memoized by file hash, in memory and on disk, so
+batch runs over many pipelines parse each distinct file once
+"""
+
+import hashlib
+import json
+import os
+from collections import namedtuple
+
+import slide_layout as layout
+
+DEFAULT_CACHE_DIR = ".pipeline_cache"
+
+# Bump when the graph format changes so stale cache files are ignored
+CACHE_VERSION = 1
+
+# One step; a stage's steps are a sequence of columns, each a tuple of steps that run in parallel
+Step = namedtuple("Step", "name type")
+Stage = namedtuple("Stage", "name type steps rollback_steps")
+Pipeline = namedtuple("Pipeline", "name identifier stages")
+
+# The only keys the streaming parser builds; everything else (connector specs,
+# scripts, variables, ...) is skipped event by event without being constructed
+_GRAPH_KEYS = {"pipeline", "name", "identifier", "type", "stages", "stage", "spec", "execution",
+               "steps", "rollbackSteps", "step", "stepGroup", "parallel"}
+
+# Flow slide limits: stage columns per slide and steps per column before a stage continues
+STAGES_PER_SLIDE = 4
+STEPS_PER_COLUMN = 7
+
+# Drawing area below the slide title and the gap between stage columns, in inches; a column
+# also continues before it grows taller than the area
+AREA_LEFT, AREA_TOP, AREA_WIDTH, AREA_HEIGHT = 0.8, 1.4, 11.7, 5.7
+COLUMN_GAP = 0.3
+COLUMN_WIDTH = (AREA_WIDTH - COLUMN_GAP * (STAGES_PER_SLIDE - 1)) / STAGES_PER_SLIDE
+
+# file digest -> Pipeline
+_pipelines = {}
+
+class PipelineError(ValueError):
+    """Raised when a file is not a Harness pipeline definition"""
+
+def _yaml():
+    try:
+        import yaml
+    except ImportError:  # Only importing pipelines needs PyYAML
+        raise RuntimeError("PyYAML is required to import pipelines (pip install pyyaml)") from None
+    return yaml
+
+def _build(yaml, events, event):
+    """Construct the node starting at event, keeping only _GRAPH_KEYS in mappings"""
+    if isinstance(event, yaml.ScalarEvent):
+        return event.value
+    if isinstance(event, yaml.SequenceStartEvent):
+        items = []
+        item = next(events)
+        while not isinstance(item, yaml.SequenceEndEvent):
+            items.append(_build(yaml, events, item))
+            item = next(events)
+        return items
+    if isinstance(event, yaml.MappingStartEvent):
+        mapping = {}
+        key = next(events)
+        while not isinstance(key, yaml.MappingEndEvent):
+            value = next(events)
+            if isinstance(key, yaml.ScalarEvent) and key.value in _GRAPH_KEYS:
+                mapping[key.value] = _build(yaml, events, value)
+            else:
+                _skip(yaml, events, key)
+                _skip(yaml, events, value)
+            key = next(events)
+        return mapping
+    return None                             # Aliases are never part of the graph
+
+def _skip(yaml, events, event):
+    """Consume the node starting at event without constructing it"""
+    depth = int(isinstance(event, yaml.CollectionStartEvent))
+    while depth:
+        event = next(events)
+        if isinstance(event, yaml.CollectionStartEvent):
+            depth += 1
+        elif isinstance(event, yaml.CollectionEndEvent):
+            depth -= 1
+
+def _steps(items):
+    """Columns of steps from a steps list; step groups are inlined, parallel blocks share a column"""
+    columns = []
+    for item in items or []:
+        if not isinstance(item, dict):
+            continue
+        if isinstance(item.get("step"), dict):
+            step = item["step"]
+            columns.append((Step(step.get("name") or step.get("identifier", "?"), step.get("type")),))
+        elif "parallel" in item:
+            columns.append(tuple(step for column in _steps(item["parallel"]) for step in column))
+        elif isinstance(item.get("stepGroup"), dict):
+            columns.extend(_steps(item["stepGroup"].get("steps")))
+    return tuple(columns)
+
+def _stages(items):
+    stages = []
+    for item in items or []:
+        if not isinstance(item, dict):
+            continue
+        if "parallel" in item:
+            stages.extend(_stages(item["parallel"]))
+        elif isinstance(item.get("stage"), dict):
+            stage = item["stage"]
+            execution = (stage.get("spec") or {}).get("execution") or {}
+            stages.append(Stage(stage.get("name") or stage.get("identifier", "?"), stage.get("type"),
+                                _steps(execution.get("steps")), _steps(execution.get("rollbackSteps"))))
+    return tuple(stages)
+
+def parse_pipeline(source, path="<pipeline>"):
+    """Stream pipeline YAML (str or bytes) into a Pipeline graph"""
+    yaml = _yaml()
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    events = yaml.parse(source, Loader=loader)
+    document = None
+    try:
+        for event in events:
+            if isinstance(event, yaml.CollectionStartEvent):
+                document = _build(yaml, events, event)
+                break
+    except yaml.YAMLError as e:
+        raise PipelineError(f"{path}: {e}") from None
+
+    pipeline = document.get("pipeline") if isinstance(document, dict) else None
+    if not isinstance(pipeline, dict):
+        raise PipelineError(f"{path}: no top-level 'pipeline' mapping")
+    return Pipeline(pipeline.get("name") or pipeline.get("identifier", os.path.basename(path)),
+                    pipeline.get("identifier"), _stages(pipeline.get("stages")))
+
+def _from_json(data):
+    name, identifier, stages = data
+    return Pipeline(name, identifier, tuple(
+        Stage(stage_name, stage_type,
+              tuple(tuple(Step(*step) for step in column) for column in steps),
+              tuple(tuple(Step(*step) for step in column) for column in rollback_steps))
+        for stage_name, stage_type, steps, rollback_steps in stages))
+
+def load_pipeline(path, cache_dir=DEFAULT_CACHE_DIR):
+    """Pipeline graph for a YAML file, parsed at most once per distinct file content"""
+    with open(path, "rb") as f:
+        source = f.read()
+    digest = hashlib.sha256(source).hexdigest()
+
+    pipeline = _pipelines.get(digest)
+    if pipeline is not None:
+        return pipeline
+
+    cached_file = os.path.join(cache_dir, f"{digest[:32]}-v{CACHE_VERSION}.json")
+    if os.path.exists(cached_file):
+        try:
+            with open(cached_file) as f:
+                pipeline = _from_json(json.load(f))
+        except (ValueError, TypeError):  # A truncated or hand-edited cache file; parse again
+            pipeline = None
+    if pipeline is None:
+        pipeline = parse_pipeline(source, path)
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(cached_file, "w") as f:
+            json.dump(pipeline, f)
+
+    _pipelines[digest] = pipeline
+    return pipeline
+
+# =============================================================================
+# FLOW SLIDES
+# =============================================================================
+
+def _step_node(column, palette, color):
+    if len(column) == 1:
+        return layout.box(column[0].name, palette[color], font_size=11, min_height=0.42)
+    return layout.row([layout.box(step.name, palette[color], font_size=9, min_height=0.42) for step in column],
+                      gap=0.08, align="stretch")
+
+def _stage_node(number, stage, columns, continued, rollback, palette):
+    """One stage column: the stage header, its steps and, in its last column, the rollback box"""
+    title = f"{number}. {stage.name}" + (" (cont.)" if continued else "")
+    subtitle = f"{stage.type} stage" if stage.type else "Stage"
+    children = [layout.box(f"{title}\n{subtitle}", palette["DARK_BLUE"], font_size=12, min_height=0.6)]
+    for column in columns:
+        children.append(layout.arrow(0.18, palette["MEDIUM_GRAY"]))
+        children.append(_step_node(column, palette, "HARNESS_BLUE"))
+    if not columns:
+        children.append(layout.text("No steps", font_size=11, color=palette["MEDIUM_GRAY"], align="center"))
+    if rollback:
+        children.append(layout.box(f"Rollback: {rollback}", palette["ERROR_RED"], font_size=10, min_height=0.42))
+    return layout.stack(children, gap=0.06)
+
+def _fits(node):
+    return node.measure(COLUMN_WIDTH) <= AREA_HEIGHT
+
+def _stage_columns(number, stage, palette):
+    """Stage columns for one stage, each at most STEPS_PER_COLUMN steps and no taller than the area"""
+    rollback = ", ".join(step.name for column in stage.rollback_steps for step in column)
+    chunks, chunk = [], []
+    for column in stage.steps:
+        if chunk and (len(chunk) == STEPS_PER_COLUMN
+                      or not _fits(_stage_node(number, stage, chunk + [column], bool(chunks), None, palette))):
+            chunks.append(chunk)
+            chunk = []
+        chunk.append(column)
+    # The rollback box closes the last column; move steps on to a new column until it fits
+    moved = []
+    while rollback and len(chunk) > 1 and not _fits(_stage_node(number, stage, chunk, bool(chunks), rollback,
+                                                                palette)):
+        moved.insert(0, chunk.pop())
+    if moved:
+        chunks.append(chunk)
+        chunk = moved
+    chunks.append(chunk)  # A stage with no steps still gets one (empty) column
+
+    return [_stage_node(number, stage, chunk, i > 0, rollback if i == len(chunks) - 1 else None, palette)
+            for i, chunk in enumerate(chunks)]
+
+def flow_slides(pipeline, palette):
+    """[(title, slide_layout tree), ...] drawing a pipeline's stages left to right and steps top to bottom
+
+    Stages with more than STEPS_PER_COLUMN steps, or too tall for the
+    area, continue in another column; columns spill onto further slides
+    STAGES_PER_SLIDE at a time. Rollback steps close their stage's last
+    column in red. Draw each tree at AREA_LEFT, AREA_TOP, AREA_WIDTH.
+    """
+    columns = [column for number, stage in enumerate(pipeline.stages, 1)
+               for column in _stage_columns(number, stage, palette)]
+
+    pages = [columns[i:i + STAGES_PER_SLIDE] for i in range(0, len(columns), STAGES_PER_SLIDE)]
+    slides = []
+    for page_number, page in enumerate(pages, 1):
+        title = f"Pipeline: {pipeline.name}"
+        if len(pages) > 1:
+            title += f" ({page_number}/{len(pages)})"
+        # Pad short pages so columns keep the same width on every slide, and the width their height was budgeted at
+        page = page + [layout.stack([]) for _ in range(STAGES_PER_SLIDE - len(page))]
+        slides.append((title, layout.row(page, gap=COLUMN_GAP)))
+    return slides
+
+def main():
+    """Parse pipeline files into graphs and report what the memo reused"""
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Parse Harness pipeline YAML into stage/step graphs")
+    parser.add_argument("files", nargs="+", help="Pipeline YAML files")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="Directory holding cached graphs")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    loaded = 0
+    for path in args.files:
+        try:
+            pipeline = load_pipeline(path, args.cache_dir)
+        except PipelineError as e:
+            print(f"⚠️ {e}")
+            continue
+        loaded += 1
+        steps = sum(len(column) for stage in pipeline.stages for column in stage.steps)
+        print(f"✅ {path}: {pipeline.name} ({len(pipeline.stages)} stages, {steps} steps)")
+    elapsed = time.perf_counter() - start
+    print(f"✅ Loaded {loaded} files ({len(_pipelines)} distinct) in {elapsed * 1000:.0f} ms")
+
+if __name__ == "__main__":
+    main()
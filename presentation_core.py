@@ -0,0 +1,525 @@
+#!/usr/bin/env python3
+"""
+Presentation Rendering Core
+Slide helpers shared by both presentation generators
+
+python-pptx is imported on first use rather than at import time, so tools that
+only list slides or validate specs start without paying for it.
+"""
+
+import copy
+import io
+import time
+from collections import namedtuple
+from types import SimpleNamespace
+
+import connector_routing
+import icon_cache
+import text_fit
+
+# Milliseconds spent importing lazily loaded modules, by name
+IMPORT_TIMINGS = {}
+
+_api = None
+_templates = {}
+_shape_box_prototypes = {}
+
+# One styled table cell; fill=None leaves the cell transparent
+TableCell = namedtuple("TableCell", "text fill text_color font_size bold align")
+
+# Build-time text fitting for add_shape_box/add_text_box: None (off), "check" or "shrink"
+TEXT_FIT = None
+TEXT_FIT_MODES = ("check", "shrink")
+
+# Boxes whose text did not fit at the requested size, recorded while TEXT_FIT is set
+TEXT_FIT_REPORT = []
+TextFitIssue = namedtuple("TextFitIssue", "slide text font_size fit_size overflow")
+
+# icon_cache.IconCache that draws leading emoji in boxes as pictures, or None to leave them as text
+ICONS = None
+
+# export_backend.Backend the deck and shape helpers draw through instead of python-pptx, or None
+BACKEND = None
+
+class Color(tuple):
+    """RGB color value that does not need python-pptx to be imported"""
+
+    def __new__(cls, r, g, b):
+        return super().__new__(cls, (r, g, b))
+
+    def __getnewargs__(self):
+        # Pickle as Color(r, g, b), so colors reach worker processes
+        return tuple(self)
+
+    @classmethod
+    def from_string(cls, rgb_hex_str):
+        """Create a color from a hex string such as '0A66C2'"""
+        if len(rgb_hex_str) != 6:
+            raise ValueError(f"Expected 6 hex digits, got {rgb_hex_str!r}")
+        return cls(*(int(rgb_hex_str[i:i + 2], 16) for i in (0, 2, 4)))
+
+    def __str__(self):
+        return "%02X%02X%02X" % self
+
+def pptx_api():
+    """Import python-pptx on first use and return the names the helpers need"""
+    global _api
+    if _api is None:
+        start = time.perf_counter()
+        import pptx
+        from pptx import Presentation
+        from pptx.dml.color import RGBColor
+        from pptx.enum.shapes import MSO_SHAPE
+        from pptx.enum.text import MSO_VERTICAL_ANCHOR, PP_ALIGN
+        from pptx.oxml import parse_xml
+        from pptx.util import Inches, Pt
+
+        _api = SimpleNamespace(
+            version=pptx.__version__,
+            Presentation=Presentation,
+            RGBColor=RGBColor,
+            MSO_SHAPE=MSO_SHAPE,
+            MSO_VERTICAL_ANCHOR=MSO_VERTICAL_ANCHOR,
+            PP_ALIGN=PP_ALIGN,
+            parse_xml=parse_xml,
+            Inches=Inches,
+            Pt=Pt,
+        )
+        IMPORT_TIMINGS["pptx"] = round((time.perf_counter() - start) * 1000, 3)
+    return _api
+
+class _LazyEnum:
+    """Stand-in for a python-pptx enum that imports python-pptx when a member is used
+
+    While a BACKEND is set, members stand for their names instead, so
+    exports never import python-pptx.
+    """
+
+    def __init__(self, name):
+        self._name = name
+
+    def __getattr__(self, member):
+        if BACKEND is not None:
+            return member
+        return getattr(getattr(pptx_api(), self._name), member)
+
+PP_ALIGN = _LazyEnum("PP_ALIGN")
+
+def rgb(color):
+    """Convert a Color to the python-pptx RGBColor it stands for"""
+    return pptx_api().RGBColor(*color)
+
+def _alignment(align):
+    """Accept a PP_ALIGN member or its name ('center', 'LEFT', ...)"""
+    if isinstance(align, str):
+        return getattr(pptx_api().PP_ALIGN, align.upper())
+    return align
+
+def set_text_fit(mode):
+    """Turn build-time text fitting off (None), on for reporting ("check") or on for resizing ("shrink")"""
+    global TEXT_FIT
+    if mode is not None and mode not in TEXT_FIT_MODES:
+        raise ValueError(f"Unknown text fit mode: {mode}")
+    TEXT_FIT = mode
+    TEXT_FIT_REPORT.clear()
+
+def _fit_font_size(slide, width, height, text, font_size, bold):
+    """Return the font size to draw a box's text at under the current TEXT_FIT mode"""
+    if TEXT_FIT is None:
+        return font_size
+    fit = text_fit.fit_text(text, width, height, font_size, bold)
+    if fit.font_size == font_size:
+        return font_size
+    TEXT_FIT_REPORT.append(TextFitIssue(str(slide.part.partname), text, font_size, fit.font_size, fit.overflow))
+    return fit.font_size if TEXT_FIT == "shrink" else font_size
+
+def set_backend(backend):
+    """Draw decks through an export_backend.Backend instead of python-pptx, or through python-pptx again (None)"""
+    global BACKEND
+    BACKEND = backend
+
+def set_icons(cache):
+    """Draw the emoji that start box text as cached pictures (an IconCache), or keep them as text (None)"""
+    global ICONS
+    ICONS = cache
+
+def _split_icon(text):
+    """Return (icon, emoji count, text) with a leading icon swapped for em spaces while ICONS is set"""
+    if ICONS is None:
+        return "", 0, text
+    icon, count, rest = icon_cache.split_icon(text)
+    return icon, count, icon_cache.ICON_SPACE * count + rest
+
+def _add_icon(slide, icon, count, left, top, width, height, text, font_size, bold, align, middle):
+    """Draw an icon picture over the em spaces starting a box's first line
+
+    The position follows the text-fit engine's line breaks and the frame's
+    insets; identical rasters share one image part across the deck.
+    """
+    api = pptx_api()
+    em = font_size / 72
+    lines = text_fit.text_lines(text, width, font_size, bold)
+    line_width = text_fit.font_metrics(bold=bold).width(lines[0]) * em
+
+    x = left + text_fit.INSET_X
+    free = width - 2 * text_fit.INSET_X - line_width
+    if align == api.PP_ALIGN.CENTER:
+        x += free / 2
+    elif align == api.PP_ALIGN.RIGHT:
+        x += free
+    text_height = len(lines) * em * text_fit.LINE_SPACING
+    y = top + (height - text_height) / 2 if middle else top + text_fit.INSET_Y
+    y += em * (text_fit.LINE_SPACING - 1) / 2
+
+    return slide.shapes.add_picture(io.BytesIO(ICONS.png(icon, count)), api.Inches(x), api.Inches(y),
+                                    api.Inches(em * count), api.Inches(em))
+
+# =============================================================================
+# DECKS
+# =============================================================================
+
+def new_presentation(width, height):
+    """Create an empty presentation of the given size (inches) from a warm copy of the default template"""
+    if BACKEND is not None:
+        return BACKEND.new_presentation(width, height)
+    template = _templates.get((width, height))
+    if template is None:
+        api = pptx_api()
+        template = api.Presentation()
+        template.slide_width = api.Inches(width)
+        template.slide_height = api.Inches(height)
+        _templates[(width, height)] = template
+    return copy.deepcopy(template)
+
+def blank_slide(prs):
+    """Add a slide using the blank layout"""
+    if BACKEND is not None:
+        return BACKEND.blank_slide(prs)
+    return prs.slides.add_slide(prs.slide_layouts[6])
+
+def drop_slide(prs, slide_index):
+    """Remove a slide from a deck so its part can be released"""
+    sldIdLst = prs.slides._sldIdLst
+    sldId = sldIdLst[slide_index]
+    prs.part.drop_rel(sldId.rId)
+    sldIdLst.remove(sldId)
+
+def slide_indices(builders, slides=None):
+    """Resolve a slide selection (builder names or 1-based numbers) to indices into builders"""
+    if slides is None:
+        return list(range(len(builders)))
+
+    names = [build_slide.__name__ for build_slide in builders]
+    indices = []
+    for slide in slides:
+        if isinstance(slide, int):
+            if not 1 <= slide <= len(builders):
+                raise ValueError(f"Slide number out of range: {slide}")
+            indices.append(slide - 1)
+        elif slide in names:
+            indices.append(names.index(slide))
+        else:
+            raise ValueError(f"Unknown slide: {slide}")
+    return indices
+
+# =============================================================================
+# SHAPE HELPERS
+# =============================================================================
+
+def set_background(slide, color):
+    """Fill a slide's background with a solid color"""
+    if BACKEND is not None:
+        return BACKEND.set_background(slide, color)
+    fill = slide.background.fill
+    fill.solid()
+    fill.fore_color.rgb = rgb(color)
+
+def add_title(slide, text, width, font_size, color, word_wrap=None):
+    """Add a bold title text box across the top of a slide"""
+    if BACKEND is not None:
+        return BACKEND.add_title(slide, text, width, font_size, color, word_wrap)
+    api = pptx_api()
+    title_box = slide.shapes.add_textbox(api.Inches(0.5), api.Inches(0.3), api.Inches(width), api.Inches(0.8))
+    title_frame = title_box.text_frame
+    if word_wrap is not None:
+        title_frame.word_wrap = word_wrap
+    p = title_frame.paragraphs[0]
+    p.text = text
+    p.font.size = api.Pt(font_size)
+    p.font.bold = True
+    p.font.color.rgb = rgb(color)
+    return title_box
+
+def add_text_box(slide, left, top, width, height, text, font_size, bold, color, align=None):
+    """Add a word-wrapped text box; align=None leaves the alignment unset"""
+    if BACKEND is not None:
+        return BACKEND.add_text_box(slide, left, top, width, height, text, font_size, bold, color, align)
+    api = pptx_api()
+    icon, count, text = _split_icon(text)
+    font_size = _fit_font_size(slide, width, height, text, font_size, bold)
+    box = slide.shapes.add_textbox(api.Inches(left), api.Inches(top), api.Inches(width), api.Inches(height))
+    frame = box.text_frame
+    frame.word_wrap = True
+    p = frame.paragraphs[0]
+    p.text = text
+    p.font.size = api.Pt(font_size)
+    p.font.bold = bold
+    p.font.color.rgb = rgb(color)
+    if align is not None:
+        p.alignment = _alignment(align)
+    if icon:
+        _add_icon(slide, icon, count, left, top, width, height, text, font_size, bold,
+                  _alignment(align), middle=False)
+    return box
+
+def _shape_box_prototype(bg_color, text_color, font_size, bold, middle):
+    """Return the cached, fully styled rounded rectangle for one shape box style"""
+    key = (str(bg_color), str(text_color), font_size, bold, middle)
+    prototype = _shape_box_prototypes.get(key)
+    if prototype is None:
+        api = pptx_api()
+        slide = blank_slide(new_presentation(10, 7.5))
+        shape = slide.shapes.add_shape(api.MSO_SHAPE.ROUNDED_RECTANGLE, 0, 0, 0, 0)
+        shape.fill.solid()
+        shape.fill.fore_color.rgb = rgb(bg_color)
+        shape.line.color.rgb = rgb(bg_color)
+
+        frame = shape.text_frame
+        frame.word_wrap = True
+        if middle:
+            frame.vertical_anchor = api.MSO_VERTICAL_ANCHOR.MIDDLE
+        p = frame.paragraphs[0]
+        p.font.size = api.Pt(font_size)
+        p.font.bold = bold
+        p.font.color.rgb = rgb(text_color)
+        p.alignment = api.PP_ALIGN.CENTER
+
+        prototype = shape._element
+        prototype.getparent().remove(prototype)
+        _shape_box_prototypes[key] = prototype
+    return prototype
+
+def add_shape_box(slide, left, top, width, height, text, bg_color, text_color, font_size, bold,
+                  middle=True, paragraph_per_line=False):
+    """Add a rounded rectangle filled with bg_color and centered text
+
+    Deep-copies a cached prototype of the styled shape and patches only its
+    id, name, geometry and text. With paragraph_per_line, each line of text
+    becomes its own (unstyled after the first) paragraph instead of a line
+    break, matching text_frame.text assignment. While ICONS is set, a leading
+    emoji is drawn as a shared picture instead of text.
+    """
+    if BACKEND is not None:
+        return BACKEND.add_shape_box(slide, left, top, width, height, text, bg_color, text_color, font_size, bold,
+                                     middle, paragraph_per_line)
+    api = pptx_api()
+    icon, count, text = _split_icon(text)
+    font_size = _fit_font_size(slide, width, height, text, font_size, bold)
+    sp = copy.deepcopy(_shape_box_prototype(bg_color, text_color, font_size, bold, middle))
+
+    shapes = slide.shapes
+    shape_id = shapes._next_shape_id
+    nv_pr, sp_pr, tx_body = sp[0], sp[1], sp[3]
+    nv_pr[0].set("id", str(shape_id))
+    nv_pr[0].set("name", f"Rounded Rectangle {shape_id - 1}")
+    off, ext = sp_pr[0]
+    off.set("x", str(api.Inches(left)))
+    off.set("y", str(api.Inches(top)))
+    ext.set("cx", str(api.Inches(width)))
+    ext.set("cy", str(api.Inches(height)))
+
+    if paragraph_per_line:
+        first, *rest = text.split("\n")
+        tx_body[2].append_text(first)
+        for line in rest:
+            tx_body.add_p().append_text(line)
+    else:
+        tx_body[2].append_text(text)
+
+    shapes._spTree.insert_element_before(sp, "p:extLst")
+    shape = shapes._shape_factory(sp)
+    if icon:
+        _add_icon(slide, icon, count, left, top, width, height, text, font_size, bold,
+                  api.PP_ALIGN.CENTER, middle)
+    return shape
+
+_EMU_PER_INCH = 914400
+_DRAWINGML = "{http://schemas.openxmlformats.org/drawingml/2006/main}"
+
+def _add_arrowhead(connector):
+    """Put a triangle head on the end of a connector's line"""
+    ln = connector.line._get_or_add_ln()
+    head = ln.makeelement(_DRAWINGML + "tailEnd", {"type": "triangle"})
+    ln.append(head)
+
+def add_arrow(slide, x1, y1, x2, y2, color, width, head=False):
+    """Add a straight connector of the given color and width (points); head adds an arrowhead at (x2, y2)"""
+    if BACKEND is not None:
+        return BACKEND.add_arrow(slide, x1, y1, x2, y2, color, width, head)
+    api = pptx_api()
+    connector = slide.shapes.add_connector(
+        1,  # Straight connector
+        api.Inches(x1), api.Inches(y1), api.Inches(x2), api.Inches(y2)
+    )
+    connector.line.color.rgb = rgb(color)
+    connector.line.width = api.Pt(width)
+    if head:
+        _add_arrowhead(connector)
+    return connector
+
+def _element_rect(element):
+    """(left, top, width, height) in inches from a shape element's own xfrm, or None when it inherits one
+
+    Read straight from the XML: building python-pptx shape proxies for every
+    shape on the slide cost more than routing the connector.
+    """
+    off = next(element.iter(_DRAWINGML + "off"), None)
+    if off is None:
+        return None
+    ext = off.getparent().find(_DRAWINGML + "ext")
+    return (int(off.get("x")) / _EMU_PER_INCH, int(off.get("y")) / _EMU_PER_INCH,
+            int(ext.get("cx")) / _EMU_PER_INCH, int(ext.get("cy")) / _EMU_PER_INCH)
+
+def add_routed_arrow(slide, source, target, color, width):
+    """Add an elbow connector glued to source and target, routed around the slide's other shapes
+
+    Every shape already on the slide is an obstacle except connectors and
+    panels behind either end. The route is drawn with the preset elbow that
+    has its number of bends, and both ends are glued to connection sites so the
+    connector follows the boxes when they are moved in PowerPoint. Falls back
+    to a straight connector between the nearest sites when no route exists.
+    Returns the drawn path's points in inches, for placing a label along it.
+    """
+    if BACKEND is not None:
+        return BACKEND.add_routed_arrow(slide, source, target, color, width)
+    api = pptx_api()
+    source_element, target_element = source._element, target._element
+    source_rect, target_rect = _element_rect(source_element), _element_rect(target_element)
+    obstacles = []
+    source_index = target_index = None
+    for element in slide.shapes._spTree.iter_shape_elms():
+        rect = _element_rect(element)
+        if element is source_element:
+            source_index = len(obstacles)
+        elif element is target_element:
+            target_index = len(obstacles)
+        elif rect is None or element.tag.endswith("}cxnSp"):
+            continue
+        elif connector_routing.contains(rect, source_rect) or connector_routing.contains(rect, target_rect):
+            continue
+        obstacles.append(rect)
+    if source_index is None or target_index is None:
+        missing = "source" if source_index is None else "target"
+        raise ValueError(f"add_routed_arrow: the {missing} shape is not on this slide")
+
+    route = connector_routing.route(obstacles, source_index, target_index)
+    if route is None:
+        source_site, target_site = connector_routing.nearest_sites(source_rect, target_rect)
+        points = [connector_routing.site_point(source_rect, source_site),
+                  connector_routing.site_point(target_rect, target_site)]
+    else:
+        source_site, target_site, points = route
+
+    connector = slide.shapes.add_connector(1, 0, 0, 0, 0)  # Straight connector
+    connector.begin_connect(source, source_site)
+    connector.end_connect(target, target_site)
+
+    if len(points) > 2:
+        geometry = connector_routing.connector_geometry(points)
+        sp_pr = connector._element.spPr
+        xfrm = sp_pr.xfrm
+        xfrm.x, xfrm.y = api.Inches(geometry.left), api.Inches(geometry.top)
+        xfrm.cx, xfrm.cy = api.Inches(geometry.width), api.Inches(geometry.height)
+        xfrm.rot = geometry.rotation
+        xfrm.flipH = geometry.flip_h
+        xfrm.flipV = geometry.flip_v
+        sp_pr.prstGeom.set("prst", geometry.preset)
+        sp_pr.prstGeom.rewrite_guides([(f"adj{i}", value) for i, value in enumerate(geometry.adjustments, 1)])
+
+    connector.line.color.rgb = rgb(color)
+    connector.line.width = api.Pt(width)
+    return points
+
+def add_glued_arrow(slide, source, target, color, width):
+    """Add a straight arrow from source to target between their nearest connection sites, glued to both"""
+    if BACKEND is not None:
+        return BACKEND.add_glued_arrow(slide, source, target, color, width)
+    api = pptx_api()
+    source_site, target_site = connector_routing.nearest_sites(_element_rect(source._element),
+                                                               _element_rect(target._element))
+    connector = slide.shapes.add_connector(1, 0, 0, 0, 0)  # Straight connector
+    connector.begin_connect(source, source_site)
+    connector.end_connect(target, target_site)
+    connector.line.color.rgb = rgb(color)
+    connector.line.width = api.Pt(width)
+    _add_arrowhead(connector)
+    return connector
+
+def add_bullet_list(slide, left, top, width, height, items, font_size, color,
+                    space_before, space_after=None, indent_level=0):
+    """Add one paragraph per item; indent_level is an int or {item index: level}"""
+    if BACKEND is not None:
+        return BACKEND.add_bullet_list(slide, left, top, width, height, items, font_size, color,
+                                       space_before, space_after, indent_level)
+    api = pptx_api()
+    box = slide.shapes.add_textbox(api.Inches(left), api.Inches(top), api.Inches(width), api.Inches(height))
+    frame = box.text_frame
+    frame.word_wrap = True
+
+    for i, item in enumerate(items):
+        if i == 0:
+            p = frame.paragraphs[0]
+        else:
+            p = frame.add_paragraph()
+
+        p.text = item
+        p.level = indent_level if isinstance(indent_level, int) else indent_level.get(i, 0)
+        p.font.size = api.Pt(font_size)
+        p.font.color.rgb = rgb(color)
+        p.space_before = api.Pt(space_before)
+        if space_after is not None:
+            p.space_after = api.Pt(space_after)
+
+    return box
+
+def add_table(slide, left, top, col_widths, rows):
+    """Add a single table shape; rows are (height, [TableCell, ...]) pairs
+
+    Replaces grids of individual boxes and text boxes with one graphicFrame,
+    styled per cell, with the built-in header and banding effects turned off.
+    """
+    if BACKEND is not None:
+        return BACKEND.add_table(slide, left, top, col_widths, rows)
+    api = pptx_api()
+    width = sum(api.Inches(col_width) for col_width in col_widths)
+    height = sum(api.Inches(row_height) for row_height, _ in rows)
+    frame = slide.shapes.add_table(len(rows), len(col_widths), api.Inches(left), api.Inches(top), width, height)
+
+    table = frame.table
+    table.first_row = False
+    table.horz_banding = False
+    for column, col_width in zip(table.columns, col_widths):
+        column.width = api.Inches(col_width)
+
+    for row, (row_height, cells) in zip(table.rows, rows):
+        row.height = api.Inches(row_height)
+        if len(cells) != len(col_widths):
+            raise ValueError(f"Expected {len(col_widths)} cells per row, got {len(cells)}")
+        for cell, spec in zip(row.cells, cells):
+            if spec.fill is None:
+                cell.fill.background()
+            else:
+                cell.fill.solid()
+                cell.fill.fore_color.rgb = rgb(spec.fill)
+            cell.vertical_anchor = api.MSO_VERTICAL_ANCHOR.MIDDLE
+
+            frame_text = cell.text_frame
+            frame_text.word_wrap = True
+            p = frame_text.paragraphs[0]
+            p.text = spec.text
+            p.font.size = api.Pt(spec.font_size)
+            p.font.bold = spec.bold
+            p.font.color.rgb = rgb(spec.text_color)
+            p.alignment = _alignment(spec.align)
+
+    return frame
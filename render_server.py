@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Render Server
+A long-running deck build service: worker processes import the generators
+and build the default decks once at startup, then build decks requested
+over a local HTTP API (TCP or a Unix socket) and return the .pptx bytes, so a
+request pays only for rendering its slides
+"""
+
+import asyncio
+import importlib
+import io
+import json
+import os
+import signal
+import tempfile
+import time
+from http import HTTPStatus
+
+from build_deck_batch import GENERATORS, deck_variant
+
+DEFAULT_HOST, DEFAULT_PORT = "127.0.0.1", 8765
+
+PPTX_TYPE = "application/vnd.openxmlformats-officedocument.presentationml.presentation"
+
+# Requests waiting for or holding a worker; further ones are turned away with 503
+MAX_PENDING = 64
+
+# Largest request body accepted, in bytes
+MAX_BODY = 1024 * 1024
+
+# Request keys, as in a build_deck_batch manifest variant -> (JSON type, type of its items or values, description)
+REQUEST_KEYS = {
+    "generator": (str, None, "a string"),
+    "customer": (str, None, "a string"),
+    "footer_year": (int, None, "an integer"),
+    "palette": (dict, str, "an object of hex color strings"),
+    "slides": (list, (int, str), "a list of slide numbers and builder names"),
+    "pipelines": (list, str, "a list of file paths"),
+    "inventories": (list, str, "a list of inventory paths"),
+    "embed_fonts": (list, str, "a list of font file paths"),
+}
+
+class RequestError(ValueError):
+    """Raised for a request the server cannot build; carries the HTTP status to answer with"""
+
+    def __init__(self, message, status=HTTPStatus.BAD_REQUEST):
+        super().__init__(message)
+        self.status = status
+
+# =============================================================================
+# WORKERS
+# =============================================================================
+
+def warm_worker(text_fit=None):
+    """Import every generator and build its default deck once, in each worker process
+
+    The throwaway build fills the template, font metric and text fit caches,
+    so a worker's first real request is as fast as its later ones.
+    """
+    import presentation_core as core
+
+    core.set_text_fit(text_fit)
+    for module_name in GENERATORS.values():
+        generator = importlib.import_module(module_name)
+        generator.create_presentation().save(io.BytesIO())
+
+def worker_ready():
+    return os.getpid()
+
+def build_deck_bytes(request):
+    """Build the deck a request describes and return it as .pptx bytes"""
+    import presentation_core as core
+
+    # Nothing reads a worker's --fit issues; drop the last build's so they do not pile up
+    core.TEXT_FIT_REPORT.clear()
+    generator = importlib.import_module(GENERATORS[request.get("generator", "professional")])
+    generated = {key: request[key] for key in ("pipelines", "inventories") if request.get(key)}
+    with deck_variant(generator, request):
+        prs = generator.create_presentation(slides=request.get("slides"), **generated)
+
+    if not request.get("embed_fonts"):
+        buffer = io.BytesIO()
+        prs.save(buffer)
+        return buffer.getvalue()
+
+    import font_embed
+
+    # Font embedding rewrites a saved file in place
+    with tempfile.TemporaryDirectory() as scratch:
+        path = os.path.join(scratch, "deck.pptx")
+        prs.save(path)
+        font_embed.embed_fonts(path, request["embed_fonts"])
+        with open(path, "rb") as f:
+            return f.read()
+
+def _is_a(value, expected):
+    # JSON true and false are not numbers here
+    return isinstance(value, expected) and not isinstance(value, bool)
+
+def parse_request(body):
+    """Validate a JSON build request; {} builds the full default deck"""
+    try:
+        request = json.loads(body or b"{}")
+    except ValueError as e:
+        raise RequestError(f"Request body is not JSON: {e}") from None
+    if not isinstance(request, dict):
+        raise RequestError("Request body must be a JSON object")
+    unknown = sorted(set(request) - set(REQUEST_KEYS))
+    if unknown:
+        raise RequestError(f"Unknown request keys: {', '.join(unknown)}")
+    for key, value in request.items():
+        expected, item_type, description = REQUEST_KEYS[key]
+        items = value.values() if isinstance(value, dict) else value if isinstance(value, list) else ()
+        if not _is_a(value, expected) or item_type and not all(_is_a(item, item_type) for item in items):
+            raise RequestError(f"{key} must be {description}")
+    if request.get("generator", "professional") not in GENERATORS:
+        raise RequestError(f"Unknown generator: {request['generator']} (choose from {', '.join(GENERATORS)})")
+    if request.get("generator", "professional") != "professional" and (
+            request.get("pipelines") or request.get("inventories")):
+        raise RequestError("pipelines and inventories need the professional generator")
+    return request
+
+# =============================================================================
+# HTTP SERVER
+# =============================================================================
+
+def http_response(status, body=b"", content_type="application/json", headers=()):
+    """Bytes of a complete HTTP/1.1 response that closes the connection"""
+    status = HTTPStatus(status)
+    lines = [f"HTTP/1.1 {status.value} {status.phrase}", f"Content-Type: {content_type}",
+             f"Content-Length: {len(body)}", "Connection: close", *headers]
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body
+
+def _json(status, data):
+    return http_response(status, json.dumps(data).encode() + b"\n")
+
+async def read_request(reader):
+    """(method, path, body) of one HTTP request"""
+    request_line = await reader.readline()
+    try:
+        method, target, _ = request_line.decode("latin-1").split(" ", 2)
+    except ValueError:
+        raise RequestError("Malformed request line") from None
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    try:
+        length = int(headers.get("content-length", 0))
+    except ValueError:
+        raise RequestError("Malformed Content-Length") from None
+    if length > MAX_BODY:
+        raise RequestError(f"Request body over {MAX_BODY} bytes", HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+    body = await reader.readexactly(length) if length else b""
+    return method.upper(), target.split("?", 1)[0], body
+
+class RenderServer:
+    """Serves POST /deck (JSON request -> .pptx bytes) and GET /health from a pool of warm workers"""
+
+    def __init__(self, workers, text_fit=None):
+        self.workers = workers
+        self.text_fit = text_fit
+        self.pool = self.new_pool()
+        self.pending = 0
+        self.built = 0
+        self.started = time.time()
+
+    def new_pool(self):
+        from concurrent.futures import ProcessPoolExecutor
+
+        return ProcessPoolExecutor(max_workers=self.workers, initializer=warm_worker, initargs=(self.text_fit,))
+
+    async def warm(self):
+        """Start every worker now, so the first requests do not pay for imports"""
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self.pool, worker_ready) for _ in range(self.workers)))
+
+    async def build(self, request):
+        if self.pending >= MAX_PENDING:
+            raise RequestError("Too many queued builds; retry later", HTTPStatus.SERVICE_UNAVAILABLE)
+        from concurrent.futures.process import BrokenProcessPool
+
+        self.pending += 1
+        pool = self.pool
+        try:
+            return await asyncio.get_running_loop().run_in_executor(pool, build_deck_bytes, request)
+        except BrokenProcessPool:
+            # A worker died (killed, out of memory, ...); start a fresh pool so later requests are served
+            if self.pool is pool:
+                self.pool = self.new_pool()
+                pool.shutdown(wait=False)
+            raise RequestError("A build worker crashed; the pool was restarted, retry the request",
+                               HTTPStatus.SERVICE_UNAVAILABLE) from None
+        finally:
+            self.pending -= 1
+
+    async def respond(self, method, path, body):
+        if path == "/health":
+            if method != "GET":
+                return _json(HTTPStatus.METHOD_NOT_ALLOWED, {"error": "Use GET /health"})
+            return _json(HTTPStatus.OK, {"status": "ok", "workers": self.workers, "pending": self.pending,
+                                         "built": self.built, "uptime": round(time.time() - self.started, 1)})
+        if path != "/deck":
+            return _json(HTTPStatus.NOT_FOUND, {"error": f"No route {path}; use POST /deck or GET /health"})
+        if method != "POST":
+            return _json(HTTPStatus.METHOD_NOT_ALLOWED, {"error": "Use POST /deck"})
+
+        request = parse_request(body)
+        start = time.perf_counter()
+        try:
+            deck = await self.build(request)
+        except RequestError:
+            raise
+        except (KeyError, TypeError, ValueError, IndexError, OSError) as e:
+            # Bad slide numbers, palette names, missing pipeline files, ...
+            raise RequestError(f"{type(e).__name__}: {e}") from None
+        self.built += 1
+        elapsed = time.perf_counter() - start
+        return http_response(HTTPStatus.OK, deck, PPTX_TYPE, [f"X-Render-Seconds: {elapsed:.3f}"])
+
+    async def handle(self, reader, writer):
+        try:
+            try:
+                response = await self.respond(*await read_request(reader))
+            except RequestError as e:
+                response = _json(e.status, {"error": str(e)})
+            except asyncio.IncompleteReadError:
+                return
+            except Exception as e:  # Keep serving whatever one build does
+                response = _json(HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"{type(e).__name__}: {e}"})
+            writer.write(response)
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def serve(self, host=DEFAULT_HOST, port=DEFAULT_PORT, socket_path=None):
+        await self.warm()
+        if socket_path:
+            if os.path.exists(socket_path):
+                os.remove(socket_path)
+            server = await asyncio.start_unix_server(self.handle, path=socket_path)
+            address = f"unix:{socket_path}"
+        else:
+            server = await asyncio.start_server(self.handle, host, port)
+            address = f"http://{host}:{port}"
+        print(f"✅ Render server listening on {address} ({self.workers} warm workers)")
+        async with server:
+            await server.serve_forever()
+
+def main():
+    """Run the render server until interrupted"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Serve deck builds from warm worker processes over a local HTTP API",
+        epilog="Example: curl --data '{\"slides\": [1, 2]}' http://127.0.0.1:8765/deck -o deck.pptx")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="Address to listen on")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="TCP port to listen on")
+    parser.add_argument("--socket", metavar="PATH", help="Listen on a Unix socket instead of TCP")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1,
+                        help="Worker processes building decks in parallel")
+    parser.add_argument("--fit", choices=("shrink",),
+                        help="Shrink fonts so every box's text fits, in every build")
+    args = parser.parse_args()
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    # Stop on SIGTERM (service managers, kill) the same way as on Ctrl+C
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    server = RenderServer(args.workers, args.fit)
+    try:
+        asyncio.run(server.serve(args.host, args.port, args.socket))
+    except KeyboardInterrupt:
+        print("✅ Render server stopped")
+    finally:
+        server.pool.shutdown(cancel_futures=True)
+        if args.socket and os.path.exists(args.socket):
+            os.remove(args.socket)
+
+if __name__ == "__main__":
+    main()
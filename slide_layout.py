@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Slide Layout Manager
+Solves rows, stacks and grids of shape boxes, text boxes and bullet lists into
+absolute positions in one pass, sizing text to its content with the text-fit engine
+"""
+
+import math
+from collections import namedtuple
+
+import text_fit
+
+# One solved draw call: rect is (left, top, width, height) in inches, or
+# (x1, y1, x2, y2) for arrows; content is the text or bullet items
+Placed = namedtuple("Placed", "op rect content style")
+
+# (layout key, left, top, width) -> ([rect, ...], bottom)
+_solved = {}
+
+class Leaf:
+    """One draw call whose position, and height unless given, come from the layout
+
+    style holds the helper's keyword arguments (colors, font size, ...); only
+    the entries that change the measured size take part in the memo key, so
+    tenant variants that recolor a slide reuse its solved layout.
+    """
+
+    def __init__(self, op, content, width=None, height=None, min_height=0, flex=1, spacing=0, **style):
+        self.op = op
+        self.content = content
+        self.width = width
+        self.height = height
+        self.min_height = min_height
+        self.flex = flex
+        self.spacing = spacing          # Points between bullet paragraphs, for measuring only
+        self.style = style
+
+    def key(self):
+        content = tuple(self.content) if isinstance(self.content, list) else self.content
+        return (self.op, content, self.width, self.height, self.min_height, self.flex, self.spacing,
+                self.style.get("font_size"), self.style.get("bold"))
+
+    def measure(self, width):
+        """Height in inches at the given width: the fixed height, or the wrapped text's height"""
+        if self.height is not None:
+            return self.height
+        font_size = self.style["font_size"]
+        bold = self.style.get("bold", False)
+        paragraphs = self.content if isinstance(self.content, list) else [self.content]
+
+        points = 0
+        for paragraph in paragraphs:
+            lines = len(text_fit.text_lines(paragraph, width, font_size, bold))
+            points += lines * font_size * text_fit.LINE_SPACING + self.spacing
+        height = points / 72 + 2 * text_fit.INSET_Y
+        return max(self.min_height, math.ceil(height * 100 - 1e-6) / 100)
+
+    def place(self, left, top, width, height, rects):
+        if self.op == "arrow":
+            center = left + width / 2
+            rects.append((center, top, center, top + height))
+        else:
+            rects.append((left, top, width, height))
+
+    def leaves(self):
+        yield self
+
+class _Container:
+    def __init__(self, children, gap, align, width, flex):
+        self.children = list(children)
+        self.gap = gap
+        self.align = align
+        self.width = width
+        self.height = None
+        self.flex = flex
+        self._measured = {}
+
+    def key(self):
+        return (type(self).__name__, self.gap, self.align, self.width, self.flex,
+                tuple(child.key() for child in self.children))
+
+    def measure(self, width):
+        height = self._measured.get(width)
+        if height is None:
+            height = self._measured[width] = self._measure(width)
+        return height
+
+    def leaves(self):
+        for child in self.children:
+            yield from child.leaves()
+
+class Stack(_Container):
+    """Children top to bottom, each as wide as the stack unless it has its own width"""
+
+    ALIGNMENTS = ("stretch", "left", "center", "right")
+
+    def _measure(self, width):
+        heights = [child.measure(child.width or width) for child in self.children]
+        return sum(heights) + self.gap * max(len(heights) - 1, 0)
+
+    def place(self, left, top, width, height, rects):
+        y = top
+        for child in self.children:
+            child_width = child.width or width
+            x = left
+            if self.align == "center":
+                x += (width - child_width) / 2
+            elif self.align == "right":
+                x += width - child_width
+            child_height = child.measure(child_width)
+            child.place(x, y, child_width, child_height, rects)
+            y += child_height + self.gap
+
+class Row(_Container):
+    """Children left to right; fixed widths first, the rest shared by flex weight"""
+
+    ALIGNMENTS = ("stretch", "top", "middle", "bottom")
+
+    def widths(self, width):
+        fixed = sum(child.width for child in self.children if child.width is not None)
+        flexible = [child.flex for child in self.children if child.width is None]
+        free = width - fixed - self.gap * max(len(self.children) - 1, 0)
+        share = free / sum(flexible) if flexible else 0
+        return [child.width if child.width is not None else share * child.flex for child in self.children]
+
+    def _measure(self, width):
+        return max((child.measure(w) for child, w in zip(self.children, self.widths(width))), default=0)
+
+    def place(self, left, top, width, height, rects):
+        x = left
+        for child, child_width in zip(self.children, self.widths(width)):
+            child_height = height if self.align == "stretch" else child.measure(child_width)
+            y = top
+            if self.align == "middle":
+                y += (height - child_height) / 2
+            elif self.align == "bottom":
+                y += height - child_height
+            child.place(x, y, child_width, child_height, rects)
+            x += child_width + self.gap
+
+def box(text, bg_color, text_color=None, font_size=14, bold=True, **layout):
+    """A rounded shape box (add_shape_box)"""
+    return Leaf("box", text, bg_color=bg_color, text_color=text_color, font_size=font_size, bold=bold, **layout)
+
+def text(content, font_size=16, bold=False, color=None, align=None, **layout):
+    """A word-wrapped text box (add_text_box)"""
+    return Leaf("text", content, font_size=font_size, bold=bold, color=color, align=align, **layout)
+
+def bullets(items, font_size=16, spacing=12, **layout):
+    """A bullet list (add_bullet_list); spacing is the paragraph spacing the helper adds, in points"""
+    return Leaf("bullets", list(items), font_size=font_size, spacing=spacing, **layout)
+
+def arrow(height, color=None, **layout):
+    """A vertical arrow down the middle of its slot (add_arrow)"""
+    return Leaf("arrow", None, height=height, color=color, **layout)
+
+def _container(cls, children, gap, align, width, flex):
+    if align not in cls.ALIGNMENTS:
+        raise ValueError(f"{cls.__name__} align must be one of {cls.ALIGNMENTS}, got {align!r}")
+    return cls(children, gap, align, width, flex)
+
+def stack(children, gap=0, align="stretch", width=None, flex=1):
+    """Lay children out top to bottom with gap inches between them"""
+    return _container(Stack, children, gap, align, width, flex)
+
+def row(children, gap=0, align="top", width=None, flex=1):
+    """Lay children out left to right with gap inches between them"""
+    return _container(Row, children, gap, align, width, flex)
+
+def grid(children, columns, gap=0, row_gap=None, align="stretch"):
+    """Lay children out in rows of equal-width columns; cells in a row share its height"""
+    rows = []
+    for i in range(0, len(children), columns):
+        cells = list(children[i:i + columns])
+        # Pad a short last row with empty cells so its columns line up with the full rows above
+        cells += [stack([]) for _ in range(columns - len(cells))]
+        rows.append(row(cells, gap=gap, align=align))
+    return stack(rows, gap=gap if row_gap is None else row_gap)
+
+def solve(root, left, top, width):
+    """Position every leaf of a layout; returns ([Placed, ...], bottom edge in inches)
+
+    Solved geometry is memoized on the layout's structure, text and sizes, so
+    rebuilding the same slide (for another tenant, say) skips the solve.
+    """
+    key = (root.key(), left, top, width)
+    solved = _solved.get(key)
+    if solved is None:
+        rects = []
+        height = root.measure(width)
+        root.place(left, top, width, height, rects)
+        solved = _solved[key] = (rects, top + height)
+
+    rects, bottom = solved
+    placed = [Placed(leaf.op, rect, leaf.content, {k: v for k, v in leaf.style.items() if v is not None})
+              for leaf, rect in zip(root.leaves(), rects)]
+    return placed, bottom
@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+Declarative Slide Specs
+Compiles YAML/JSON slide specs into flat, pre-validated draw lists
+"""
+
+import hashlib
+import json
+import os
+
+from presentation_core import Color, TableCell
+
+# Spec alignment -> PP_ALIGN member name, resolved by the renderer
+ALIGNMENTS = {
+    "left": "LEFT",
+    "center": "CENTER",
+    "right": "RIGHT",
+}
+
+# Element type -> (required keys, {optional key: default})
+# Color defaults name palette entries and are resolved at compile time.
+ELEMENT_FIELDS = {
+    "box": (("w", "h", "text", "color"),
+            {"text_color": "WHITE", "font_size": 14, "bold": True}),
+    "text": (("w", "h", "text"),
+             {"font_size": 16, "bold": False, "color": "DARK_GRAY", "align": "left"}),
+    "arrow": (("x1", "y1", "x2", "y2"),
+              {"color": "MEDIUM_GRAY"}),
+    "bullets": (("w", "h", "items"),
+                {"font_size": 16, "indent_level": 0}),
+}
+
+# Keys every positioned element or group may carry
+LAYOUT_KEYS = {"type", "x", "y", "dy", "advance"}
+
+# Deepest bullet indent level PowerPoint supports
+MAX_INDENT_LEVEL = 8
+
+# Table cell style keys and their defaults; a row may set any of them for its cells
+TABLE_CELL_DEFAULTS = {"fill": None, "text_color": "DARK_GRAY", "font_size": 12, "bold": False, "align": "center"}
+
+_compiled = {}
+
+class SlideSpecError(ValueError):
+    """Raised when a slide spec is malformed"""
+
+def parse_spec(source, path="<spec>"):
+    """Parse spec text as YAML or JSON, chosen by file extension"""
+    if path.endswith((".yaml", ".yml")):
+        try:
+            import yaml
+        except ImportError:  # YAML specs are optional; JSON needs only the standard library
+            raise SlideSpecError(f"{path}: PyYAML is required for YAML slide specs (pip install pyyaml)") from None
+        try:
+            return yaml.safe_load(source)
+        except yaml.YAMLError as e:
+            raise SlideSpecError(f"{path}: {e}") from None
+    try:
+        return json.loads(source)
+    except ValueError as e:
+        raise SlideSpecError(f"{path}: {e}") from None
+
+def _number(element, key, where):
+    value = element[key]
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise SlideSpecError(f"{where}.{key}: expected a number, got {value!r}")
+    return value
+
+def _level(value, where):
+    if isinstance(value, bool) or not isinstance(value, int) or not 0 <= value <= MAX_INDENT_LEVEL:
+        raise SlideSpecError(f"{where}: expected an indent level from 0 to {MAX_INDENT_LEVEL}, got {value!r}")
+    return value
+
+def _indent_levels(value, item_count, where):
+    """An indent level, or {item index: level} (JSON keys may be digit strings)"""
+    if not isinstance(value, dict):
+        return _level(value, where)
+    levels = {}
+    for key, level in value.items():
+        index = int(key) if isinstance(key, str) and key.isdigit() else key
+        if isinstance(index, bool) or not isinstance(index, int) or not 0 <= index < item_count:
+            raise SlideSpecError(f"{where}: expected item indexes from 0 to {item_count - 1}, got {key!r}")
+        levels[index] = _level(level, f"{where}[{key!r}]")
+    return levels
+
+def _text(value, where):
+    if not isinstance(value, str):
+        raise SlideSpecError(f"{where}: expected a string, got {value!r}")
+    return value
+
+def _color(value, palette, where):
+    if not isinstance(value, str):
+        raise SlideSpecError(f"{where}: expected a palette color name or #RRGGBB, got {value!r}")
+    if value.startswith("#"):
+        try:
+            return Color.from_string(value[1:].upper())
+        except ValueError:
+            raise SlideSpecError(f"{where}: invalid hex color {value!r}") from None
+    if value not in palette:
+        raise SlideSpecError(f"{where}: unknown color {value!r}")
+    return palette[value]
+
+class _Compiler:
+    """Walks a spec, tracking the vertical cursor, and emits absolute draw ops"""
+
+    def __init__(self, palette, path):
+        self.palette = palette
+        self.path = path
+        self.ops = []
+
+    def compile(self, spec):
+        if not isinstance(spec, dict):
+            raise SlideSpecError(f"{self.path}: spec must be a mapping")
+        unknown = set(spec) - {"title", "background", "y", "elements"}
+        if unknown:
+            raise SlideSpecError(f"{self.path}: unknown keys {sorted(unknown)}")
+
+        title = spec.get("title")
+        if title is not None:
+            title = _text(title, f"{self.path}.title")
+        background = spec.get("background")
+        if background is not None:
+            background = _color(background, self.palette, f"{self.path}.background")
+        self.ops.append(("slide", (title, background)))
+
+        cursor = _number(spec, "y", self.path) if "y" in spec else 0
+        self.compile_elements(spec.get("elements", []), cursor, 0, f"{self.path}.elements")
+        return self.ops
+
+    def compile_elements(self, elements, cursor, x_origin, where):
+        if not isinstance(elements, list):
+            raise SlideSpecError(f"{where}: expected a list")
+        for i, element in enumerate(elements):
+            cursor = self.compile_element(element, cursor, x_origin, f"{where}[{i}]")
+        return cursor
+
+    def compile_element(self, element, cursor, x_origin, where):
+        if not isinstance(element, dict) or "type" not in element:
+            raise SlideSpecError(f"{where}: expected a mapping with a 'type'")
+        kind = element["type"]
+
+        if "y" in element:
+            top = _number(element, "y", where)
+        elif "dy" in element:
+            top = cursor + _number(element, "dy", where)
+        else:
+            top = cursor
+
+        if kind == "move":
+            unknown = set(element) - {"type", "y", "dy"}
+            if unknown:
+                raise SlideSpecError(f"{where}: unknown keys {sorted(unknown)} for move")
+            return top
+        if kind == "group":
+            unknown = set(element) - LAYOUT_KEYS - {"elements"}
+            if unknown:
+                raise SlideSpecError(f"{where}: unknown keys {sorted(unknown)} for group")
+            x = x_origin + _number(element, "x", where) if "x" in element else x_origin
+            self.compile_elements(element.get("elements", []), top, x, f"{where}.elements")
+        elif kind == "table":
+            self.ops.append(self.compile_table(element, top, x_origin, where))
+        elif kind in ELEMENT_FIELDS:
+            self.ops.append(self.compile_primitive(kind, element, top, x_origin, where))
+        else:
+            raise SlideSpecError(f"{where}: unknown element type {kind!r}")
+
+        if "advance" in element:
+            return cursor + _number(element, "advance", where)
+        return cursor
+
+    def compile_primitive(self, kind, element, top, x_origin, where):
+        required, optional = ELEMENT_FIELDS[kind]
+        missing = [key for key in required if key not in element]
+        if kind != "arrow" and "x" not in element:
+            missing.insert(0, "x")
+        if missing:
+            raise SlideSpecError(f"{where}: {kind} is missing {missing}")
+        unknown = set(element) - set(required) - set(optional) - LAYOUT_KEYS
+        if unknown:
+            raise SlideSpecError(f"{where}: unknown keys {sorted(unknown)} for {kind}")
+
+        values = {**optional, **element}
+
+        if kind == "arrow":
+            # Arrow endpoints are offsets from the element's top, like a box's contents
+            return ("arrow", (
+                x_origin + _number(values, "x1", where), top + _number(values, "y1", where),
+                x_origin + _number(values, "x2", where), top + _number(values, "y2", where),
+                _color(values["color"], self.palette, f"{where}.color"),
+            ))
+
+        left = x_origin + _number(values, "x", where)
+        width = _number(values, "w", where)
+        height = _number(values, "h", where)
+        font_size = _number(values, "font_size", where)
+
+        if kind == "box":
+            return ("box", (
+                left, top, width, height, _text(values["text"], f"{where}.text"),
+                _color(values["color"], self.palette, f"{where}.color"),
+                _color(values["text_color"], self.palette, f"{where}.text_color"),
+                font_size, bool(values["bold"]),
+            ))
+        if kind == "text":
+            if values["align"] not in ALIGNMENTS:
+                raise SlideSpecError(f"{where}.align: expected one of {sorted(ALIGNMENTS)}")
+            return ("text", (
+                left, top, width, height, _text(values["text"], f"{where}.text"), font_size, bool(values["bold"]),
+                _color(values["color"], self.palette, f"{where}.color"),
+                ALIGNMENTS[values["align"]],
+            ))
+
+        items = values["items"]
+        if not isinstance(items, list) or not all(isinstance(item, str) for item in items):
+            raise SlideSpecError(f"{where}.items: expected a list of strings")
+        indent_level = _indent_levels(values["indent_level"], len(items), f"{where}.indent_level")
+        return ("bullets", (left, top, width, height, list(items), font_size, indent_level))
+
+    def compile_table(self, element, top, x_origin, where):
+        unknown = set(element) - LAYOUT_KEYS - {"columns", "rows"}
+        if unknown:
+            raise SlideSpecError(f"{where}: unknown keys {sorted(unknown)} for table")
+        if "x" not in element or "columns" not in element or "rows" not in element:
+            raise SlideSpecError(f"{where}: table needs x, columns and rows")
+
+        columns = element["columns"]
+        if not isinstance(columns, list) or not columns:
+            raise SlideSpecError(f"{where}.columns: expected a list of widths")
+        col_widths = [_number(columns, i, f"{where}.columns") for i in range(len(columns))]
+
+        if not isinstance(element["rows"], list):
+            raise SlideSpecError(f"{where}.rows: expected a list of rows")
+        rows = []
+        for r, row in enumerate(element["rows"]):
+            row_where = f"{where}.rows[{r}]"
+            if not isinstance(row, dict) or "height" not in row or "cells" not in row:
+                raise SlideSpecError(f"{row_where}: expected a mapping with height and cells")
+            unknown = set(row) - set(TABLE_CELL_DEFAULTS) - {"height", "cells"}
+            if unknown:
+                raise SlideSpecError(f"{row_where}: unknown keys {sorted(unknown)}")
+            if not isinstance(row["cells"], list):
+                raise SlideSpecError(f"{row_where}.cells: expected a list, got {row['cells']!r}")
+            if len(row["cells"]) != len(col_widths):
+                raise SlideSpecError(f"{row_where}: expected {len(col_widths)} cells, got {len(row['cells'])}")
+
+            row_style = {**TABLE_CELL_DEFAULTS, **{k: v for k, v in row.items() if k in TABLE_CELL_DEFAULTS}}
+            cells = []
+            for c, cell in enumerate(row["cells"]):
+                cell_where = f"{row_where}.cells[{c}]"
+                if not isinstance(cell, dict):
+                    cell = {"text": cell}
+                unknown = set(cell) - set(TABLE_CELL_DEFAULTS) - {"text"}
+                if unknown or "text" not in cell:
+                    raise SlideSpecError(f"{cell_where}: expected text plus optional {sorted(TABLE_CELL_DEFAULTS)}")
+                style = {**row_style, **cell}
+                text = style["text"]
+                if isinstance(text, (int, float)) and not isinstance(text, bool):
+                    text = str(text)  # A bare number is a cell's text, as in a CSV
+                if style["align"] not in ALIGNMENTS:
+                    raise SlideSpecError(f"{cell_where}.align: expected one of {sorted(ALIGNMENTS)}")
+                cells.append(TableCell(
+                    _text(text, f"{cell_where}.text"),
+                    None if style["fill"] is None else _color(style["fill"], self.palette, f"{cell_where}.fill"),
+                    _color(style["text_color"], self.palette, f"{cell_where}.text_color"),
+                    _number(style, "font_size", cell_where),
+                    bool(style["bold"]),
+                    ALIGNMENTS[style["align"]],
+                ))
+            rows.append((_number(row, "height", row_where), cells))
+
+        return ("table", (x_origin + _number(element, "x", where), top, col_widths, rows))
+
+def compile_spec(spec, palette, path="<spec>"):
+    """Compile a parsed spec into a flat draw list of (op, args) tuples
+
+    The first op is always ("slide", (title, background)); the rest are
+    "box", "text", "arrow", "bullets" and "table" with absolute inch coordinates and
+    resolved colors, in draw order.
+    """
+    return _Compiler(palette, path).compile(spec)
+
+def load_spec(path, palette):
+    """Parse and compile a spec file, reusing the cached draw list when nothing changed"""
+    with open(path, "rb") as f:
+        source = f.read()
+
+    digest = hashlib.sha256(source)
+    for name, value in sorted(palette.items()):
+        digest.update(f"{name}={value}".encode())
+    key = (os.path.abspath(path), digest.hexdigest())
+
+    draw_list = _compiled.get(key)
+    if draw_list is None:
+        draw_list = compile_spec(parse_spec(source.decode("utf-8"), path), palette, path)
+        _compiled[key] = draw_list
+    return draw_list
+
+def main():
+    """Validate spec files and print their compiled draw lists"""
+    import argparse
+
+    import create_professional_cd_presentation as generator
+
+    parser = argparse.ArgumentParser(description="Validate and compile slide spec files")
+    parser.add_argument("specs", nargs="+", help="YAML or JSON slide spec files")
+    args = parser.parse_args()
+
+    palette = generator.palette()
+    failed = False
+    for path in args.specs:
+        try:
+            draw_list = load_spec(path, palette)
+        except SlideSpecError as e:
+            print(f"❌ {e}")
+            failed = True
+            continue
+        print(f"✅ {path}: {len(draw_list) - 1} draw ops")
+    if failed:
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
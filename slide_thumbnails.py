@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+Slide Thumbnail Renderer
+Rasterizes the shapes the generators produce (rounded rectangles, text boxes,
+connectors, tables, pictures and solid backgrounds) straight from a saved
+.pptx to PNG, across a process pool, with thumbnails cached by content hash
+"""
+
+import hashlib
+import inspect
+import io
+import os
+import posixpath
+import re
+import sys
+import zipfile
+
+import connector_routing
+import deck_check
+import text_fit
+
+DEFAULT_CACHE_DIR = ".thumbnail_cache"
+DEFAULT_WIDTH = 960
+
+# Corner radius of a roundRect without an adj guide, as a fraction of its shorter side
+ROUND_RECT_RADIUS = 0.16667
+
+_NS = {
+    "a": "http://schemas.openxmlformats.org/drawingml/2006/main",
+    "p": "http://schemas.openxmlformats.org/presentationml/2006/main",
+    "r": "http://schemas.openxmlformats.org/officeDocument/2006/relationships",
+}
+_P = "{%s}" % _NS["p"]
+_R = "{%s}" % _NS["r"]
+
+EMU_PER_INCH = deck_check.EMU_PER_INCH
+
+# Per-process font cache: (path, bold, pixel size) -> FreeTypeFont
+_fonts = {}
+
+def _pil():
+    try:
+        from PIL import Image, ImageDraw, ImageFont
+    except ImportError:  # Only thumbnails need Pillow; building decks does not
+        raise RuntimeError("Pillow is required to render thumbnails (pip install pillow)") from None
+    return Image, ImageDraw, ImageFont
+
+# =============================================================================
+# READING SLIDES
+# =============================================================================
+
+def _rels(zin, part_name):
+    """{rId: part name} for a part's relationships"""
+    from lxml import etree
+
+    folder, name = posixpath.split(part_name)
+    rels_name = posixpath.join(folder, "_rels", name + ".rels")
+    if rels_name not in zin.namelist():
+        return {}
+    rels = etree.fromstring(zin.read(rels_name))
+    return {rel.get("Id"): posixpath.normpath(posixpath.join(folder, rel.get("Target")))
+            for rel in rels if rel.get("TargetMode") != "External"}
+
+def read_deck(pptx_file):
+    """Return ((width, height) in EMU, [(slide XML, {rId: image bytes}), ...]) in slide order"""
+    from lxml import etree
+
+    with zipfile.ZipFile(pptx_file) as zin:
+        presentation = etree.fromstring(zin.read("ppt/presentation.xml"))
+        size = presentation.find(f"{_P}sldSz")
+        targets = _rels(zin, "ppt/presentation.xml")
+
+        slides = []
+        for sld_id in presentation.iterfind(f"{_P}sldIdLst/{_P}sldId"):
+            part_name = targets[sld_id.get(f"{_R}id")]
+            images = {rel_id: zin.read(target) for rel_id, target in _rels(zin, part_name).items()
+                      if target.startswith("ppt/media/")}
+            slides.append((zin.read(part_name), images))
+    return (int(size.get("cx")), int(size.get("cy"))), slides
+
+def _color(element, path):
+    rgb = element.find(path, _NS) if element is not None else None
+    return "#" + rgb.get("val") if rgb is not None else None
+
+def _xfrm(xfrm):
+    """(left, top, width, height, rotation in degrees, flipH, flipV) of an a:xfrm/p:xfrm, in EMU"""
+    off, ext = xfrm.find("a:off", _NS), xfrm.find("a:ext", _NS)
+    return (int(off.get("x")), int(off.get("y")), int(ext.get("cx")), int(ext.get("cy")),
+            int(xfrm.get("rot", 0)) / 60000, xfrm.get("flipH") in ("1", "true"), xfrm.get("flipV") in ("1", "true"))
+
+def _text(tx_body, rect, default_color="#000000"):
+    """A ("text", ...) op for a text body, or None when it is empty"""
+    paragraphs = list(deck_check.paragraphs(tx_body))
+    if not any(paragraph.text for paragraph in paragraphs):
+        return None
+    body_pr = tx_body.find("a:bodyPr", _NS)
+    middle = body_pr is not None and body_pr.get("anchor") == "ctr"
+    return ("text", (rect, paragraphs, middle, default_color))
+
+def slide_ops(slide_xml):
+    """Flatten a slide into draw ops with EMU geometry, in paint order
+
+    Ops: ("background", color), ("shape", (rect, prst, radius, fill, line, line width)),
+    ("text", (rect, paragraphs, middle, default color)), ("line", (points, color, width)),
+    ("picture", (rect, rId)).
+    """
+    from lxml import etree
+
+    slide = etree.fromstring(slide_xml)
+    ops = []
+    background = _color(slide.find("p:cSld/p:bg/p:bgPr", _NS), "a:solidFill/a:srgbClr")
+    ops.append(("background", background or "#FFFFFF"))
+
+    for shape in slide.find("p:cSld/p:spTree", _NS):
+        tag = etree.QName(shape).localname
+        if tag == "sp":
+            xfrm = shape.find("p:spPr/a:xfrm", _NS)
+            if xfrm is None:
+                continue
+            left, top, width, height = _xfrm(xfrm)[:4]
+            rect = (left, top, width, height)
+            sp_pr = shape.find("p:spPr", _NS)
+            geometry = sp_pr.find("a:prstGeom", _NS)
+            fill = _color(sp_pr, "a:solidFill/a:srgbClr")
+            line = _color(sp_pr, "a:ln/a:solidFill/a:srgbClr")
+            if geometry is not None and (fill or line):
+                radius = 0
+                if geometry.get("prst") == "roundRect":
+                    guide = geometry.find("a:avLst/a:gd", _NS)
+                    fraction = int(guide.get("fmla").split()[1]) / 100000 if guide is not None else ROUND_RECT_RADIUS
+                    radius = fraction * min(width, height)
+                ln = sp_pr.find("a:ln", _NS)
+                line_width = int(ln.get("w", 12700)) if ln is not None else 12700
+                ops.append(("shape", (rect, geometry.get("prst"), radius, fill, line, line_width)))
+            tx_body = shape.find("p:txBody", _NS)
+            if tx_body is not None:
+                op = _text(tx_body, rect)
+                if op is not None:
+                    ops.append(op)
+
+        elif tag == "cxnSp":
+            sp_pr = shape.find("p:spPr", _NS)
+            left, top, width, height, rotation, flip_h, flip_v = _xfrm(sp_pr.find("a:xfrm", _NS))
+            geometry = sp_pr.find("a:prstGeom", _NS)
+            adjustments = [int(gd.get("fmla").split()[1]) for gd in geometry.iterfind("a:avLst/a:gd", _NS)]
+            points = connector_routing.connector_path(connector_routing.ConnectorGeometry(
+                geometry.get("prst"), left, top, width, height, rotation, flip_h, flip_v, adjustments))
+            ln = sp_pr.find("a:ln", _NS)
+            ops.append(("line", (points, _color(ln, "a:solidFill/a:srgbClr") or "#4472C4",
+                                 int(ln.get("w", 12700)) if ln is not None else 12700)))
+
+        elif tag == "pic":
+            blip = shape.find("p:blipFill/a:blip", _NS)
+            left, top, width, height = _xfrm(shape.find("p:spPr/a:xfrm", _NS))[:4]
+            ops.append(("picture", ((left, top, width, height), blip.get(f"{_R}embed"))))
+
+        elif tag == "graphicFrame":
+            table = shape.find("a:graphic/a:graphicData/a:tbl", _NS)
+            if table is None:
+                continue
+            left, top = _xfrm(shape.find("p:xfrm", _NS))[:2]
+            widths = [int(col.get("w")) for col in table.iterfind("a:tblGrid/a:gridCol", _NS)]
+            y = top
+            for tr in table.iterfind("a:tr", _NS):
+                x = left
+                height = int(tr.get("h"))
+                for tc, width in zip(tr.iterfind("a:tc", _NS), widths):
+                    rect = (x, y, width, height)
+                    tc_pr = tc.find("a:tcPr", _NS)
+                    fill = _color(tc_pr, "a:solidFill/a:srgbClr")
+                    if fill:
+                        ops.append(("shape", (rect, "rect", 0, fill, None, 0)))
+                    tx_body = tc.find("a:txBody", _NS)
+                    if tx_body is not None:
+                        op = _text(tx_body, rect)
+                        if op is not None:
+                            rect, paragraphs, _, color = op[1]
+                            middle = tc_pr is not None and tc_pr.get("anchor") == "ctr"
+                            ops.append(("text", (rect, paragraphs, middle, color)))
+                    x += width
+                y += height
+    return ops
+
+# =============================================================================
+# RASTERIZING
+# =============================================================================
+
+def _font(fonts, bold, pixels):
+    """Cached font for a weight at a pixel size; without font files, Pillow's bundled font"""
+    path = fonts[1] if bold and fonts[1] else fonts[0]
+    key = (path, bold, pixels)
+    font = _fonts.get(key)
+    if font is None:
+        _, _, ImageFont = _pil()
+        font = _fonts[key] = ImageFont.truetype(path, pixels) if path else ImageFont.load_default(pixels)
+    return font
+
+def _draw_text(draw, scale, rect, paragraphs, middle, default_color, fonts):
+    left, top, width, height = rect
+    width_in = width / EMU_PER_INCH
+    laid_out = []
+    text_height = 0
+    for paragraph in paragraphs:
+        lines = text_fit.text_lines(paragraph.text, width_in, paragraph.size, paragraph.bold)
+        laid_out.append((paragraph, lines))
+        text_height += (len(lines) * paragraph.size * text_fit.LINE_SPACING + paragraph.spacing) * EMU_PER_INCH / 72
+
+    inset_x, inset_y = text_fit.INSET_X * EMU_PER_INCH, text_fit.INSET_Y * EMU_PER_INCH
+    y = top + (height - text_height) / 2 if middle else top + inset_y
+    for paragraph, lines in laid_out:
+        pitch = paragraph.size * text_fit.LINE_SPACING * EMU_PER_INCH / 72
+        pixels = max(1, round(paragraph.size * EMU_PER_INCH / 72 * scale))
+        font = _font(fonts, paragraph.bold, pixels)
+        # Without a bold font file, embolden by stroking the glyph outlines
+        stroke = 1 if paragraph.bold and not fonts[1] and pixels >= 12 else 0
+        color = "#" + paragraph.color if paragraph.color else default_color
+        for line in lines:
+            line_width = font.getlength(line) / scale
+            x = left + inset_x
+            if paragraph.align == "ctr":
+                x += (width - 2 * inset_x - line_width) / 2
+            elif paragraph.align == "r":
+                x += width - 2 * inset_x - line_width
+            draw.text((x * scale, (y + (pitch - pixels / scale) / 2) * scale), line, font=font, fill=color,
+                      stroke_width=stroke, stroke_fill=color)
+            y += pitch
+        y += paragraph.spacing * EMU_PER_INCH / 72
+
+def render_slide(task):
+    """Render one slide to PNG bytes; task is (slide XML, images, slide size, width in pixels, fonts)"""
+    Image, ImageDraw, _ = _pil()
+    slide_xml, images, (slide_width, slide_height), pixels, fonts = task
+    scale = pixels / slide_width
+    image = Image.new("RGB", (pixels, round(slide_height * scale)), "white")
+    draw = ImageDraw.Draw(image)
+
+    def box(rect):
+        left, top, width, height = rect
+        return [left * scale, top * scale, (left + width) * scale, (top + height) * scale]
+
+    for op, args in slide_ops(slide_xml):
+        if op == "background":
+            draw.rectangle([0, 0, image.width, image.height], fill=args)
+        elif op == "shape":
+            rect, prst, radius, fill, line, line_width = args
+            outline_width = max(1, round(line_width * scale)) if line else 0
+            if prst == "ellipse":
+                draw.ellipse(box(rect), fill=fill, outline=line, width=outline_width)
+            else:
+                draw.rounded_rectangle(box(rect), radius=radius * scale, fill=fill, outline=line,
+                                       width=outline_width)
+        elif op == "text":
+            _draw_text(draw, scale, *args, fonts)
+        elif op == "line":
+            points, color, line_width = args
+            draw.line([(x * scale, y * scale) for x, y in points], fill=color,
+                      width=max(1, round(line_width * scale)), joint="curve")
+        elif op == "picture":
+            rect, rel_id = args
+            if rel_id in images:
+                left, top, right, bottom = (round(v) for v in box(rect))
+                picture = Image.open(io.BytesIO(images[rel_id])).convert("RGBA")
+                picture = picture.resize((max(right - left, 1), max(bottom - top, 1)), Image.LANCZOS)
+                image.paste(picture, (left, top), picture)
+
+    out = io.BytesIO()
+    image.save(out, "PNG")
+    return out.getvalue()
+
+# =============================================================================
+# DECK RENDERING
+# =============================================================================
+
+def renderer_fingerprint(pixels, fonts):
+    """Hash of the renderer code, size and fonts that every thumbnail depends on"""
+    digest = hashlib.sha256(f"{pixels}|{fonts}".encode())
+    for module in (sys.modules[__name__], deck_check, text_fit, connector_routing):
+        digest.update(inspect.getsource(module).encode())
+    for path in fonts:
+        if path:
+            with open(path, "rb") as f:
+                digest.update(f.read())
+    return digest.hexdigest()
+
+def render_deck(pptx_file, output_dir, pixels=DEFAULT_WIDTH, jobs=1, cache_dir=DEFAULT_CACHE_DIR, fonts=(None, None)):
+    """Write slide-NN.png for every slide of a deck; returns (paths, number of slides rendered)
+
+    Each thumbnail is cached under the hash of its slide XML, its images and
+    the renderer, so unchanged slides are copied from the cache and only
+    changed ones are rasterized, across jobs worker processes.
+    """
+    slide_size, slides = read_deck(pptx_file)
+    fingerprint = renderer_fingerprint(pixels, fonts)
+
+    keys = []
+    for slide_xml, images in slides:
+        digest = hashlib.sha256((fingerprint + str(slide_size)).encode())
+        digest.update(slide_xml)
+        for rel_id, blob in sorted(images.items()):
+            digest.update(rel_id.encode())
+            digest.update(hashlib.sha256(blob).digest())
+        keys.append(digest.hexdigest())
+
+    os.makedirs(cache_dir, exist_ok=True)
+    missing = [i for i, key in enumerate(keys) if not os.path.exists(os.path.join(cache_dir, key + ".png"))]
+    tasks = [(slides[i][0], slides[i][1], slide_size, pixels, fonts) for i in missing]
+    if jobs > 1 and len(tasks) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            rendered = list(pool.map(render_slide, tasks))
+    else:
+        rendered = [render_slide(task) for task in tasks]
+    for i, png in zip(missing, rendered):
+        with open(os.path.join(cache_dir, keys[i] + ".png"), "wb") as f:
+            f.write(png)
+
+    os.makedirs(output_dir, exist_ok=True)
+    for stale in os.listdir(output_dir):
+        if re.fullmatch(r"slide-\d+\.png", stale):
+            os.remove(os.path.join(output_dir, stale))
+    paths = []
+    for number, key in enumerate(keys, 1):
+        path = os.path.join(output_dir, f"slide-{number:02d}.png")
+        with open(os.path.join(cache_dir, key + ".png"), "rb") as src, open(path, "wb") as dst:
+            dst.write(src.read())
+        paths.append(path)
+    return paths, len(missing)
+
+def main():
+    """Render thumbnails for saved decks"""
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Render every slide of a deck to PNG")
+    parser.add_argument("deck", help=".pptx file to render")
+    parser.add_argument("-o", "--output-dir", default="thumbnails", help="Directory for slide-NN.png files")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                        help="Render slides across N worker processes")
+    parser.add_argument("--width", type=int, default=DEFAULT_WIDTH, help="Thumbnail width in pixels")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="Directory holding cached thumbnails")
+    parser.add_argument("--font", metavar="PATH", help="Font file for text (default: Pillow's bundled font)")
+    parser.add_argument("--bold-font", metavar="PATH", help="Font file for bold text")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    paths, rendered = render_deck(args.deck, args.output_dir, args.width, args.jobs, args.cache_dir,
+                                  (args.font, args.bold_font))
+    elapsed = time.perf_counter() - start
+    print(f"✅ {len(paths)} thumbnails in {args.output_dir} ({rendered} rendered, "
+          f"{len(paths) - rendered} from cache) in {elapsed:.2f}s")
+
+if __name__ == "__main__":
+    main()
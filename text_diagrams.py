@@ -0,0 +1,808 @@
+#!/usr/bin/env python3
+"""
+Text Diagram Converter
+Parses ASCII box-drawing diagrams and Mermaid flowcharts from Markdown code
+blocks into node/edge graphs and lays them out as native boxes and arrows;
+layouts are cached by diagram source, so unchanged diagrams cost nothing on
+rebuild
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import re
+import sys
+from collections import namedtuple
+
+import connector_routing
+import text_fit
+
+DEFAULT_CACHE_DIR = ".diagram_cache"
+
+# Code block languages read as ASCII diagrams; tagged blocks (yaml, bash, ...) are never diagrams
+ASCII_LANGUAGES = ("", "text", "txt", "ascii", "plain")
+
+# Drawing area below the slide title, in inches
+AREA_LEFT, AREA_TOP, AREA_WIDTH, AREA_HEIGHT = 0.6, 1.4, 12.1, 5.8
+
+# Largest size of one character cell when a small diagram is scaled up to the area, in inches
+MAX_COLUMN_WIDTH, MAX_ROW_HEIGHT = 0.16, 0.32
+
+# Smallest row height that keeps one line of text per row readable; taller diagrams continue on more slides
+MIN_ROW_HEIGHT = 0.1
+
+# Character cells a Mermaid node takes, and the gaps between ranks and between nodes of a rank
+NODE_COLUMNS, NODE_ROWS = 18, 3
+RANK_GAP_COLUMNS, RANK_GAP_ROWS = 8, 3
+NODE_GAP_COLUMNS, NODE_GAP_ROWS = 4, 2
+
+# Largest font sizes in points; box text shrinks to fit its box
+BOX_FONT_SIZE, TITLE_FONT_SIZE, LABEL_FONT_SIZE = 12, 12, 10
+
+# Sequence chart sizes in inches: participant boxes, and the most room one message takes
+PARTICIPANT_HEIGHT, MAX_MESSAGE_SPACING = 0.5, 0.45
+
+# Node and label positions are in character cells of the source (Mermaid nodes get synthetic cells);
+# a label's text has one line per row it covers; kind is "graph", or "sequence" for a chart whose
+# edges are messages in order
+Node = namedtuple("Node", "text column row columns rows")
+Edge = namedtuple("Edge", "source target label")
+Label = namedtuple("Label", "text column row")
+Diagram = namedtuple("Diagram", "kind nodes edges labels")
+
+# Laid out in inches: boxes (left, top, width, height, text, font size, style "node" or "container",
+# title height: the band above a container's first child that its title fills, 0 for nodes),
+# lines (x1, y1, x2, y2, style "edge" or "lifeline", source box, target box; the boxes are indexes
+# into boxes for edges between two of them, else None) and labels (left, top, width, height, text,
+# font size, align name)
+DiagramLayout = namedtuple("DiagramLayout", "boxes lines labels")
+
+# source digest -> DiagramLayouts, one per slide, or None for code blocks that are not diagrams
+_layouts = {}
+
+# Hash of the layout code, computed on first use
+_code_digest = None
+
+def code_blocks(text):
+    """(heading, language, source) for each fenced code block of a Markdown document"""
+    blocks = []
+    heading, language, source = None, None, None
+    for line in text.splitlines(keepends=True):
+        stripped = line.strip()
+        if source is not None:
+            if stripped.startswith(("```", "~~~")):
+                blocks.append((heading, language, "".join(source)))
+                source = None
+            else:
+                source.append(line)
+        elif stripped.startswith(("```", "~~~")):
+            language, source = stripped[3:].strip().lower(), []
+        elif stripped.startswith("#"):
+            heading = stripped.lstrip("#").strip()
+    return blocks
+
+# =============================================================================
+# ASCII DIAGRAMS
+# =============================================================================
+
+_TOP_LEFT, _TOP_RIGHT, _BOTTOM_LEFT, _BOTTOM_RIGHT = "┌╔┏╭+", "┐╗┓╮+", "└╚┗╰+", "┘╝┛╯+"
+_HORIZONTAL = "─═━-┬┴┼╤╧╦╩╪▼▲"
+_VERTICAL = "│║┃|├┤┼╟╢╠╣╫►◄▶◀"
+_DIVIDERS, _SPLITS = "├╟╠", "┬╤╦┼"
+_LINES = set("─═━│║┃┌┐└┘╔╗╚╝┏┓┗┛╭╮╰╯├┤┬┴┼╟╢╤╧╠╣╦╩╬╪╫")
+
+# Arrowheads and the (row, column) step they point along
+_HEADS = {"▼": (1, 0), "▲": (-1, 0), "►": (0, 1), "▶": (0, 1), "◄": (0, -1), "◀": (0, -1),
+          "↓": (1, 0), "↑": (-1, 0), "→": (0, 1), "←": (0, -1)}
+_ASCII_HEADS = {">": (0, 1), "<": (0, -1), "v": (1, 0), "^": (-1, 0)}
+
+def _at(grid, row, column):
+    if 0 <= row < len(grid) and 0 <= column < len(grid[row]):
+        return grid[row][column]
+    return " "
+
+def _find_boxes(grid):
+    """(top, left, bottom, right) cells of every rectangle drawn with box characters"""
+    boxes = []
+    for top, line in enumerate(grid):
+        for left, char in enumerate(line):
+            if char not in _TOP_LEFT:
+                continue
+            right = left + 1
+            while right < len(line) and line[right] in _HORIZONTAL:
+                right += 1
+            if right == left + 1 or _at(grid, top, right) not in _TOP_RIGHT:
+                continue
+            # Hand-drawn edges drift: the left edge may run a column off the top corner, the bottom
+            # corner a few columns off the top one, and right edges are not checked at all since rows
+            # whose text overflows shift them
+            for edge in (left, left - 1, left + 1):
+                bottom = top + 1
+                while _at(grid, bottom, edge) in _VERTICAL:
+                    bottom += 1
+                if _at(grid, bottom, edge) not in _BOTTOM_LEFT:
+                    continue
+                corner = edge + 1
+                while corner < len(grid[bottom]) and grid[bottom][corner] in _HORIZONTAL:
+                    corner += 1
+                if _at(grid, bottom, corner) in _BOTTOM_RIGHT and abs(corner - right) <= 3:
+                    boxes.append((top, edge, bottom, right))
+                    break
+    return boxes
+
+def _inside(box, row, column):
+    top, left, bottom, right = box
+    return top < row < bottom and left < column < right
+
+def _row_text(grid, row, left, right):
+    """Text between two border columns of a row, following a right border that overflowing text pushed along"""
+    line = grid[row]
+    end = right
+    if _at(grid, row, right) not in _VERTICAL:
+        border = [line.find(char, right) for char in _VERTICAL]
+        end = min([index for index in border if index > 0] or [len(line)])
+    return line[left + 1:end].strip().strip("".join(_VERTICAL)).strip()
+
+def _box_text(grid, box):
+    """(title, compartments) of a box; compartments are (text, top, left, bottom, right) cells
+
+    A box split by a ├──┬──┤ divider keeps the text above it as its title,
+    and the columns below become compartments drawn as boxes inside it.
+    """
+    top, left, bottom, right = box
+    title, compartments = [], []
+    row = top + 1
+    above = top
+    while row < bottom:
+        if grid[row][left] in _DIVIDERS:
+            above = row
+            row += 1
+            continue
+        end = row
+        while end < bottom and grid[end][left] not in _DIVIDERS:
+            end += 1
+        splits = [column for column in range(left + 1, right) if grid[above][column] in _SPLITS]
+        if splits and above != top:
+            edges = [left] + splits + [right]
+            for start, stop in zip(edges, edges[1:]):
+                text = "\n".join(filter(None, (grid[r][start + 1:stop].strip(" " + "".join(_VERTICAL))
+                                              for r in range(row, end))))
+                compartments.append((text, above, start, end, stop))
+        else:
+            title += [text for text in (_row_text(grid, r, left, right) for r in range(row, end)) if text]
+        row = end
+    return "\n".join(title), compartments
+
+def _is_connector(grid, row, column):
+    char = grid[row][column]
+    if char in _LINES or char in _HEADS:
+        return True
+    if char in "-=":
+        # A hyphen in a word is not a line: ASCII lines run for two characters or end in a head
+        return any(_at(grid, row, column + step) in "-=<>+|" or _at(grid, row, column + step) in _LINES
+                   for step in (-1, 1))
+    if char == "|":
+        return True
+    if char == "+":
+        return any(_at(grid, row, column + step) in "-=" for step in (-1, 1)) or any(
+            _at(grid, row + step, column) == "|" for step in (-1, 1))
+    if char in _ASCII_HEADS:
+        step_row, step_column = _ASCII_HEADS[char]
+        return _at(grid, row - step_row, column - step_column) in "-=|─│═║"
+    return False
+
+def _head_direction(char):
+    return _HEADS.get(char) or _ASCII_HEADS.get(char)
+
+def parse_ascii(source):
+    """Diagram of the boxes and connecting lines drawn in source, or None with fewer than two boxes
+
+    Boxes inside another box make it a container. Lines touching two or
+    more boxes become edges, directed toward the boxes their arrowheads point
+    at; text beside the drawing stays a label where the author wrote it.
+    """
+    lines = source.expandtabs(4).splitlines()
+    width = max((len(line) for line in lines), default=0)
+    grid = [line.ljust(width) for line in lines]
+    boxes = _find_boxes(grid)
+    if len(boxes) < 2:
+        return None
+
+    border = {}
+    for index, (top, left, bottom, right) in enumerate(boxes):
+        for column in range(left, right + 1):
+            border[(top, column)] = border[(bottom, column)] = index
+        for row in range(top + 1, bottom):
+            border[(row, left)] = border[(row, right)] = index
+    leaves = [index for index, box in enumerate(boxes)
+              if not any(_inside(box, other[0], other[1]) for other in boxes)]
+
+    connectors = {(row, column) for row in range(len(grid)) for column in range(width)
+                  if (row, column) not in border and _is_connector(grid, row, column)}
+
+    edges = set()
+    seen = set()
+    for start in connectors:
+        if start in seen:
+            continue
+        component, pending = [], [start]
+        seen.add(start)
+        while pending:
+            row, column = pending.pop()
+            component.append((row, column))
+            for neighbor in ((row - 1, column), (row + 1, column), (row, column - 1), (row, column + 1)):
+                if neighbor in connectors and neighbor not in seen:
+                    seen.add(neighbor)
+                    pending.append(neighbor)
+
+        touched, targets = set(), set()
+        for row, column in component:
+            for neighbor in ((row - 1, column), (row + 1, column), (row, column - 1), (row, column + 1)):
+                index = border.get(neighbor)
+                if index is not None and not _inside(boxes[index], row, column):
+                    touched.add(index)
+                    if grid[neighbor[0]][neighbor[1]] in _HEADS:      # A head drawn into the border
+                        targets.add(index)
+            direction = _head_direction(grid[row][column])
+            if direction is not None:
+                for step in (1, 2):
+                    index = border.get((row + step * direction[0], column + step * direction[1]))
+                    if index is not None and not _inside(boxes[index], row, column):
+                        targets.add(index)
+                        break
+        if len(touched | targets) < 2:
+            continue
+        ordered = sorted(touched | targets, key=lambda index: boxes[index][:2])
+        sources = [index for index in ordered if index not in targets]
+        if not targets:
+            # No arrowheads: read the line from its topmost, leftmost box
+            sources, targets = ordered[:1], ordered[1:]
+        elif not sources:
+            # Heads at every end (◄───►): connect the boxes in reading order
+            sources, targets = ordered[:1], ordered[1:]
+        edges.update((source, target) for source in sources for target in targets if source != target)
+
+    # Text outside leaf boxes: a container's title, or a label beside a line
+    labels = []
+    titles = {}
+    for row, line in enumerate(grid):
+        for match in re.finditer(r"\S+(?: \S+)*", line):
+            cells = [(row, column) for column in range(match.start(), match.end())]
+            if any(cell in border or cell in connectors for cell in cells):
+                # Split the run around line characters and borders
+                runs = re.finditer(r"[^\s]+(?: [^\s]+)*", "".join(
+                    " " if (row, column) in border or (row, column) in connectors else line[column]
+                    for column in range(match.start(), match.end())))
+                spans = [(match.start() + run.start(), run.group(0)) for run in runs]
+            else:
+                spans = [(match.start(), match.group(0))]
+            for column, text in spans:
+                owners = [index for index, box in enumerate(boxes) if _inside(box, row, column)]
+                if any(index in leaves for index in owners):
+                    continue
+                near_line = any((row + step_row, column + step_column) in connectors
+                                for step_row in (-1, 0, 1) for step_column in range(-3, len(text) + 3))
+                if owners and not near_line:
+                    innermost = min(owners, key=lambda index: (boxes[index][2] - boxes[index][0])
+                                    * (boxes[index][3] - boxes[index][1]))
+                    titles.setdefault(innermost, []).append(text)
+                else:
+                    labels.append(Label(text, column, row))
+
+    # Notes written under or over the drawing (legends, state tables, ...) are left out
+    first_row, last_row = min(box[0] for box in boxes), max(box[2] for box in boxes)
+    labels = [label for label in labels if first_row - 1 <= label.row <= last_row + 1]
+
+    # Runs on consecutive rows that share columns are one block of text, one line per row
+    blocks, last_lines = [], []
+    for label in labels:
+        end = label.column + len(label.text)
+        for i, (row, start, stop) in enumerate(last_lines):
+            if row == label.row - 1 and start < end and label.column < stop:
+                block = blocks[i]
+                blocks[i] = Label(f"{block.text}\n{label.text}", min(block.column, label.column), block.row)
+                last_lines[i] = (label.row, label.column, end)
+                break
+        else:
+            blocks.append(label)
+            last_lines.append((label.row, label.column, end))
+    labels = blocks
+
+    nodes, compartments = [], []
+    for index, (top, left, bottom, right) in enumerate(boxes):
+        if index in leaves:
+            text, parts = _box_text(grid, boxes[index])
+            # Compartments sit half a cell inside their borders so neighbors do not touch
+            compartments += [Node(part, start + 0.5, above + 0.5, stop - start - 1, end - above - 1)
+                             for part, above, start, end, stop in parts]
+        else:
+            text = "\n".join(titles.get(index, []))
+        nodes.append(Node(text, left, top, right - left + 1, bottom - top + 1))
+    return Diagram("graph", tuple(nodes + compartments),
+                   tuple(Edge(source, target, None) for source, target in sorted(edges)), tuple(labels))
+
+def parse_sequence(source):
+    """Diagram for an ASCII sequence chart, or None
+
+    The first line names the participants, the next holds one "|" lifeline
+    under each, and rows like "|--deploy-->|" or "|<--OK--|" are messages;
+    text on the rows right under a message continues its label.
+    """
+    lines = [line for line in source.expandtabs(4).splitlines()]
+    while lines and not lines[0].strip():
+        lines.pop(0)
+    if len(lines) < 3:
+        return None
+    participants = [(match.start(), match.group(0)) for match in re.finditer(r"\S+(?: \S+)*", lines[0])]
+    lifelines = [column for column, char in enumerate(lines[1]) if char == "|"]
+    if len(participants) < 2 or len(lifelines) != len(participants):
+        return None
+
+    def nearest(column):
+        return min(range(len(lifelines)), key=lambda i: abs(lifelines[i] - column))
+
+    messages = []
+    last_row, span = None, None
+    for row, line in enumerate(lines[2:], 2):
+        found = False
+        column = line.find("|")
+        while 0 <= column < len(line) - 1:
+            if line[column + 1] not in "-<":
+                column = line.find("|", column + 1)
+                continue
+            end = column + 1
+            # A message runs through the lifelines it crosses, up to a "|" that nothing continues from
+            while end < len(line) and not (line[end] == "|" and line[end + 1:end + 2] != "-"):
+                end += 1
+            segment = line[column + 1:end]
+            label = " ".join(re.sub(r"-{2,}|[<>|]", " ", segment).strip(" -").split())
+            start, stop = nearest(column), nearest(end)
+            if start != stop:
+                if segment.lstrip().startswith("<"):
+                    start, stop = stop, start
+                messages.append([start, stop, label])
+                last_row, span, found = row, (column, end), True
+            column = line.find("|", end + 1) if end < len(line) else -1
+        if not found and messages and last_row == row - 1:
+            words = [match for match in re.finditer(r"[^\s|]+(?: [^\s|]+)*", line)
+                     if span[0] < match.start() < span[1]]
+            if words:
+                messages[-1][2] = " ".join([messages[-1][2]] + [match.group(0) for match in words]).strip()
+                last_row = row
+    if not messages:
+        return None
+    nodes = tuple(Node(name, column, 0, len(name), 1) for column, name in participants)
+    return Diagram("sequence", nodes, tuple(Edge(*message) for message in messages), ())
+
+# =============================================================================
+# MERMAID FLOWCHARTS
+# =============================================================================
+
+_MERMAID_NODE = re.compile(r"\s*([\w.-]+)\s*(\(\[.*?\]\)|\[\[.*?\]\]|\[\(.*?\)\]|\(\(.*?\)\)|\{\{.*?\}\}"
+                           r"|\[.*?\]|\(.*?\)|\{.*?\}|>.*?\])?")
+_MERMAID_LINK = re.compile(r"\s*(?:--|==|-\.)\s*([^-=>|][^>]*?)\s*(?:-->|==>|-\.->|---)"
+                           r"|\s*<?(?:-{2,}|={2,}|-\.+-?)[>ox]?\s*(?:\|([^|]*)\|)?")
+_MERMAID_SKIP = ("subgraph", "end", "classDef", "class ", "style ", "linkStyle", "click ", "%%", "direction")
+
+def _mermaid_text(shape):
+    text = re.sub(r"^[\[({>]+|[\])}]+$", "", shape).strip().strip('"')
+    return re.sub(r"<br\s*/?>", "\n", text)
+
+def parse_mermaid(source):
+    """Diagram for a Mermaid flowchart ("graph" or "flowchart"), laid out in ranks; None for other charts"""
+    statements = [part.strip() for line in source.splitlines() for part in line.split(";") if part.strip()]
+    if not statements:
+        return None
+    header = statements[0].split()
+    if header[0] not in ("graph", "flowchart"):
+        return None
+    direction = header[1].upper() if len(header) > 1 else "TD"
+
+    names, texts, edges = [], {}, []
+
+    def node_group(statement, position):
+        """Node ids of an "A & B[text]" group starting at position, and where it ends"""
+        group = []
+        while True:
+            match = _MERMAID_NODE.match(statement, position)
+            if match is None or not match.group(1):
+                return group, position
+            name = match.group(1)
+            if name not in texts:
+                names.append(name)
+                texts[name] = name
+            if match.group(2):
+                texts[name] = _mermaid_text(match.group(2))
+            group.append(name)
+            position = match.end()
+            ampersand = re.match(r"\s*&", statement[position:])
+            if ampersand is None:
+                return group, position
+            position += ampersand.end()
+
+    for statement in statements[1:]:
+        if statement.startswith(_MERMAID_SKIP):
+            continue
+        sources, position = node_group(statement, 0)
+        while sources and position < len(statement):
+            link = _MERMAID_LINK.match(statement, position)
+            if link is None or link.end() == position:
+                break
+            targets, position = node_group(statement, link.end())
+            label = link.group(1) or link.group(2)
+            edges.extend(Edge(source, target, label.strip() if label else None)
+                         for source in sources for target in targets)
+            sources = targets
+    if not names:
+        return None
+
+    # Longest-path ranks; edges that close a cycle are ignored for ranking
+    index = {name: i for i, name in enumerate(names)}
+    rank = {name: 0 for name in names}
+    for _ in range(len(names)):
+        changed = False
+        for edge in edges:
+            if index[edge.source] < index[edge.target] or rank[edge.source] < rank[edge.target]:
+                if rank[edge.target] < rank[edge.source] + 1 and rank[edge.source] < len(names):
+                    rank[edge.target] = rank[edge.source] + 1
+                    changed = True
+        if not changed:
+            break
+    ranks = {}
+    for name in names:
+        ranks.setdefault(rank[name], []).append(name)
+    # One barycenter sweep: order each rank by the mean position of its predecessors
+    position = {}
+    for level in sorted(ranks):
+        def barycenter(name):
+            parents = [position[edge.source] for edge in edges if edge.target == name and edge.source in position]
+            return sum(parents) / len(parents) if parents else index[name]
+        ranks[level].sort(key=barycenter)
+        position.update((name, i) for i, name in enumerate(ranks[level]))
+
+    widest = max(len(members) for members in ranks.values())
+    last = max(ranks)
+    nodes = {}
+    for level, members in ranks.items():
+        if direction in ("BT", "RL"):
+            level = last - level
+        offset = (widest - len(members)) / 2
+        for i, name in enumerate(members):
+            if direction in ("LR", "RL"):
+                column = level * (NODE_COLUMNS + RANK_GAP_COLUMNS)
+                row = round((i + offset) * (NODE_ROWS + NODE_GAP_ROWS))
+            else:
+                column = round((i + offset) * (NODE_COLUMNS + NODE_GAP_COLUMNS))
+                row = level * (NODE_ROWS + RANK_GAP_ROWS)
+            nodes[name] = Node(texts[name], column, row, NODE_COLUMNS, NODE_ROWS)
+    return Diagram("graph", tuple(nodes[name] for name in names),
+                   tuple(Edge(index[edge.source], index[edge.target], edge.label) for edge in edges), ())
+
+def parse_diagram(source, language=""):
+    """Diagram for a code block, or None when it is not one (code, YAML, sequence charts, ...)"""
+    if language == "mermaid":
+        return parse_mermaid(source)
+    if language in ASCII_LANGUAGES:
+        return parse_ascii(source) or parse_sequence(source)
+    return None
+
+# =============================================================================
+# LAYOUT
+# =============================================================================
+
+def _layout_sequence(diagram):
+    """Participants spread across the top, lifelines down from them and one line per message in order"""
+    slot = AREA_WIDTH / len(diagram.nodes)
+    width = min(2.2, slot * 0.9)
+    centers = [AREA_LEFT + slot * (i + 0.5) for i in range(len(diagram.nodes))]
+    first = AREA_TOP + PARTICIPANT_HEIGHT + 0.2
+    spacing = min(MAX_MESSAGE_SPACING, (AREA_TOP + AREA_HEIGHT - first) / len(diagram.edges))
+    size = min(LABEL_FONT_SIZE, max(text_fit.MIN_FONT_SIZE, int(spacing * 72 * 0.6)))
+    bottom = round(first + spacing * len(diagram.edges), 3)
+
+    boxes = [(round(center - width / 2, 3), AREA_TOP, round(width, 3), PARTICIPANT_HEIGHT, node.text,
+              text_fit.fit_text(node.text, width, PARTICIPANT_HEIGHT, BOX_FONT_SIZE, True).font_size, "node", 0)
+             for node, center in zip(diagram.nodes, centers)]
+    lines = [(round(center, 3), AREA_TOP + PARTICIPANT_HEIGHT, round(center, 3), bottom, "lifeline", None, None)
+             for center in centers]
+    labels = []
+    for i, edge in enumerate(diagram.edges):
+        y = round(first + spacing * (i + 0.75), 3)
+        x1, x2 = round(centers[edge.source], 3), round(centers[edge.target], 3)
+        lines.append((x1, y, x2, y, "edge", None, None))
+        if edge.label:
+            labels.append((min(x1, x2), round(y - spacing * 0.75, 3), round(abs(x2 - x1), 3),
+                           round(spacing * 0.75, 3), edge.label, size, "CENTER"))
+    return DiagramLayout(tuple(boxes), tuple(lines), tuple(labels))
+
+def _pages(spans, nodes):
+    """(first row, end row) of each slide a graph's rows are cut into, or None when it cannot be cut to fit
+
+    Rows are only cut where no box continues across, into slides of about
+    equal height, each starting at its first drawn row.
+    """
+    rows = max(span[3] for span in spans)
+    max_rows = int(AREA_HEIGHT / MIN_ROW_HEIGHT)
+    if rows <= max_rows:
+        return [(0, rows)]
+
+    spanned = {row for node in nodes for row in range(node.row + 1, node.row + node.rows)}
+    target = rows / -(-rows // max_rows)
+    cuts, start = [], 0
+    while rows - start > max_rows:
+        allowed = [row for row in range(start + 1, start + max_rows + 1) if row not in spanned]
+        if not allowed:
+            return None
+        start = min(allowed, key=lambda row: abs(row - start - target))
+        cuts.append(start)
+
+    pages = []
+    for first, end in zip([0] + cuts, cuts + [rows]):
+        drawn = [span for span in spans if first <= span[1] < end]
+        pages.append((min((span[1] for span in drawn), default=first), max((span[3] for span in drawn), default=end)))
+    return pages
+
+def layout_diagram(diagram):
+    """Place a diagram in the slide's drawing area as boxes, lines and labels, in inches
+
+    Returns one DiagramLayout per slide, or None for a graph too tall to
+    split. Graphs keep the arrangement of their character cells: columns
+    and rows scale separately, so a tall diagram keeps the full width, and
+    a small one grows until a cell reaches MAX_COLUMN_WIDTH by
+    MAX_ROW_HEIGHT. One taller than the area at MIN_ROW_HEIGHT is cut
+    across slides between rows; a line to a box on another slide runs to
+    the area's edge. Lines join the nearest sides of their boxes, and a
+    container's title gets a band above its first child tall enough to hold
+    it, shrinking the rows to make room. Sequence charts are drawn afresh,
+    one row per message.
+    """
+    if diagram.kind == "sequence":
+        return (_layout_sequence(diagram),)
+
+    spans = [(node.column, node.row, node.column + node.columns, node.row + node.rows) for node in diagram.nodes]
+    spans += [(label.column, label.row, label.column + max(map(len, label.text.split("\n"))),
+               label.row + label.text.count("\n") + 1) for label in diagram.labels]
+    first_column, first_row = min(span[0] for span in spans), min(span[1] for span in spans)
+    spans = [(left, top - first_row, right, bottom - first_row) for left, top, right, bottom in spans]
+    nodes = [node._replace(row=node.row - first_row) for node in diagram.nodes]
+    pages = _pages(spans, nodes)
+    if pages is None:
+        return None
+    columns = max(span[2] for span in spans) - first_column
+    column_width = min(MAX_COLUMN_WIDTH, AREA_WIDTH / columns)
+    row_height = min(MAX_ROW_HEIGHT, AREA_HEIGHT / max(end - top for top, end in pages))
+    origin_left = AREA_LEFT + (AREA_WIDTH - columns * column_width) / 2
+
+    def page_of(row):
+        return next(i for i, (_, end) in enumerate(pages) if row < end)
+
+    cells = [(node.column, node.row, node.columns, node.rows) for node in nodes]
+    node_pages = [page_of(node.row) for node in nodes]
+    children = {i: [j for j, inner in enumerate(cells)
+                    if j != i and node_pages[j] == node_pages[i] and connector_routing.contains(outer, inner)]
+                for i, outer in enumerate(cells)}
+
+    # Each container's title needs a band above its first child: (page, row of that child, rows above it, inches)
+    titles = []
+    for i, node in enumerate(nodes):
+        if children[i] and node.text:
+            lines = text_fit.text_lines(node.text, node.columns * column_width - 0.1, TITLE_FONT_SIZE, True)
+            first_child = min(nodes[j].row for j in children[i])
+            titles.append((node_pages[i], first_child, first_child - node.row,
+                           len(lines) * TITLE_FONT_SIZE * text_fit.LINE_SPACING / 72 + 2 * text_fit.INSET_Y))
+
+    def bands(page, height):
+        """Inches added above each row of a page so the titles there fit, with rows height inches tall"""
+        added = {}
+        for title_page, row, rows, needed in titles:
+            if title_page == page and needed > rows * height:
+                added[row] = max(added.get(row, 0), needed - rows * height)
+        return added
+
+    def page_height(page, height):
+        first, end = pages[page]
+        return (end - first) * height + sum(bands(page, height).values())
+
+    # Rows shrink, down to MIN_ROW_HEIGHT, until every page's title bands fit the area
+    for page in range(len(pages)):
+        low, high = MIN_ROW_HEIGHT, row_height
+        if page_height(page, high) > AREA_HEIGHT:
+            for _ in range(20):
+                middle = (low + high) / 2
+                low, high = (middle, high) if page_height(page, middle) <= AREA_HEIGHT else (low, middle)
+            row_height = low
+    added = []
+    for page, (first, end) in enumerate(pages):
+        page_bands = bands(page, row_height)
+        # At MIN_ROW_HEIGHT the bands share what is left of the area, and the titles shrink to fit them
+        spare = AREA_HEIGHT - (end - first) * row_height
+        scale = min(1, spare / sum(page_bands.values())) if page_bands else 1
+        added.append({row: band * scale for row, band in page_bands.items()})
+
+    def y(page, row, below):
+        """Top of a row on its page, counting the band above the row itself unless below (a bottom edge)"""
+        bands_above = sum(band for band_row, band in added[page].items()
+                          if band_row < row or (band_row == row and not below))
+        return AREA_TOP + (row - pages[page][0]) * row_height + bands_above
+
+    def rect(column, row, width, height):
+        page = page_of(row)
+        top = y(page, row, False)
+        return (round(origin_left + (column - first_column) * column_width, 3), round(top, 3),
+                round(width * column_width, 3), round(y(page, row + height, True) - top, 3))
+
+    rects = [rect(*cell) for cell in cells]
+
+    boxes = []
+    for i, (node, (left, top, width, height)) in enumerate(zip(nodes, rects)):
+        if children[i]:
+            # A container's title takes the band above its first child, keeping its bottom inset clear of it
+            title_height = round(min(rects[j][1] for j in children[i]) - top, 3)
+            size = text_fit.fit_text(node.text, width - 0.1, title_height - text_fit.INSET_Y, TITLE_FONT_SIZE,
+                                     True).font_size
+            boxes.append((left, top, width, height, node.text, size, "container", title_height))
+        else:
+            size = text_fit.fit_text(node.text, width, height, BOX_FONT_SIZE).font_size
+            boxes.append((left, top, width, height, node.text, size, "node", 0))
+    # Containers first, outermost first, so what they hold draws on top
+    order = sorted(range(len(boxes)), key=lambda i: (node_pages[i], boxes[i][6] != "container",
+                                                     -boxes[i][2] * boxes[i][3]))
+    drawn_at, drawn = {}, [0] * len(pages)
+    for i in order:
+        drawn_at[i] = drawn[node_pages[i]]
+        drawn[node_pages[i]] += 1
+
+    lines, labels = [[] for _ in pages], [[] for _ in pages]
+    for edge in diagram.edges:
+        source_rect, target_rect = rects[edge.source], rects[edge.target]
+        source_page, target_page = node_pages[edge.source], node_pages[edge.target]
+        if source_page == target_page:
+            source_site, target_site = connector_routing.nearest_sites(source_rect, target_rect)
+            (x1, y1), (x2, y2) = (connector_routing.site_point(source_rect, source_site),
+                                  connector_routing.site_point(target_rect, target_site))
+            lines[source_page].append((round(x1, 3), round(y1, 3), round(x2, 3), round(y2, 3), "edge",
+                                       drawn_at[edge.source], drawn_at[edge.target]))
+        else:
+            # Leave the source's slide through the area's edge and enter the target's through the other
+            down = target_page > source_page
+            x1, y1 = connector_routing.site_point(source_rect, 2 if down else 0)
+            x2, y2 = connector_routing.site_point(target_rect, 0 if down else 2)
+            y_leave, y_enter = (AREA_TOP + AREA_HEIGHT, AREA_TOP) if down else (AREA_TOP, AREA_TOP + AREA_HEIGHT)
+            lines[source_page].append((round(x1, 3), round(y1, 3), round(x1, 3), y_leave, "edge", None, None))
+            lines[target_page].append((round(x2, 3), y_enter, round(x2, 3), round(y2, 3), "edge", None, None))
+            x2, y2 = x1, y_leave
+        if edge.label:
+            width = min(2.5, text_fit.font_metrics().width(edge.label) * LABEL_FONT_SIZE / 72 + 0.3)
+            labels[source_page].append((round((x1 + x2 - width) / 2, 3), round((y1 + y2) / 2 - 0.15, 3),
+                                        round(width, 3), 0.3, edge.label, LABEL_FONT_SIZE, "CENTER"))
+    size = min(LABEL_FONT_SIZE, max(text_fit.MIN_FONT_SIZE, int(row_height * 72 * 0.8)))
+    for label in diagram.labels:
+        row, rows = label.row - first_row, label.text.split("\n")
+        left, top, width, height = rect(label.column, row, max(map(len, rows)) + 2, len(rows))
+        # Rows can be shorter than a line of text; the box grows to hold its lines
+        needed = len(rows) * size * text_fit.LINE_SPACING / 72 + 2 * text_fit.INSET_Y
+        labels[page_of(row)].append((left, top, width, round(max(height, needed), 3), label.text, size, "LEFT"))
+    return tuple(DiagramLayout(tuple(boxes[i] for i in order if node_pages[i] == page), tuple(lines[page]),
+                               tuple(labels[page]))
+                 for page in range(len(pages)))
+
+def _from_json(data):
+    if data is None:
+        return None
+    return tuple(DiagramLayout(*(tuple(tuple(item) for item in part) for part in page)) for page in data)
+
+def layout_fingerprint():
+    """Hash of everything a layout depends on besides its source: this module, text_fit, connector_routing
+    and the registered font metrics"""
+    global _code_digest
+    if _code_digest is None:
+        digest = hashlib.sha256()
+        for module in (sys.modules[__name__], text_fit, connector_routing):
+            digest.update(inspect.getsource(module).encode())
+        _code_digest = digest.hexdigest()
+    fonts = ";".join(f"{family}|{bold}|{metrics.name}" for (family, bold), metrics in sorted(text_fit.FONTS.items()))
+    return hashlib.sha256(f"{_code_digest}|{fonts}".encode()).hexdigest()
+
+def load_layout(source, language="", cache_dir=DEFAULT_CACHE_DIR):
+    """Laid-out diagram slides for a code block, or None when it is not a diagram (or too tall to split);
+    computed once per distinct source
+
+    Cached layouts are keyed on layout_fingerprint() too, so editing the
+    layout code, the text metrics or the area constants never serves a stale one.
+    """
+    digest = hashlib.sha256(f"{layout_fingerprint()}\0{language}\0{source}".encode()).hexdigest()
+    if digest in _layouts:
+        return _layouts[digest]
+
+    cached_file = os.path.join(cache_dir, f"{digest[:32]}.json")
+    if os.path.exists(cached_file):
+        with open(cached_file) as f:
+            pages = _from_json(json.load(f))
+    else:
+        diagram = parse_diagram(source, language)
+        pages = None if diagram is None else layout_diagram(diagram)
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(cached_file, "w") as f:
+            json.dump(pages, f)
+
+    _layouts[digest] = pages
+    return pages
+
+def diagram_ops(layout, palette, top=AREA_TOP):
+    """Draw list ops (render_draw_list format, no "slide" op) drawing one slide of a laid-out diagram
+
+    Lines between two boxes become "link" ops glued to them and sequence
+    messages become arrows with a head; both point from source to target.
+
+    top moves the diagram's upper edge down (below a title that wrapped),
+    squeezing it vertically so it still ends at the bottom of the area.
+    """
+    scale = (AREA_TOP + AREA_HEIGHT - top) / AREA_HEIGHT
+
+    def y(value):
+        return round(top + (value - AREA_TOP) * scale, 3)
+
+    ops = []
+    for left, box_top, width, height, text, size, style, title_height in layout.boxes:
+        box_top, height, title_height = y(box_top), round(height * scale, 3), round(title_height * scale, 3)
+        if style == "container":
+            ops.append(("box", (left, box_top, width, height, "", palette["LIGHT_GRAY"], palette["LIGHT_GRAY"], size,
+                                False)))
+            if text:
+                ops.append(("text", (left + 0.05, box_top, width - 0.1, title_height, text, size, True, palette["DARK_BLUE"],
+                                     "LEFT")))
+        else:
+            ops.append(("box", (left, box_top, width, height, text, palette["HARNESS_BLUE"], palette["WHITE"], size,
+                                False)))
+    for x1, y1, x2, y2, style, source, target in layout.lines:
+        if style == "lifeline":
+            ops.append(("arrow", (x1, y(y1), x2, y(y2), palette["LIGHT_GRAY"])))
+        elif source is None:
+            ops.append(("arrow", (x1, y(y1), x2, y(y2), palette["MEDIUM_GRAY"], True)))
+        else:
+            # Glued to the boxes just drawn, counted back from the last one
+            count = len(layout.boxes)
+            ops.append(("link", (source - count, target - count, palette["MEDIUM_GRAY"])))
+    for left, label_top, width, height, text, size, align in layout.labels:
+        ops.append(("text", (left, y(label_top), width, height, text, size, False, palette["DARK_GRAY"], align)))
+    return ops
+
+def main():
+    """Convert the diagrams in Markdown files into a deck of native shapes"""
+    import argparse
+    import time
+
+    import create_professional_cd_presentation as generator
+
+    parser = argparse.ArgumentParser(description="Convert ASCII and Mermaid diagrams into slide shapes")
+    parser.add_argument("documents", nargs="+", help="Markdown files holding diagram code blocks")
+    parser.add_argument("-o", "--output", help="Write a deck with one slide per diagram")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="Directory holding cached layouts")
+    args = parser.parse_args()
+
+    palette = generator.palette()
+    prs = generator.new_presentation() if args.output else None
+    for document in args.documents:
+        start = time.perf_counter()
+        with open(document, encoding="utf-8") as f:
+            blocks = code_blocks(f.read())
+        diagrams = 0
+        for heading, language, source in blocks:
+            pages = load_layout(source, language, args.cache_dir)
+            if pages is None:
+                continue
+            diagrams += 1
+            for i, layout in enumerate(pages if prs is not None else ()):
+                title = heading or document
+                generator.render_draw_list(prs, [("slide", (f"{title} (cont.)" if i else title, None))]
+                                           + diagram_ops(layout, palette))
+        elapsed = time.perf_counter() - start
+        print(f"✅ {document}: {diagrams} diagrams in {len(blocks)} code blocks ({elapsed * 1000:.0f} ms)")
+
+    if prs is not None:
+        prs.save(args.output)
+        print(f"✅ Saved {len(prs.slides)} diagram slides to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Text Fit Engine
+Measures text with cached per-font glyph advance tables, computes line breaks
+and finds the largest font size that fits a shape or text box at build time
+"""
+
+import unicodedata
+from collections import namedtuple
+
+# python-pptx text frame defaults, in inches
+INSET_X = 0.1
+INSET_Y = 0.05
+
+# Line pitch as a multiple of the font size (single spacing)
+LINE_SPACING = 1.2
+
+# Sizes tried when shrinking, in points
+MIN_FONT_SIZE = 6
+FONT_SIZE_STEP = 0.5
+
+# Calibri (the default theme font) advance widths for printable ASCII, in
+# 1/2048 em. Calibri's figures are tabular, so every digit shares one width.
+_CALIBRI_ASCII = {
+    " ": 463, "!": 544, '"': 821, "#": 1038, "$": 1038, "%": 1468, "&": 1397, "'": 452,
+    "(": 621, ")": 621, "*": 1038, "+": 1038, ",": 511, "-": 627, ".": 517, "/": 791,
+    ":": 548, ";": 548, "<": 1038, "=": 1038, ">": 1038, "?": 951, "@": 1870,
+    "A": 1185, "B": 1114, "C": 1092, "D": 1260, "E": 1000, "F": 941, "G": 1292, "H": 1276,
+    "I": 516, "J": 653, "K": 1064, "L": 861, "M": 1751, "N": 1322, "O": 1356, "P": 1058,
+    "Q": 1378, "R": 1112, "S": 941, "T": 998, "U": 1314, "V": 1162, "W": 1822, "X": 1063,
+    "Y": 998, "Z": 959, "[": 632, "\\": 793, "]": 632, "^": 1038, "_": 1022, "`": 587,
+    "a": 981, "b": 1076, "c": 866, "d": 1076, "e": 1019, "f": 625, "g": 964, "h": 1076,
+    "i": 470, "j": 490, "k": 931, "l": 470, "m": 1636, "n": 1076, "o": 1080, "p": 1076,
+    "q": 1076, "r": 714, "s": 801, "t": 686, "u": 1076, "v": 925, "w": 1464, "x": 887,
+    "y": 927, "z": 809, "{": 653, "|": 943, "}": 653, "~": 1038,
+}
+_CALIBRI_ASCII.update({digit: 1038 for digit in "0123456789"})
+
+# Calibri Bold runs about 3% wider than regular outside the figures
+_BOLD_SCALE = 1.03
+
+TextFit = namedtuple("TextFit", "font_size lines overflow")
+
+class FontMetrics:
+    """Glyph advance table for one font face, filled lazily and cached per character
+
+    Advances are in font units (units_per_em per em). Characters missing from
+    the table are measured once by measure_glyph, or estimated from their
+    Unicode width class when there is no font file to ask.
+    """
+
+    def __init__(self, name, units_per_em, advances, measure_glyph=None):
+        self.name = name
+        self.units_per_em = units_per_em
+        self.advances = dict(advances)
+        self.measure_glyph = measure_glyph
+        self._words = {}
+
+    def advance(self, char):
+        """Advance width of one character, in font units"""
+        width = self.advances.get(char)
+        if width is None:
+            if self.measure_glyph is not None:
+                width = self.measure_glyph(char)
+            elif char == "\u2003":
+                width = self.units_per_em          # An em space, where an emoji icon is drawn
+            elif unicodedata.east_asian_width(char) in ("W", "F"):
+                width = self.units_per_em          # Emoji and CJK are square
+            elif unicodedata.combining(char) or unicodedata.category(char) in ("Mn", "Cf"):
+                width = 0                          # Variation selectors, joiners, accents
+            else:
+                width = self.units_per_em // 2
+            self.advances[char] = width
+        return width
+
+    def width(self, text):
+        """Width of a run of text in ems, memoized per word"""
+        ems = self._words.get(text)
+        if ems is None:
+            ems = sum(self.advance(char) for char in text) / self.units_per_em
+            if len(self._words) < 100_000:
+                self._words[text] = ems
+        return ems
+
+def _calibri(bold):
+    scale = _BOLD_SCALE if bold else 1
+    advances = {char: (width if char.isdigit() else round(width * scale))
+                for char, width in _CALIBRI_ASCII.items()}
+    return FontMetrics("Calibri Bold" if bold else "Calibri", 2048, advances)
+
+def load_font(path, name=None):
+    """Build metrics for a TrueType/OpenType font file, measuring glyphs with Pillow on demand"""
+    try:
+        from PIL import ImageFont
+    except ImportError:  # Only needed for fonts other than the built-in Calibri table
+        raise RuntimeError("Pillow is required to measure font files (pip install pillow)") from None
+
+    units_per_em = 2048
+    font = ImageFont.truetype(path, units_per_em)
+    return FontMetrics(name or path, units_per_em, {},
+                       measure_glyph=lambda char: round(font.getlength(char)))
+
+# (family, bold) -> FontMetrics
+FONTS = {
+    ("Calibri", False): _calibri(False),
+    ("Calibri", True): _calibri(True),
+}
+
+_fits = {}
+
+def register_font(family, path, bold=False):
+    """Measure text set in family (regular or bold) with the glyphs of a font file"""
+    FONTS[(family, bold)] = load_font(path, f"{family} Bold" if bold else family)
+    _fits.clear()
+
+def font_metrics(family="Calibri", bold=False):
+    """Metrics for a family and weight, falling back to the regular weight"""
+    metrics = FONTS.get((family, bold)) or FONTS.get((family, False))
+    if metrics is None:
+        raise KeyError(f"No metrics registered for font {family!r}")
+    return metrics
+
+def wrap_lines(text, max_width, metrics):
+    """Break text into lines no wider than max_width ems, the way a word-wrapped frame does
+
+    Hard line breaks start new lines; words wider than a whole line are split
+    between characters.
+    """
+    space = metrics.width(" ")
+    lines = []
+    for paragraph in text.split("\n"):
+        line, line_width = None, 0.0
+        for word in paragraph.split(" "):
+            word_width = metrics.width(word)
+            if line is not None and line_width + space + word_width <= max_width:
+                line, line_width = f"{line} {word}", line_width + space + word_width
+                continue
+            if line is not None:
+                lines.append(line)
+            while word_width > max_width and len(word) > 1:
+                cut = 1
+                while cut < len(word) - 1 and metrics.width(word[:cut + 1]) <= max_width:
+                    cut += 1
+                lines.append(word[:cut])
+                word = word[cut:]
+                word_width = metrics.width(word)
+            line, line_width = word, word_width
+        lines.append(line)
+    return lines
+
+def text_lines(text, width, font_size, bold=False, family="Calibri"):
+    """Lines text wraps to in a word-wrapped frame width inches wide"""
+    max_width = (width - 2 * INSET_X) * 72 / font_size
+    return wrap_lines(text, max_width, font_metrics(family, bold))
+
+def _layout(text, width, height, font_size, metrics):
+    """Lines for text at font_size, and whether they fit the box (inches)"""
+    max_width = (width - 2 * INSET_X) * 72 / font_size
+    lines = wrap_lines(text, max_width, metrics)
+    # The last line may run into the bottom inset before it visibly leaves the box,
+    # and a single line always counts as fitting: frames grow to hold one line
+    capacity = max(1, int(((height - INSET_Y) * 72 + 0.01) // (font_size * LINE_SPACING)))
+    fits = len(lines) <= capacity
+    return lines, fits
+
+def fit_text(text, width, height, font_size, bold=False, family="Calibri", min_size=MIN_FONT_SIZE):
+    """Return TextFit(font_size, lines, overflow) for text in a width x height inch box
+
+    font_size is the largest size, stepping down from the requested one, at
+    which the wrapped lines fit the box; overflow is True when even min_size
+    (or font_size, if smaller) does not fit. Results are cached per (text, box, size, font).
+    """
+    key = (text, width, height, font_size, bold, family, min_size)
+    result = _fits.get(key)
+    if result is not None:
+        return result
+
+    metrics = font_metrics(family, bold)
+    lines, fits = _layout(text, width, height, font_size, metrics)
+    if fits:
+        result = TextFit(font_size, lines, False)
+    else:
+        # Line count only grows as the size grows, so binary search the steps below font_size
+        steps = int((font_size - min_size) / FONT_SIZE_STEP)
+        low, high = 0, steps - 1
+        best = None
+        while low <= high:
+            mid = (low + high) // 2
+            size = min_size + mid * FONT_SIZE_STEP
+            size_lines, size_fits = _layout(text, width, height, size, metrics)
+            if size_fits:
+                best = TextFit(size, size_lines, False)
+                low = mid + 1
+            else:
+                high = mid - 1
+        if best is None:
+            # Never grow a font that was already below min_size
+            size = min(font_size, min_size)
+            best = TextFit(size, _layout(text, width, height, size, metrics)[0], True)
+        result = best
+
+    _fits[key] = result
+    return result
+
+def main():
+    """Measure a piece of text, or with no text time the engine over 5000 synthetic step descriptions"""
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Fit text into a box and print the result")
+    parser.add_argument("text", nargs="?", help="Text to fit (\\n for line breaks)")
+    parser.add_argument("--width", type=float, default=3, help="Box width in inches")
+    parser.add_argument("--height", type=float, default=0.5, help="Box height in inches")
+    parser.add_argument("--size", type=float, default=14, help="Requested font size in points")
+    parser.add_argument("--bold", action="store_true", help="Measure the bold weight")
+    parser.add_argument("--font", metavar="PATH", help="Measure with this font file instead of Calibri")
+    args = parser.parse_args()
+
+    family = "Calibri"
+    if args.font:
+        family = args.font
+        register_font(family, args.font, bold=args.bold)
+
+    if args.text is None:
+        texts = [f"Deployment step {i} with a longer description to wrap" for i in range(5000)]
+        start = time.perf_counter()
+        for text in texts:
+            fit_text(text, args.width, args.height, args.size, args.bold, family)
+        elapsed = time.perf_counter() - start
+        print(f"✅ Fitted {len(texts)} boxes in {elapsed * 1000:.1f} ms "
+              f"({len(texts) / elapsed:,.0f} boxes/second)")
+        return
+
+    fit = fit_text(args.text.replace("\\n", "\n"), args.width, args.height, args.size, args.bold, family)
+    status = "❌ Overflows" if fit.overflow else "✅ Fits"
+    print(f"{status} at {fit.font_size}pt in {args.width}\" x {args.height}\"")
+    for line in fit.lines:
+        print(f"  | {line}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Web Deck Export
+An export_backend writer that turns each slide into a standalone SVG as soon
+as it is built and finishes with an index.html, for a static web deck that
+any file server can hand to many viewers
+"""
+
+import html
+import os
+import re
+
+import export_backend
+
+FONT_FAMILY = "Calibri, Carlito, sans-serif"
+
+_ANCHORS = {"left": "start", "center": "middle", "right": "end"}
+
+def _pt(inches):
+    """Inches as a compact point coordinate"""
+    return f"{inches * 72:.2f}".rstrip("0").rstrip(".")
+
+def _fill(color):
+    return "none" if color is None else f"#{color[0]:02X}{color[1]:02X}{color[2]:02X}"
+
+def slide_svg(slide, width, height):
+    """SVG markup for one recorded slide; coordinates are in points"""
+    parts = [f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {_pt(width)} {_pt(height)}" '
+             f'font-family="{FONT_FAMILY}">',
+             f'<rect width="100%" height="100%" fill="{_fill(slide.background or (255, 255, 255))}"/>']
+    for op, args in slide.ops:
+        if op == "rect":
+            (left, top, w, h), radius, fill, line, line_width = args
+            stroke = f' stroke="{_fill(line)}" stroke-width="{line_width:g}"' if line is not None else ""
+            parts.append(f'<rect x="{_pt(left)}" y="{_pt(top)}" width="{_pt(w)}" height="{_pt(h)}" '
+                         f'rx="{_pt(radius)}" fill="{_fill(fill)}"{stroke}/>')
+        elif op == "text":
+            for line in args:
+                weight = ' font-weight="bold"' if line.bold else ""
+                parts.append(f'<text x="{_pt(line.x)}" y="{_pt(line.y)}" font-size="{line.size:g}"{weight} '
+                             f'fill="{_fill(line.color or (0, 0, 0))}" text-anchor="{_ANCHORS[line.align]}" '
+                             f'xml:space="preserve">{html.escape(line.text, quote=False)}</text>')
+        elif op == "line":
+            points, color, line_width = args
+            coords = " ".join(f"{_pt(x)},{_pt(y)}" for x, y in points)
+            parts.append(f'<polyline points="{coords}" fill="none" stroke="{_fill(color)}" '
+                         f'stroke-width="{line_width:g}" stroke-linejoin="round"/>')
+    parts.append("</svg>")
+    return "\n".join(parts) + "\n"
+
+def index_html(title, slide_files, width, height):
+    """A page showing the slide SVGs in order, loaded as they scroll into view"""
+    slides = "\n".join(
+        f'<section id="slide-{number}"><img src="{name}" alt="Slide {number}" '
+        f'width="{_pt(width)}" height="{_pt(height)}" loading="lazy"></section>'
+        for number, name in enumerate(slide_files, 1))
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{html.escape(title)}</title>
+<style>
+body {{ margin: 0; background: #2B2B2B; }}
+section {{ max-width: 1280px; margin: 24px auto; box-shadow: 0 2px 12px rgba(0, 0, 0, 0.4); }}
+img {{ display: block; width: 100%; height: auto; background: #FFFFFF; }}
+</style>
+</head>
+<body>
+{slides}
+</body>
+</html>
+"""
+
+class WebBackend(export_backend.Backend):
+    """Writes slide-NN.svg into output_dir as each slide is finished, then index.html on close"""
+
+    def __init__(self, output_dir, title="Slides"):
+        self.output_dir = output_dir
+        self.title = title
+        self.slide_files = []
+        os.makedirs(output_dir, exist_ok=True)
+        for stale in os.listdir(output_dir):
+            if re.fullmatch(r"slide-\d+\.svg", stale):
+                os.remove(os.path.join(output_dir, stale))
+
+    def write_slide(self, deck, slide):
+        name = f"slide-{slide.number:02d}.svg"
+        with open(os.path.join(self.output_dir, name), "w", encoding="utf-8") as f:
+            f.write(slide_svg(slide, deck.width, deck.height))
+        self.slide_files.append(name)
+
+    def close(self, deck):
+        with open(os.path.join(self.output_dir, "index.html"), "w", encoding="utf-8") as f:
+            f.write(index_html(self.title, self.slide_files, deck.width, deck.height))